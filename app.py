@@ -8,13 +8,15 @@ in real-time, with support for both API access and HTML parsing fallback.
 import os
 import sys
 import json
+import math
 import logging
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, TYPE_CHECKING
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from dotenv import load_dotenv
 
 # Try to import CORS, make it optional for now
@@ -30,30 +32,38 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 sys.path.insert(0, '/app')  # Railway deployment path
 
-# Debug: Print current directory and check if scrapers exists
-print(f"Current directory: {current_dir}")
-print(f"Files in current directory: {os.listdir(current_dir) if os.path.exists(current_dir) else 'Directory not found'}")
-scrapers_path = os.path.join(current_dir, 'scrapers')
-print(f"Scrapers directory exists: {os.path.exists(scrapers_path)}")
-if os.path.exists(scrapers_path):
-    print(f"Files in scrapers: {os.listdir(scrapers_path)}")
-
-# Additional sanity checks (as suggested by expert)
-print(">> sys.path:", sys.path)
-print(">> /app contents:", os.listdir("/app") if os.path.exists("/app") else "/app does not exist")
-print(">> /app/scrapers exists:", os.path.isdir("/app/scrapers"))
-print(">> Working directory:", os.getcwd())
-
-from scrapers.yelp_scraper import YelpScraper
-from scrapers.amazon_scraper import AmazonScraper
-from scrapers.walmart_scraper import WalmartScraper
-from scrapers.universal_scraper import UniversalScraper
+# Load environment variables
+load_dotenv()
+
+# Deployment diagnostics: directory listings for debugging import paths
+if os.getenv('STARTUP_DEBUG', 'false').lower() == 'true':
+    scrapers_path = os.path.join(current_dir, 'scrapers')
+    print(f"Current directory: {current_dir}")
+    print(f"Files in current directory: {os.listdir(current_dir) if os.path.exists(current_dir) else 'Directory not found'}")
+    print(f"Scrapers directory exists: {os.path.exists(scrapers_path)}")
+    if os.path.exists(scrapers_path):
+        print(f"Files in scrapers: {os.listdir(scrapers_path)}")
+    print(">> sys.path:", sys.path)
+    print(">> /app contents:", os.listdir("/app") if os.path.exists("/app") else "/app does not exist")
+    print(">> /app/scrapers exists:", os.path.isdir("/app/scrapers"))
+    print(">> Working directory:", os.getcwd())
+
+# Only lightweight modules are imported here; the scrapers and the HTTP
+# transport pull in requests, bs4 and lxml and are imported on first use
 from utils.validators import validate_input
 from utils.helpers import setup_logging, format_response
+from utils.response_cache import get_shared_response_cache
+from utils.review_cache import ReviewCache
+from utils.rate_limiter import HostBackoffError, get_shared_rate_limiter
+from utils.page_classifier import UnusablePageError
 from utils.review_analyzer import ReviewAnalyzer, ReviewFilter, create_filter_from_params
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    from scrapers.yelp_scraper import YelpScraper
+    from scrapers.amazon_scraper import AmazonScraper
+    from scrapers.walmart_scraper import WalmartScraper
+    from scrapers.universal_scraper import UniversalScraper
+    from utils.http_transport import HttpTransport
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -70,10 +80,15 @@ else:
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# Initialize scrapers
-universal_scraper = UniversalScraper()
+# On-disk response cache and rate limiter shared by every scraper
+response_cache = get_shared_response_cache()
+rate_limiter = get_shared_rate_limiter()
+
 review_analyzer = ReviewAnalyzer()
 
+# Parsed reviews shared by /universal and /search so refiltering skips the scrape
+review_cache = ReviewCache()
+
 # Global storage for latest scraped data
 latest_data = {
     'timestamp': None,
@@ -84,24 +99,112 @@ latest_data = {
     'errors': []
 }
 
-# Initialize scrapers
-yelp_scraper = YelpScraper()
-amazon_scraper = AmazonScraper()
-walmart_scraper = WalmartScraper()
+# Scrapers, built on first use by the get_*_scraper() accessors
+_scrapers: Dict[str, Any] = {}
+_scrapers_lock = threading.RLock()
+
+# Bounded pool for per-source scrapes and the overall deadline for one scrape
+scrape_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('SCRAPE_WORKERS', 4)),
+    thread_name_prefix='source-scrape'
+)
+SCRAPE_DEADLINE = float(os.getenv('SCRAPE_DEADLINE', 90))
+
+# Limits for POST /universal/batch
+BATCH_MAX_URLS = int(os.getenv('BATCH_MAX_URLS', 200))
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 32))
+
+# Limit for GET /universal/pages and GET /amazon/reviews
+PAGINATED_MAX_REVIEWS = int(os.getenv('PAGINATED_MAX_REVIEWS', 2000))
 
 # Global variables for background scraping
 scraping_thread = None
 stop_scraping = threading.Event()
 
 
-def scrape_reviews(yelp_input: str, amazon_input: str, refresh_interval: Optional[int] = None) -> Dict[str, Any]:
+def get_http_transport() -> 'HttpTransport':
+    """Get the shared HTTP connection pool, importing requests on first use."""
+    from utils.http_transport import get_shared_transport
+    return get_shared_transport()
+
+
+def _get_scraper(name: str, build: Callable[[], Any]) -> Any:
+    """
+    Get a scraper, building it once on first use.
+    
+    Args:
+        name: Scraper key
+        build: Factory that imports and constructs the scraper
+    
+    Returns:
+        The shared scraper instance
+    """
+    scraper = _scrapers.get(name)
+    if scraper is None:
+        with _scrapers_lock:
+            scraper = _scrapers.get(name)
+            if scraper is None:
+                scraper = build()
+                _scrapers[name] = scraper
+    return scraper
+
+
+def _scraper_dependencies() -> Dict[str, Any]:
+    """Shared transport, response cache and rate limiter handed to every scraper."""
+    return {'transport': get_http_transport(), 'response_cache': response_cache, 'rate_limiter': rate_limiter}
+
+
+def get_yelp_scraper() -> 'YelpScraper':
+    """Get the shared Yelp scraper, building it on first use."""
+    def build():
+        from scrapers.yelp_scraper import YelpScraper
+        return YelpScraper(**_scraper_dependencies())
+    return _get_scraper('yelp', build)
+
+
+def get_amazon_scraper() -> 'AmazonScraper':
+    """Get the shared Amazon scraper, building it on first use."""
+    def build():
+        from scrapers.amazon_scraper import AmazonScraper
+        return AmazonScraper(**_scraper_dependencies())
+    return _get_scraper('amazon', build)
+
+
+def get_walmart_scraper() -> 'WalmartScraper':
+    """Get the shared Walmart scraper, building it on first use."""
+    def build():
+        from scrapers.walmart_scraper import WalmartScraper
+        return WalmartScraper(**_scraper_dependencies())
+    return _get_scraper('walmart', build)
+
+
+def get_universal_scraper() -> 'UniversalScraper':
+    """Get the shared universal scraper, building it on first use."""
+    def build():
+        from scrapers.universal_scraper import UniversalScraper
+        return UniversalScraper(**_scraper_dependencies())
+    return _get_scraper('universal', build)
+
+
+def scrape_reviews(yelp_input: str, amazon_input: str, refresh_interval: Optional[int] = None,
+                   refresh: bool = False) -> Dict[str, Any]:
     """
     Scrape reviews from both Yelp and Amazon sources.
     
+    Sources are scraped concurrently, so the call takes as long as the slowest
+    source, bounded by SCRAPE_DEADLINE. The deadline is also handed to each
+    scraper, which cuts its rate-limit waits and request timeouts short to
+    meet it, so a source that times out frees its worker shortly after the
+    response instead of holding it for the rest of a hung request. (Request
+    timeouts bound each connect and read, so a server trickling bytes can
+    still hold a worker a little past the deadline.)
+    
     Args:
         yelp_input: Yelp business ID or URL
         amazon_input: Amazon ASIN or product URL
         refresh_interval: Optional interval in seconds for repeated scraping
+        refresh: Revalidate scraped pages instead of serving them from the
+            response cache (used by the background refresh loop)
     
     Returns:
         Dictionary containing scraped reviews and metadata
@@ -120,25 +223,35 @@ def scrape_reviews(yelp_input: str, amazon_input: str, refresh_interval: Optiona
             'errors': []
         }
         
-        # Scrape Yelp reviews
+        # Scrape each requested source concurrently
+        sources = []
         if yelp_input:
-            try:
-                yelp_reviews = yelp_scraper.get_reviews(yelp_input)
-                result['yelp_reviews'] = yelp_reviews
-                logger.info(f"Successfully scraped {len(yelp_reviews)} Yelp reviews")
-            except Exception as e:
-                error_msg = f"Yelp scraping failed: {str(e)}"
+            sources.append(('Yelp', 'yelp_reviews', get_yelp_scraper().get_reviews, yelp_input))
+        if amazon_input:
+            sources.append(('Amazon', 'amazon_reviews', get_amazon_scraper().get_reviews, amazon_input))
+        
+        deadline = time.monotonic() + SCRAPE_DEADLINE
+        futures = {
+            scrape_executor.submit(fetch_reviews, source_input, deadline=deadline, refresh=refresh): (source_name, result_key)
+            for source_name, result_key, fetch_reviews, source_input in sources
+        }
+        done, not_done = wait(futures, timeout=SCRAPE_DEADLINE)
+        
+        # Merge results in request order so errors stay deterministic
+        for future, (source_name, result_key) in futures.items():
+            if future in not_done:
+                future.cancel()
+                error_msg = f"{source_name} scraping timed out after {SCRAPE_DEADLINE}s"
                 logger.error(error_msg)
                 result['errors'].append(error_msg)
-        
-        # Scrape Amazon reviews
-        if amazon_input:
+                continue
+            
             try:
-                amazon_reviews = amazon_scraper.get_reviews(amazon_input)
-                result['amazon_reviews'] = amazon_reviews
-                logger.info(f"Successfully scraped {len(amazon_reviews)} Amazon reviews")
+                source_reviews = future.result()
+                result[result_key] = source_reviews
+                logger.info(f"Successfully scraped {len(source_reviews)} {source_name} reviews")
             except Exception as e:
-                error_msg = f"Amazon scraping failed: {str(e)}"
+                error_msg = f"{source_name} scraping failed: {str(e)}"
                 logger.error(error_msg)
                 result['errors'].append(error_msg)
         
@@ -169,6 +282,31 @@ def scrape_reviews(yelp_input: str, amazon_input: str, refresh_interval: Optiona
         return result
 
 
+def get_universal_reviews(url: str, platform: Optional[str] = None,
+                          deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Get parsed reviews for a URL, using the in-memory review cache.
+    
+    Args:
+        url: URL to scrape
+        platform: Optional platform override
+        deadline: Optional time.monotonic() value to give up scraping by
+    
+    Returns:
+        List of review dictionaries
+    """
+    platform = platform or get_universal_scraper().detect_platform(url)
+    
+    cached_reviews = review_cache.get(url, platform)
+    if cached_reviews is not None:
+        logger.info(f"Review cache hit for {url}")
+        return cached_reviews
+    
+    reviews = get_universal_scraper().scrape_reviews(url, platform, deadline)
+    review_cache.set(url, platform, reviews)
+    return reviews
+
+
 def background_scraper(yelp_input: str, amazon_input: str, refresh_interval: int):
     """
     Background thread function for continuous scraping.
@@ -181,7 +319,8 @@ def background_scraper(yelp_input: str, amazon_input: str, refresh_interval: int
     logger.info(f"Starting background scraper with {refresh_interval}s interval")
     
     while not stop_scraping.is_set():
-        scrape_reviews(yelp_input, amazon_input)
+        # Revalidate with If-None-Match rather than rereading cached pages
+        scrape_reviews(yelp_input, amazon_input, refresh=True)
         
         # Wait for the specified interval or until stop event is set
         if stop_scraping.wait(refresh_interval):
@@ -201,10 +340,17 @@ def home():
             'health': '/health - GET - Health check',
             'scrape': '/scrape - GET - Basic scraping (Yelp & Amazon)',
             'universal': '/universal - GET - Universal platform scraper',
+            'universal_batch': '/universal/batch - POST - Scrape many URLs, streamed as NDJSON',
+            'yelp_bulk': '/yelp/bulk - POST - Scrape many Yelp businesses at once (API first, HTML fallback)',
+            'amazon_reviews': '/amazon/reviews - GET - Harvest many pages of Amazon reviews (star/sort filters)',
+            'universal_pages': '/universal/pages - GET - Scrape every review page of a product, streamed as NDJSON',
             'search': '/search - GET - Intelligent keyword-based review search',
             'platforms': '/platforms - GET - List supported platforms',
             'categories': '/categories - GET - Available filter categories',
             'latest': '/latest - GET - Get latest scraped data',
+            'stats': '/stats - GET - Connection pool and scraper statistics',
+            'cache_purge': '/cache/purge - POST - Purge cached responses (all, or one url)',
+            'sites_reload': '/sites/reload - POST - Reload the site registry now',
             'stop': '/stop - POST - Stop background scraping'
         },
         'intelligent_search': {
@@ -302,6 +448,212 @@ def get_latest():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@app.route('/stats', methods=['GET'])
+def get_stats():
+    """
+    GET endpoint to report connection pool and scraper statistics.
+    """
+    try:
+        yelp_scraper = get_yelp_scraper()
+        amazon_scraper = get_amazon_scraper()
+        return jsonify({
+            'success': True,
+            'data': {
+                'transport': get_http_transport().get_metrics(),
+                'response_cache': response_cache.get_stats() if response_cache else None,
+                'review_cache': review_cache.get_stats(),
+                'rate_limiter': rate_limiter.get_stats(),
+                'revalidation': {
+                    'yelp': yelp_scraper.revalidation.get_stats(),
+                    'amazon': amazon_scraper.revalidation.get_stats()
+                },
+                'amazon_hedging': amazon_scraper.get_hedging_stats(),
+                'yelp_api_cache': yelp_scraper.api_cache.get_stats(),
+                'selector_stats': amazon_scraper.selector_stats.get_stats(),
+                'parse_pool': amazon_scraper.parse_pool.get_stats(),
+                'site_registry': get_universal_scraper().registry.get_stats()
+            }
+        })
+    except Exception as e:
+        logger.error(f"Error in stats endpoint: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/sites/reload', methods=['POST'])
+def reload_sites():
+    """
+    POST endpoint to reload the site registry without waiting for the next change check.
+    
+    A registry that fails validation is rejected and the current one stays in use.
+    """
+    try:
+        registry = get_universal_scraper().registry
+        reloaded = registry.reload()
+        stats = registry.get_stats()
+        if stats['last_error']:
+            return jsonify({
+                'message': f"Site registry rejected: {stats['last_error']}",
+                'status': 'failed',
+                'registry': stats
+            }), 400
+        
+        return jsonify({
+            'message': f"Site registry version {stats['version']} with {stats['sites']} sites" +
+                       ('' if reloaded else ' (unchanged)'),
+            'status': 'success',
+            'registry': stats
+        })
+    except Exception as e:
+        logger.error(f"Error reloading site registry: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/cache/purge', methods=['POST'])
+def purge_cache():
+    """
+    POST endpoint to purge the on-disk response cache.
+    
+    JSON Body:
+        url: Optional URL to purge; purges everything when omitted
+    """
+    try:
+        if not response_cache:
+            return jsonify({'message': 'Response cache is disabled', 'status': 'info'})
+        
+        payload = request.get_json(silent=True) or {}
+        removed = response_cache.purge(payload.get('url'))
+        review_cache.clear()
+        return jsonify({
+            'message': f'Purged {removed} cached responses',
+            'status': 'success',
+            'purged': removed
+        })
+    except Exception as e:
+        logger.error(f"Error purging cache: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/yelp/bulk', methods=['POST'])
+def yelp_bulk_endpoint():
+    """
+    POST endpoint to scrape reviews for many Yelp businesses at once.
+    
+    JSON Body:
+        businesses: List of Yelp business IDs or URLs
+        max_reviews: Optional number of reviews per business (default 10)
+    
+    Example:
+        POST /yelp/bulk
+        {"businesses": ["garaje-san-francisco", "https://www.yelp.com/biz/tartine-bakery-san-francisco"]}
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        businesses = payload.get('businesses')
+        
+        if not isinstance(businesses, list) or not businesses:
+            return jsonify({
+                'success': False,
+                'error': 'Request body must include a non-empty "businesses" list',
+                'example': {'businesses': ['garaje-san-francisco']}
+            }), 400
+        
+        if len(businesses) > BATCH_MAX_URLS:
+            return jsonify({
+                'success': False,
+                'error': f'Too many businesses: {len(businesses)} (maximum {BATCH_MAX_URLS})'
+            }), 400
+        
+        try:
+            max_reviews = max(1, min(int(payload.get('max_reviews', 10)), PAGINATED_MAX_REVIEWS))
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'max_reviews must be an integer'
+            }), 400
+        
+        from utils.helpers import clean_review_data
+        results = get_yelp_scraper().get_reviews_bulk([str(business) for business in businesses], max_reviews)
+        
+        data = []
+        for business, result in results.items():
+            cleaned_reviews = clean_review_data(result['reviews'])
+            data.append({
+                'input': business,
+                'business_id': result['business_id'],
+                'success': result['error'] is None,
+                'source': result['source'],
+                'error': result['error'],
+                'reviews': cleaned_reviews,
+                'total_reviews': len(cleaned_reviews)
+            })
+        
+        return jsonify({
+            'success': True,
+            'businesses': data,
+            'scraped_at': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in Yelp bulk endpoint: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/amazon/reviews', methods=['GET'])
+def amazon_harvest_endpoint():
+    """
+    GET endpoint to harvest reviews across many Amazon review pages.
+    
+    Query Parameters:
+    - amazon_url: Amazon product URL or ASIN
+    - max_reviews: Number of reviews to collect (default 500)
+    - star: Optional star filter (1-5, positive or critical)
+    - sort: Optional sort order (helpful or recent)
+    """
+    try:
+        amazon_input = request.args.get('amazon_url', '').strip()
+        if not amazon_input:
+            return jsonify({
+                'success': False,
+                'error': 'Please provide an amazon_url parameter',
+                'example': '/amazon/reviews?amazon_url=B08N5WRWNW&max_reviews=300&star=5&sort=recent'
+            }), 400
+        
+        from scrapers.amazon_scraper import DEFAULT_HARVEST_REVIEWS
+        amazon_scraper = get_amazon_scraper()
+        max_reviews = request.args.get('max_reviews', DEFAULT_HARVEST_REVIEWS, type=int)
+        max_reviews = max(1, min(max_reviews, PAGINATED_MAX_REVIEWS))
+        star_filter = request.args.get('star', '').strip() or None
+        if star_filter and star_filter.isdigit():
+            star_filter = int(star_filter)
+        sort_by = request.args.get('sort', '').strip() or None
+        
+        try:
+            reviews = amazon_scraper.harvest_reviews(amazon_input, max_reviews=max_reviews,
+                                                 star_filter=star_filter, sort_by=sort_by)
+        except Exception as e:
+            error_msg = f"Amazon harvesting failed: {str(e)}"
+            logger.error(error_msg)
+            return jsonify({
+                'success': False,
+                'error': error_msg
+            }), 400
+        
+        from utils.helpers import clean_review_data
+        cleaned_reviews = clean_review_data(reviews)
+        
+        return jsonify({
+            'success': True,
+            'asin': amazon_scraper.extract_asin(amazon_input),
+            'reviews': cleaned_reviews,
+            'total_reviews': len(cleaned_reviews),
+            'scraped_at': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in Amazon harvest endpoint: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @app.route('/universal', methods=['GET'])
 def universal_scrape():
     """
@@ -324,7 +676,7 @@ def universal_scrape():
             return jsonify({
                 'success': False,
                 'error': 'Missing required parameter: url',
-                'supported_platforms': universal_scraper.get_supported_platforms()
+                'supported_platforms': get_universal_scraper().get_supported_platforms()
             }), 400
         
         # Validate URL
@@ -337,7 +689,7 @@ def universal_scrape():
             }), 400
         
         # Scrape reviews
-        reviews = universal_scraper.scrape_reviews(url, platform)
+        reviews = get_universal_reviews(url, platform, time.monotonic() + SCRAPE_DEADLINE)
         
         # Clean and format reviews with links
         from utils.helpers import clean_review_data
@@ -353,7 +705,7 @@ def universal_scrape():
             'data': {
                 'reviews': cleaned_reviews,
                 'total_reviews': len(cleaned_reviews),
-                'platform': platform or universal_scraper.detect_platform(url),
+                'platform': platform or get_universal_scraper().detect_platform(url),
                 'scraped_at': datetime.now().isoformat(),
                 'original_url': url
             },
@@ -363,6 +715,24 @@ def universal_scrape():
         logger.info(f"Successfully scraped {len(cleaned_reviews)} reviews from {url}")
         return jsonify(response_data)
         
+    except UnusablePageError as e:
+        # The site served a block, captcha or sign-in page instead of the product
+        logger.warning(f"Universal scraping blocked: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f"Universal scraping failed: {str(e)}",
+            'page_kind': e.kind,
+            'retryable': e.retryable
+        }), 503
+    except HostBackoffError as e:
+        # The site recently blocked us; tell the client when to come back
+        logger.warning(f"Universal scraping deferred: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f"Universal scraping failed: {str(e)}",
+            'page_kind': e.kind,
+            'retryable': e.retryable
+        }), 503, {'Retry-After': str(math.ceil(e.retry_after))}
     except Exception as e:
         error_msg = f"Universal scraping failed: {str(e)}"
         logger.error(error_msg)
@@ -373,7 +743,182 @@ def universal_scrape():
         return jsonify({
             'success': False,
             'error': error_msg,
-            'supported_platforms': universal_scraper.get_supported_platforms()
+            'supported_platforms': get_universal_scraper().get_supported_platforms()
+        }), 500
+
+
+@app.route('/universal/batch', methods=['POST'])
+def universal_batch_scrape():
+    """
+    POST endpoint for concurrent scraping of many URLs.
+    
+    Results are streamed back as NDJSON, one line per URL in completion order,
+    so clients can start on early results while slow retailers finish.
+    
+    JSON Body:
+        urls: List of URLs to scrape
+        platform: Optional platform override applied to every URL
+    
+    Example:
+        POST /universal/batch
+        {"urls": ["https://www.walmart.com/ip/123", "https://www.target.com/p/456"]}
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        urls = payload.get('urls')
+        platform = payload.get('platform')
+        
+        if not isinstance(urls, list) or not urls:
+            return jsonify({
+                'success': False,
+                'error': 'Request body must include a non-empty "urls" list',
+                'example': {'urls': ['https://www.walmart.com/ip/product-id']}
+            }), 400
+        
+        if len(urls) > BATCH_MAX_URLS:
+            return jsonify({
+                'success': False,
+                'error': f'Too many URLs: {len(urls)} (maximum {BATCH_MAX_URLS})'
+            }), 400
+        
+        # Validate URLs up front; invalid ones are reported on the stream
+        from utils.validators import validate_url
+        valid_urls = []
+        invalid_results = []
+        for url in urls:
+            validation_result = validate_url(url)
+            if validation_result['valid']:
+                valid_urls.append(url)
+            else:
+                invalid_results.append({
+                    'url': url,
+                    'success': False,
+                    'error': validation_result['error']
+                })
+        
+        from utils.helpers import clean_review_data
+        
+        def generate():
+            for line in invalid_results:
+                yield json.dumps(line) + '\n'
+            
+            for result in get_universal_scraper().iter_scrape_many(valid_urls, platform, concurrency=BATCH_CONCURRENCY):
+                if result['error']:
+                    line = {
+                        'url': result['url'],
+                        'success': False,
+                        'platform': result['platform'],
+                        'error': f"Universal scraping failed: {result['error']}"
+                    }
+                else:
+                    cleaned_reviews = clean_review_data(result['reviews'])
+                    line = {
+                        'url': result['url'],
+                        'success': True,
+                        'platform': result['platform'],
+                        'reviews': cleaned_reviews,
+                        'total_reviews': len(cleaned_reviews),
+                        'scraped_at': datetime.now().isoformat()
+                    }
+                yield json.dumps(line) + '\n'
+        
+        logger.info(f"Starting batch scrape of {len(valid_urls)} URLs ({len(invalid_results)} invalid)")
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        error_msg = f"Batch scraping failed: {str(e)}"
+        logger.error(error_msg)
+        return jsonify({
+            'success': False,
+            'error': error_msg
+        }), 500
+
+
+@app.route('/universal/pages', methods=['GET'])
+def universal_pages_endpoint():
+    """
+    GET endpoint for scraping all review pages of a product.
+    
+    Pages are fetched concurrently where the platform allows it and streamed
+    back as NDJSON, one line per page in page order.
+    
+    Query Parameters:
+        url: Product URL
+        platform: Optional platform override
+        max_reviews: Number of reviews to collect (default 500)
+    
+    Example:
+        /universal/pages?url=https://www.walmart.com/ip/123&max_reviews=200
+    """
+    try:
+        url = request.args.get('url', '').strip()
+        platform = request.args.get('platform', '').strip() or None
+        
+        from utils.validators import validate_url
+        validation_result = validate_url(url)
+        if not validation_result['valid']:
+            return jsonify({
+                'success': False,
+                'error': validation_result['error'],
+                'example': '/universal/pages?url=https://www.walmart.com/ip/product-id'
+            }), 400
+        
+        try:
+            from scrapers.universal_scraper import DEFAULT_PAGINATED_REVIEWS
+            max_reviews = int(request.args.get('max_reviews', DEFAULT_PAGINATED_REVIEWS))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'max_reviews must be an integer'
+            }), 400
+        max_reviews = max(1, min(max_reviews, PAGINATED_MAX_REVIEWS))
+        
+        # Reject unsupported URLs before the 200 response starts streaming
+        scraper = get_universal_scraper()
+        resolved_platform = platform or scraper.detect_platform(url)
+        if resolved_platform not in scraper.configs:
+            return jsonify({
+                'success': False,
+                'error': 'Unsupported platform',
+                'supported_platforms': scraper.get_supported_platforms()
+            }), 400
+        
+        pages = scraper.iter_scrape_pages(url, resolved_platform, max_reviews=max_reviews)
+        
+        from utils.helpers import clean_review_data
+        
+        def generate():
+            for result in pages:
+                if result['error']:
+                    line = {
+                        'url': result['url'],
+                        'page': result['page'],
+                        'success': False,
+                        'platform': result['platform'],
+                        'error': f"Universal scraping failed: {result['error']}"
+                    }
+                else:
+                    cleaned_reviews = clean_review_data(result['reviews'])
+                    line = {
+                        'url': result['url'],
+                        'page': result['page'],
+                        'success': True,
+                        'platform': result['platform'],
+                        'reviews': cleaned_reviews,
+                        'total_reviews': len(cleaned_reviews),
+                        'scraped_at': datetime.now().isoformat()
+                    }
+                yield json.dumps(line) + '\n'
+        
+        logger.info(f"Starting paginated scrape of {url} (up to {max_reviews} reviews)")
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        error_msg = f"Paginated scraping failed: {str(e)}"
+        logger.error(error_msg)
+        return jsonify({
+            'success': False,
+            'error': error_msg
         }), 500
 
 
@@ -383,7 +928,7 @@ def get_supported_platforms():
     GET endpoint to list all supported platforms.
     """
     try:
-        platforms = universal_scraper.get_supported_platforms()
+        platforms = get_universal_scraper().get_supported_platforms()
         return jsonify({
             'success': True,
             'data': {
@@ -444,15 +989,15 @@ def intelligent_review_search():
         filter_config = create_filter_from_params(request.args)
         
         # First scrape reviews
-        platform = universal_scraper.detect_platform(url)
+        platform = get_universal_scraper().detect_platform(url)
         if not platform:
             return jsonify({
                 'success': False,
                 'error': 'Unsupported platform',
-                'supported_platforms': universal_scraper.get_supported_platforms()
+                'supported_platforms': get_universal_scraper().get_supported_platforms()
             }), 400
         
-        reviews = universal_scraper.scrape_reviews(url, platform)
+        reviews = get_universal_reviews(url, platform, time.monotonic() + SCRAPE_DEADLINE)
         
         # Apply intelligent filtering
         filtered_reviews = review_analyzer.filter_reviews(reviews, filter_config)
@@ -0,0 +1,1188 @@
+"""
+Benchmark Script for Review Scraper
+
+This script times HTML parsing and review extraction for every scraper on
+synthetic review pages, and checks that each optimized path extracts exactly
+the same reviews as the plain one. No network access is needed.
+
+Suites:
+    parsers    html.parser vs lxml vs lxml + SoupStrainer
+    selectors  raw CSS strings vs precompiled selector plans
+    incremental  full parse vs stopping once max_reviews are found
+    structured   embedded JSON (JSON-LD / __NEXT_DATA__) vs CSS selectors
+    amazon       per-field find() calls vs single-pass Amazon field extraction
+    adaptive     fixed vs learned selector order on drifted Amazon/Yelp/Walmart markup
+    pool         threaded inline parsing vs the process parse pool
+    screen       parsing vs byte-level classification of block, sign-in and empty pages
+    detect       substring scan vs indexed platform detection, up to 10k synthetic configs
+    registry     loading and hot-reloading a 10k-site registry, with concurrent readers
+    startup      cold import of app.py to the first /health response, against a time budget
+    categorize   the original keyword loop vs ReviewAnalyzer.categorize_review on 100k reviews
+
+Usage:
+    python benchmark.py [--suite all|parsers|selectors|incremental|structured|amazon|adaptive|pool|screen|detect|registry|startup|categorize] [--iterations N] [--startup-budget MS]
+"""
+
+import os
+import re
+import sys
+import random
+import json
+import logging
+import dataclasses
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable
+from urllib.parse import urlparse
+
+from utils import parsing
+from utils.parsing import PARSER_BACKENDS, LXML_AVAILABLE, make_soup
+from scrapers.universal_scraper import UniversalScraper, SelectorPlan
+from scrapers import amazon_scraper, yelp_scraper, walmart_scraper, universal_scraper
+from scrapers.amazon_scraper import AmazonScraper
+from scrapers.yelp_scraper import YelpScraper
+from scrapers.walmart_scraper import WalmartScraper
+from utils.response_cache import ResponseCache
+from utils.selector_stats import SelectorStats
+from utils.rate_limiter import HostRateLimiter
+from scrapers.site_registry import SiteRegistry, ScrapeConfig
+from utils.parse_pool import ParsePool
+from utils import page_classifier
+from utils.review_analyzer import ReviewAnalyzer
+
+REVIEWS_PER_PAGE = 20
+
+# Cold start budget: interpreter start excluded, import of app.py through the
+# first /health response included
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', 500))
+
+# Modules app.py must not import before a scraper is first used
+HEAVY_MODULES = ('requests', 'bs4', 'lxml', 'yelpapi', 'scrapers.yelp_scraper', 'scrapers.amazon_scraper',
+                 'scrapers.walmart_scraper', 'scrapers.universal_scraper')
+
+# Run in a fresh interpreter per measurement; prints one JSON line
+STARTUP_PROBE = '''
+import sys, json, time, threading
+start = time.perf_counter()
+import app
+status = app.app.test_client().get('/health').status_code
+startup_ms = (time.perf_counter() - start) * 1000
+heavy = [name for name in %r if name in sys.modules]
+
+start = time.perf_counter()
+built = []
+threads = [threading.Thread(target=lambda: built.append(app.get_amazon_scraper())) for _ in range(8)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+app.get_yelp_scraper(), app.get_walmart_scraper(), app.get_universal_scraper()
+first_use_ms = (time.perf_counter() - start) * 1000
+
+print(json.dumps({'startup_ms': startup_ms, 'status': status, 'heavy': heavy,
+                  'first_use_ms': first_use_ms, 'amazon_instances': len({id(s) for s in built})}))
+''' % (HEAVY_MODULES,)
+
+# Page furniture that surrounds the review section on real product pages
+NOISE_BLOCK = (
+    '<div class="product-tile"><a href="/p/{i}" class="tile-link">'
+    '<img src="/img/{i}.jpg" alt="Related product {i}"></a>'
+    '<span class="price">${i}.99</span><ul class="badges"><li>Free shipping</li>'
+    '<li>In stock</li></ul><p class="blurb">Customers also viewed item {i}.</p></div>'
+)
+SCRIPT_BLOCK = '<script>window.__STATE__ = {' + ', '.join(f'"k{i}": {i}' for i in range(2000)) + '};</script>'
+
+_COMPOUND_PART = re.compile(r"""\.([\w-]+)|\[([\w-]+)(?:=['"]?(.*?)['"]?)?\]""")
+
+
+def _element_for(compound: str):
+    """Build (tag, attribute string) for one compound CSS selector."""
+    tag_match = re.match(r'[a-zA-Z][\w-]*', compound)
+    tag = tag_match.group(0) if tag_match else 'div'
+    classes = []
+    attrs = []
+    for cls, attr, value in _COMPOUND_PART.findall(compound):
+        if cls:
+            classes.append(cls)
+        else:
+            attrs.append(f'{attr}="{value}"')
+    if classes:
+        attrs.append(f'class="{" ".join(classes)}"')
+    return tag, ' '.join(attrs)
+
+
+def _wrap(selector: str, inner: str) -> str:
+    """Wrap content in elements matching a descendant-combinator selector."""
+    for compound in reversed(selector.split()):
+        tag, attrs = _element_for(compound)
+        inner = f'<{tag} {attrs}>{inner}</{tag}>'
+    return inner
+
+
+def _page(reviews_html: str, footer_blocks: int = 150, head_html: str = '') -> bytes:
+    """Surround a review section with navigation, related products and scripts."""
+    header = ''.join(NOISE_BLOCK.format(i=i) for i in range(150))
+    footer = ''.join(NOISE_BLOCK.format(i=i) for i in range(150, 150 + footer_blocks))
+    html = (
+        f'<html><head><title>Product</title>{SCRIPT_BLOCK}{head_html}</head><body>'
+        f'<nav class="top-nav">{header}</nav><main>{reviews_html}</main>'
+        f'<footer class="site-footer">{footer}</footer></body></html>'
+    )
+    return html.encode('utf-8')
+
+
+def universal_page(config, footer_blocks: int = 150, head_html: str = '',
+                   review_count: int = REVIEWS_PER_PAGE) -> bytes:
+    """Build a synthetic page that matches a universal site configuration."""
+    container_parts = config.review_container.split()
+    reviews = []
+    for i in range(review_count):
+        fields = (
+            _wrap(config.reviewer_name, f'Reviewer {i}') +
+            _wrap(config.rating, f'{i % 5 + 1}.0 out of 5 stars') +
+            _wrap(config.review_text, f'Review number {i}. Solid product, would buy again.') +
+            _wrap(config.date, f'2025-07-{i % 28 + 1:02d}')
+        )
+        reviews.append(_wrap(container_parts[-1], fields))
+    reviews_html = ''.join(reviews)
+    if len(container_parts) > 1:
+        reviews_html = _wrap(' '.join(container_parts[:-1]), reviews_html)
+    return _page(reviews_html, footer_blocks, head_html)
+
+
+def json_ld_script() -> str:
+    """Build a schema.org Product with the same reviews universal_page renders."""
+    product = {
+        '@context': 'https://schema.org',
+        '@type': 'Product',
+        'name': 'Product',
+        'aggregateRating': {'@type': 'AggregateRating', 'ratingValue': 3.0, 'reviewCount': REVIEWS_PER_PAGE},
+        'review': [{
+            '@type': 'Review',
+            'author': {'@type': 'Person', 'name': f'Reviewer {i}'},
+            'reviewRating': {'@type': 'Rating', 'ratingValue': f'{i % 5 + 1}', 'bestRating': '5'},
+            'reviewBody': f'Review number {i}. Solid product, would buy again.',
+            'datePublished': f'2025-07-{i % 28 + 1:02d}'
+        } for i in range(REVIEWS_PER_PAGE)]
+    }
+    return f'<script type="application/ld+json">{json.dumps(product)}</script>'
+
+
+def next_data_script() -> str:
+    """Build a Next.js __NEXT_DATA__ blob with the same reviews universal_page renders."""
+    data = {'props': {'pageProps': {'product': {'id': 1, 'reviews': {'total': REVIEWS_PER_PAGE, 'items': [{
+        'id': i,
+        'userNickname': f'Reviewer {i}',
+        'rating': i % 5 + 1,
+        'reviewText': f'Review number {i}. Solid product, would buy again.',
+        'submissionTime': f'2025-07-{i % 28 + 1:02d}'
+    } for i in range(REVIEWS_PER_PAGE)]}}}}}
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>'
+
+
+def amazon_page() -> bytes:
+    """Build a synthetic Amazon review page."""
+    reviews = ''.join(
+        f'<div data-hook="review" id="R{i}"><span class="a-profile-name">Shopper {i}</span>'
+        f'<i data-hook="review-star-rating"><span class="a-icon-alt">{i % 5 + 1}.0 out of 5 stars</span></i>'
+        f'<a data-hook="review-title">Title {i}</a>'
+        f'<span data-hook="review-date">Reviewed in the United States on July {i % 28 + 1}, 2025</span>'
+        f'<span data-hook="review-body">Body of review {i}, works as described.</span>'
+        f'<span data-hook="helpful-vote-statement">{i} people found this helpful</span></div>'
+        for i in range(REVIEWS_PER_PAGE)
+    )
+    return _page(f'<div id="cm_cr-review_list">{reviews}</div>')
+
+
+def amazon_fixture_page(layout: str) -> bytes:
+    """
+    Build an Amazon review page modeled on one of the markup layouts Amazon serves.
+
+    'current' is today's data-hook markup, 'legacy' the older class-based
+    markup, and 'sparse' a page where the preferred elements are empty or
+    missing so extraction has to fall back to later strategies.
+    """
+    reviews = []
+    for i in range(REVIEWS_PER_PAGE):
+        stars = i % 5 + 1
+        if layout == 'current':
+            reviews.append(
+                f'<div id="R{i}" data-hook="review" class="a-section review aok-relative">'
+                f'<div class="a-row a-spacing-mini"><a class="a-profile" href="/gp/profile/{i}">'
+                f'<div class="a-profile-avatar-wrapper"><img src="/avatar/{i}.png"></div>'
+                f'<div class="a-profile-content"><span class="a-profile-name">Shopper {i}</span></div></a></div>'
+                f'<div class="a-row"><a class="a-link-normal" href="/review/R{i}">'
+                f'<i data-hook="review-star-rating" class="a-icon a-icon-star a-star-{stars}">'
+                f'<span class="a-icon-alt">{stars}.0 out of 5 stars</span></i></a>'
+                f'<a data-hook="review-title" class="a-size-base a-link-normal review-title"><span>Title {i}</span></a></div>'
+                f'<span data-hook="review-date" class="a-size-base a-color-secondary review-date">'
+                f'Reviewed in the United States on July {i % 28 + 1}, 2025</span>'
+                f'<div class="a-row a-spacing-mini review-data review-format-strip">'
+                f'<span data-hook="avp-badge" class="a-size-mini a-color-state">Verified Purchase</span></div>'
+                f'<div class="a-row a-spacing-small review-data"><span data-hook="review-body" class="a-size-base review-text">'
+                f'<span>Body of review {i}, works as described. ' + 'More detail. ' * 10 + '</span></span></div>'
+                f'<div class="a-row review-comments"><span data-hook="helpful-vote-statement" class="a-size-base a-color-tertiary">'
+                f'{i} people found this helpful</span><span class="a-button"><a class="a-button-text">Helpful</a></span>'
+                f'<a class="a-link-normal report-abuse-link">Report</a></div></div>'
+            )
+        elif layout == 'legacy':
+            reviews.append(
+                f'<div class="review-item"><div class="reviewer-name-block">Buyer {i}</div>'
+                f'<div class="star-rating" aria-label="{stars} out of 5"></div>'
+                f'<h4 class="review-title">Legacy title {i}</h4>'
+                f'<div class="review-text">Legacy body {i}.</div>'
+                f'<span class="review-date">Reviewed in Canada on June {i % 28 + 1}, 2024</span>'
+                f'<span class="review-votes">{i} votes</span></div>'
+            )
+        else:
+            reviews.append(
+                f'<div data-hook="review"><span class="a-profile-name"></span>'
+                f'<a class="a-profile"><span class="user-profile-name">Fallback {i}</span></a>'
+                f'<i class="a-icon a-star-{stars}"></i>'
+                f'<div class="review-content-wrapper">Only body {i}</div>'
+                f'<time datetime="2024-05-{i % 28 + 1:02d}"></time></div>'
+            )
+    return _page(f'<div id="cm_cr-review_list">{"".join(reviews)}</div>')
+
+
+def legacy_amazon_fields(container) -> Dict[str, Any]:
+    """Amazon field extraction as it was before single-pass: one find() per strategy."""
+    def first_text(rules):
+        for selector, attrs in rules:
+            elem = container.find(selector, attrs)
+            if elem:
+                text = elem.get_text(strip=True)
+                if text:
+                    return text
+        return ''
+
+    rating = 0
+    for selector, attrs in [('i', {'data-hook': 'review-star-rating'}), ('span', {'class': 'a-icon-alt'}),
+                            ('i', {'class': re.compile(r'.*star.*')}), ('div', {'class': re.compile(r'.*rating.*')}),
+                            ('span', {'class': re.compile(r'.*star.*')})]:
+        elem = container.find(selector, attrs)
+        if elem:
+            rating_text = elem.get('aria-label', '') or elem.get_text() or str(elem.get('class', []))
+            rating_match = re.search(r'(\d+(?:\.\d+)?)', rating_text)
+            if rating_match:
+                rating = float(rating_match.group(1))
+                break
+
+    date = ''
+    for selector, attrs in [('span', {'data-hook': 'review-date'}), ('span', {'class': 'review-date'}),
+                            ('span', {'class': 'a-size-base'}), ('div', {'class': re.compile(r'.*date.*')}),
+                            ('time', {})]:
+        elem = container.find(selector, attrs)
+        if elem:
+            date_text = elem.get_text(strip=True) or elem.get('datetime', '')
+            if date_text:
+                date_match = re.search(r'on (.+?)(?:\s*$)', date_text)
+                date = date_match.group(1).strip() if date_match else date_text
+                break
+
+    return {
+        'reviewer_name': first_text([
+            ('span', {'class': 'a-profile-name'}), ('div', {'class': 'a-profile-content'}),
+            ('a', {'class': 'a-profile'}), ('span', {'class': re.compile(r'.*profile.*name.*')}),
+            ('div', {'class': re.compile(r'.*reviewer.*name.*')})]) or 'Anonymous',
+        'rating': rating,
+        'title': first_text([
+            ('a', {'data-hook': 'review-title'}), ('span', {'data-hook': 'review-title'}),
+            ('h4', {'class': 'review-title'}), ('h5', {'class': re.compile(r'.*title.*')}),
+            ('div', {'class': re.compile(r'.*title.*')})]),
+        'text': first_text([
+            ('span', {'data-hook': 'review-body'}), ('div', {'data-hook': 'review-body'}),
+            ('div', {'class': 'review-text'}), ('span', {'class': re.compile(r'.*review.*text.*')}),
+            ('div', {'class': re.compile(r'.*review.*content.*')})]),
+        'date': date,
+        'helpful_votes': first_text([
+            ('span', {'data-hook': 'helpful-vote-statement'}), ('span', {'class': 'review-votes'}),
+            ('div', {'class': re.compile(r'.*helpful.*')}), ('span', {'class': re.compile(r'.*vote.*')})])
+    }
+
+
+def yelp_page() -> bytes:
+    """Build a synthetic Yelp business page."""
+    reviews = ''.join(
+        f'<li class="review__item"><span class="user-passport-name">Diner {i}</span>'
+        f'<div aria-label="{i % 5 + 1} star rating" role="img"></div>'
+        f'<span class="date">7/{i % 28 + 1}/2025</span>'
+        f'<p class="comment"><span class="raw__text" lang="en">Visit {i} was great.</span></p></li>'
+        for i in range(REVIEWS_PER_PAGE)
+    )
+    return _page(f'<ul class="reviews-list">{reviews}</ul>')
+
+
+def walmart_page() -> bytes:
+    """Build a synthetic Walmart review page."""
+    reviews = ''.join(
+        f'<div class="customer-review-item"><span class="reviewer-name">Buyer {i}</span>'
+        f'<div aria-label="{i % 5 + 1} star rating"></div>'
+        f'<div class="review-text">Item {i} arrived on time.</div>'
+        f'<span class="review-date">7/{i % 28 + 1}/2025</span></div>'
+        for i in range(REVIEWS_PER_PAGE)
+    )
+    return _page(reviews)
+
+
+def drifted_yelp_page() -> bytes:
+    """Build a Yelp page whose markup only matches the later fallback strategies."""
+    reviews = ''.join(
+        f'<div class="review-card"><div class="user-info">Diner {i}</div>'
+        f'<span class="star-icon">{i % 5 + 1}</span>'
+        f'<div class="date-line">7/{i % 28 + 1}/2025</div>'
+        f'<p class="comment-body">Visit {i} was great.</p></div>'
+        for i in range(REVIEWS_PER_PAGE)
+    )
+    return _page(f'<div class="feed">{reviews}</div>')
+
+
+def yelp_card_page() -> bytes:
+    """Build a Yelp page with today's review cards next to a header a generic fallback also matches."""
+    reviews = ''.join(
+        f'<div data-testid="serp-ia-card"><span class="user-passport-name">Diner {i}</span>'
+        f'<div aria-label="{i % 5 + 1} star rating" role="img"></div>'
+        f'<span class="date">7/{i % 28 + 1}/2025</span>'
+        f'<p class="comment"><span class="raw__text" lang="en">Card {i} was great.</span></p></div>'
+        for i in range(2)
+    )
+    return _page(f'<div class="reviews-header"><h2>Recommended Reviews</h2></div>{reviews}')
+
+
+def drifted_walmart_page() -> bytes:
+    """Build a Walmart page whose markup only matches the later fallback strategies."""
+    reviews = ''.join(
+        f'<div class="customer-review-card"><div class="customer-name">Buyer {i}</div>'
+        f'<span class="star-rating-value">{i % 5 + 1}</span>'
+        f'<span class="review-content">Item {i} arrived on time.</span>'
+        f'<time>7/{i % 28 + 1}/2025</time></div>'
+        for i in range(REVIEWS_PER_PAGE)
+    )
+    return _page(reviews)
+
+
+def unusable_pages() -> List[tuple]:
+    """Build (name, page, parse function, expected verdict) cases for pages without reviews."""
+    amazon_captcha = (
+        b'<!doctype html><html><head><title dir="ltr">Amazon.com</title></head><body>'
+        b'<div class="a-box"><h4>Enter the characters you see below</h4>'
+        b'<p>Sorry, we just need to make sure you\'re not a robot.</p>'
+        b'<form method="get" action="/errors/validateCaptcha" name="">'
+        b'<img src="https://images-na.ssl-images-amazon.com/captcha/abc/Captcha_xyz.jpg">'
+        b'<input type="text" id="captchacharacters" name="field-keywords"></form></div></body></html>'
+    )
+    amazon_robot_check = (
+        b'<html><head><title>Robot Check</title></head><body><p>To discuss automated access to Amazon '
+        b'data please contact api-services-support@amazon.com.</p></body></html>'
+    )
+    amazon_sign_in = (
+        b'<html><head><title>Amazon Sign-In</title></head><body>'
+        b'<form name="signIn" method="post" action="https://www.amazon.com/ap/signin">'
+        b'<input type="email" name="email"><input type="password" name="password"></form></body></html>'
+    )
+    walmart_block = (
+        b'<!DOCTYPE html><html lang="en"><head><title>Robot or human?</title></head><body>'
+        b'<div id="px-captcha"></div><p>Activate and hold the button to confirm that you\'re human.</p>'
+        b'<script src="/px/captcha.js"></script></body></html>'
+    )
+    cloudflare = (
+        b'<!DOCTYPE html><html><head><title>Just a moment...</title></head><body>'
+        b'<div id="challenge-body-text">Checking if the site connection is secure</div></body></html>'
+    )
+    no_reviews = _page('<div class="product-details"><h1>New product</h1><p>Be the first to buy it.</p></div>')
+    yelp_url, walmart_url = 'https://www.yelp.com/biz/x', 'https://www.walmart.com/ip/1'
+    return [
+        ('amazon captcha', amazon_captcha, lambda page: amazon_scraper.parse_review_page(page, 'B000000000'),
+         page_classifier.PAGE_CAPTCHA),
+        ('amazon robot check', amazon_robot_check,
+         lambda page: amazon_scraper.parse_review_page(page, 'B000000000'), page_classifier.PAGE_BLOCKED),
+        ('amazon sign-in', amazon_sign_in, lambda page: amazon_scraper.parse_review_page(page, 'B000000000'),
+         page_classifier.PAGE_LOGIN),
+        ('walmart px captcha', walmart_block, lambda page: walmart_scraper.parse_review_page(page, walmart_url),
+         page_classifier.PAGE_CAPTCHA),
+        ('cloudflare challenge', cloudflare, lambda page: yelp_scraper.parse_review_page(page, yelp_url),
+         page_classifier.PAGE_BLOCKED),
+        ('amazon, no reviews', no_reviews, lambda page: amazon_scraper.parse_review_page(page, 'B000000000'),
+         page_classifier.PAGE_EMPTY),
+        ('walmart, no reviews', no_reviews, lambda page: walmart_scraper.parse_review_page(page, walmart_url),
+         page_classifier.PAGE_EMPTY),
+    ]
+
+
+class FixedOrder(SelectorStats):
+    """Selector statistics that never learn, i.e. the fixed fallback order."""
+
+    def __init__(self):
+        # Nothing is recorded, so nothing is ever written here
+        super().__init__(path=os.path.join(tempfile.gettempdir(), 'selector_stats_fixed.json'))
+
+    def order(self, host, group, count):
+        return list(range(count))
+
+    def record(self, host, group, index, missed=()):
+        pass
+
+
+def rule_containers(content: bytes, rules, strainer, backend: str) -> List[str]:
+    """Find containers with the first matching find_all rule, as a scraper does."""
+    soup = make_soup(content, strainer, backend=backend)
+    for selector, attrs in rules:
+        containers = soup.find_all(selector, attrs)
+        if containers:
+            return [container.get_text(' ', strip=True) for container in containers]
+    return []
+
+
+def time_call(func: Callable[[], Any], iterations: int) -> float:
+    """Return the mean wall time of a call in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def build_cases(scraper: UniversalScraper) -> List[Dict[str, Any]]:
+    """Collect one parse case per scraper and per universal platform."""
+    cases = []
+    for module, page in ((amazon_scraper, amazon_page()), (yelp_scraper, yelp_page()),
+                         (walmart_scraper, walmart_page())):
+        rules, strainer = module.REVIEW_CONTAINER_RULES, module.REVIEW_STRAINER
+        cases.append({
+            'name': module.__name__.split('.')[-1],
+            'size': len(page),
+            'run': lambda backend, page=page, rules=rules, strainer=strainer:
+                rule_containers(page, rules, strainer, backend)
+        })
+
+    for key, config in scraper.configs.items():
+        page = universal_page(config)
+        strainer = universal_scraper.plan_for(config).strainer
+
+        def run(backend, page=page, key=key, config=config, strainer=strainer):
+            soup = make_soup(page, strainer, backend=backend)
+            # Same path as UniversalScraper._extract_reviews, minus the logging
+            return [container.get_text(' ', strip=True)
+                    for container in soup.select(config.review_container)[:config.max_reviews]]
+
+        cases.append({'name': f'universal:{key}', 'size': len(page), 'run': run,
+                      'extract': lambda page=page, key=key, config=config:
+                          scraper._extract_reviews(page, 'https://example.com', key, config)})
+    return cases
+
+
+def check_parity(cases: List[Dict[str, Any]], backends) -> int:
+    """Compare extracted reviews across backends; return the number of mismatches."""
+    import utils.parsing as parsing
+
+    mismatches = 0
+    for case in cases:
+        baseline = case['run']('html.parser')
+        if not baseline:
+            print(f"  ⚠️  {case['name']}: no reviews found with html.parser")
+            mismatches += 1
+            continue
+        for backend in backends[1:]:
+            if case['run'](backend) != baseline:
+                print(f"  ❌ {case['name']}: {backend} differs from html.parser")
+                mismatches += 1
+
+        if 'extract' in case:
+            # Full field extraction must agree as well
+            outputs = []
+            default_backend = parsing.DEFAULT_PARSER_BACKEND
+            try:
+                for backend in backends:
+                    parsing.DEFAULT_PARSER_BACKEND = backend
+                    outputs.append(case['extract']())
+            finally:
+                parsing.DEFAULT_PARSER_BACKEND = default_backend
+            if any(output != outputs[0] for output in outputs[1:]):
+                print(f"  ❌ {case['name']}: extracted fields differ between backends")
+                mismatches += 1
+    return mismatches
+
+
+def extract_fields_raw(containers, config) -> List[tuple]:
+    """Field lookups the way extraction worked before selector plans: raw strings per call."""
+    return [(container.select_one(config.reviewer_name), container.select_one(config.rating),
+             container.select_one(config.review_text), container.select_one(config.date))
+            for container in containers]
+
+
+def extract_fields_compiled(containers, plan: SelectorPlan) -> List[tuple]:
+    """Field lookups through a precompiled selector plan."""
+    return [(plan.reviewer_name.select_one(container), plan.rating.select_one(container),
+             plan.review_text.select_one(container), plan.date.select_one(container))
+            for container in containers]
+
+
+def bench_selectors(scraper: UniversalScraper, iterations: int) -> int:
+    """Time per-review extraction with raw vs compiled selectors; return mismatches."""
+    print(f"\n⏱️  Selector cost per review (µs, {iterations * 20} passes)")
+    print(f"  {'platform':<28}{'raw':>12}{'compiled':>12}{'speedup':>10}")
+    mismatches = 0
+    raw_total = compiled_total = 0.0
+    for key, config in scraper.configs.items():
+        plan = universal_scraper.plan_for(config)
+        soup = make_soup(universal_page(config), backend='html.parser')
+
+        raw = lambda: extract_fields_raw(soup.select(config.review_container)[:config.max_reviews], config)
+        compiled = lambda: extract_fields_compiled(plan.container.select(soup, limit=config.max_reviews), plan)
+        if raw() != compiled():
+            print(f"  ❌ {key}: compiled plan selects different elements")
+            mismatches += 1
+
+        count = len(compiled()) or 1
+        raw_us = time_call(raw, iterations * 20) * 1000 / count
+        compiled_us = time_call(compiled, iterations * 20) * 1000 / count
+        raw_total += raw_us
+        compiled_total += compiled_us
+        print(f"  {key:<28}{raw_us:>12.1f}{compiled_us:>12.1f}{raw_us / compiled_us:>9.1f}x")
+
+    platforms = len(scraper.configs)
+    print(f"  {'mean':<28}{raw_total / platforms:>12.1f}{compiled_total / platforms:>12.1f}"
+          f"{raw_total / compiled_total:>9.1f}x")
+    print(f"  {platforms - mismatches}/{platforms} platforms select identical elements")
+    return mismatches
+
+
+def _select_texts(scraper: UniversalScraper, page: bytes, key: str, incremental: bool) -> List[str]:
+    """Select review containers with incremental parsing switched on or off."""
+    default = parsing.INCREMENTAL_PARSE
+    parsing.INCREMENTAL_PARSE = incremental
+    try:
+        config = scraper.configs[key]
+        containers = universal_scraper.select_containers(page, universal_scraper.plan_for(config), config)
+        return [container.get_text(' ', strip=True) for container in containers]
+    finally:
+        parsing.INCREMENTAL_PARSE = default
+
+
+def _parsed_bytes(scraper: UniversalScraper, page: bytes, key: str) -> int:
+    """Return how many bytes of a page incremental selection built a tree for."""
+    sizes = []
+    make_soup = universal_scraper.make_soup
+
+    def recording_make_soup(content, *args, **kwargs):
+        sizes.append(len(content))
+        return make_soup(content, *args, **kwargs)
+
+    universal_scraper.make_soup = recording_make_soup
+    try:
+        _select_texts(scraper, page, key, True)
+    finally:
+        universal_scraper.make_soup = make_soup
+    return sizes[-1]
+
+
+def _peak_kb(func: Callable[[], Any]) -> float:
+    """Return the peak traced memory of a call in KB."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_incremental(scraper: UniversalScraper, iterations: int) -> int:
+    """Compare full and incremental parsing of huge pages; return mismatches."""
+    if not LXML_AVAILABLE:
+        print("\n⚠️  lxml is not installed; incremental parsing is disabled")
+        return 0
+    if not parsing.PUSH_PARSER_USABLE:
+        print(f"\n❌ libxml2 {parsing.etree.LIBXML_VERSION} cannot scan pages incrementally; "
+              f"install the pinned lxml")
+        return 1
+
+    print("\n🔍 Incremental parse parity check")
+    mismatches = 0
+    for key, config in scraper.configs.items():
+        # Full pages, and pages with fewer reviews than max_reviews
+        for footer_blocks, review_count in ((150, REVIEWS_PER_PAGE), (5000, REVIEWS_PER_PAGE), (5000, 5)):
+            page = universal_page(config, footer_blocks, review_count=review_count)
+            if _select_texts(scraper, page, key, True) != _select_texts(scraper, page, key, False):
+                print(f"  ❌ {key}: incremental parse selects different containers "
+                      f"({review_count} reviews)")
+                mismatches += 1
+    platforms = len(scraper.configs)
+    print(f"  {platforms * 3 - mismatches}/{platforms * 3} pages identical")
+
+    print(f"\n⏱️  Huge pages, full vs incremental (ms mean of {iterations} / peak KB)")
+    print(f"  {'case':<34}{'KB':>7}{'full ms':>10}{'incr ms':>10}{'full KB':>10}{'incr KB':>10}")
+    cases = [
+        ('target, reviews near top', 'target', universal_page(scraper.configs['target'], 8000)),
+        ('walmart, reviews near top', 'walmart', universal_page(scraper.configs['walmart'], 8000)),
+        # Fewer reviews than max_reviews: the scan stops when the review list closes
+        ('target, 5 reviews near top', 'target', universal_page(scraper.configs['target'], 8000, review_count=5)),
+        ('walmart, 5 reviews near top', 'walmart', universal_page(scraper.configs['walmart'], 8000, review_count=5)),
+        ('target, no reviews', 'target', _page('', 8000)),
+    ]
+    for name, key, page in cases:
+        if 'near top' in name and _parsed_bytes(scraper, page, key) >= len(page):
+            print(f"  ❌ {name}: the section scan found no cut, the whole page was parsed")
+            mismatches += 1
+        full = lambda: _select_texts(scraper, page, key, False)
+        incremental = lambda: _select_texts(scraper, page, key, True)
+        print(f"  {name:<34}{len(page) // 1024:>7}"
+              f"{time_call(full, iterations):>10.1f}{time_call(incremental, iterations):>10.1f}"
+              f"{_peak_kb(full):>10.0f}{_peak_kb(incremental):>10.0f}")
+    return mismatches
+
+
+def bench_amazon(iterations: int) -> int:
+    """Compare per-field and single-pass Amazon extraction; return mismatches."""
+    # Fixed strategy order, so both sides prefer the same rules
+    stats = FixedOrder()
+    print(f"\n⏱️  Amazon field extraction per review (µs, {iterations * 20} passes)")
+    print(f"  {'layout':<28}{'find() x25':>12}{'one pass':>12}{'speedup':>10}")
+    mismatches = 0
+    for layout in ('current', 'legacy', 'sparse'):
+        soup = make_soup(amazon_fixture_page(layout), backend='html.parser')
+        containers = []
+        for selector, attrs in amazon_scraper.REVIEW_CONTAINER_RULES:
+            containers = soup.find_all(selector, attrs)
+            if containers:
+                break
+
+        legacy = lambda: [legacy_amazon_fields(container) for container in containers]
+        single_pass = lambda: [amazon_scraper.extract_fields(container, stats) for container in containers]
+        if not containers or legacy() != single_pass():
+            print(f"  ❌ {layout}: single-pass fields differ from per-field extraction")
+            mismatches += 1
+            continue
+
+        legacy_us = time_call(legacy, iterations * 20) * 1000 / len(containers)
+        single_us = time_call(single_pass, iterations * 20) * 1000 / len(containers)
+        print(f"  {layout:<28}{legacy_us:>12.1f}{single_us:>12.1f}{legacy_us / single_us:>9.1f}x")
+    return mismatches
+
+
+def bench_adaptive(iterations: int) -> int:
+    """Compare fixed and learned selector order on drifted markup; return mismatches."""
+    print(f"\n⏱️  Fixed vs learned selector order, drifted markup (ms per page, mean of {iterations})")
+    print(f"  {'scraper':<28}{'fixed':>10}{'learned':>10}{'speedup':>10}")
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        cache = ResponseCache(cache_dir=workdir)
+        # (name, scraper, drifted page, its URL, scrape, page in the preferred markup, parse)
+        cases = (
+            ('amazon (legacy markup)', AmazonScraper, amazon_fixture_page('legacy'),
+             amazon_scraper.REVIEW_URL_VARIANTS[0].format(asin='B000000000'),
+             lambda scraper: scraper.get_reviews_via_scraping('B000000000'), amazon_fixture_page('current'),
+             lambda page, stats: amazon_scraper.parse_review_page(page, 'B000000000', selector_stats=stats)),
+            ('yelp', YelpScraper, drifted_yelp_page(), 'https://www.yelp.com/biz/drifted',
+             lambda scraper: scraper.get_reviews_via_scraping('drifted'), yelp_card_page(),
+             lambda page, stats: yelp_scraper.parse_review_page(page, 'https://www.yelp.com/biz/cards',
+                                                                selector_stats=stats)),
+            ('walmart', WalmartScraper, drifted_walmart_page(), 'https://www.walmart.com/ip/123',
+             lambda scraper: scraper.get_reviews('123'), walmart_page(),
+             lambda page, stats: walmart_scraper.parse_review_page(page, 'https://www.walmart.com/ip/456',
+                                                                   selector_stats=stats))
+        )
+        for name, scraper_class, page, url, scrape, preferred_page, parse in cases:
+            cache.set(url, page)
+            fixed = scraper_class(response_cache=cache, selector_stats=FixedOrder())
+            learned = scraper_class(response_cache=cache, selector_stats=SelectorStats(path=f'{workdir}/{name}.json'))
+
+            fixed_reviews = scrape(fixed)
+            learned_reviews = scrape(learned)  # learns the winning strategies
+            if not fixed_reviews or fixed_reviews != learned_reviews or scrape(learned) != fixed_reviews:
+                print(f"  ❌ {name}: learned order extracts different reviews")
+                mismatches += 1
+                continue
+
+            fixed_ms = time_call(lambda: scrape(fixed), iterations)
+            learned_ms = time_call(lambda: scrape(learned), iterations)
+            print(f"  {name:<28}{fixed_ms:>10.2f}{learned_ms:>10.2f}{fixed_ms / learned_ms:>9.1f}x")
+
+            # Once the markup is back, the fallbacks learned during the drift
+            # must not keep the preferred rules from winning
+            for _ in range(learned.selector_stats.skip_after):
+                scrape(learned)
+            expected = parse(preferred_page, FixedOrder())
+            if not expected or any(parse(preferred_page, learned.selector_stats) != expected for _ in range(2)):
+                print(f"  ❌ {name}: fallbacks learned on drifted markup displace the preferred rules")
+                mismatches += 1
+    return mismatches
+
+
+def bench_pool(scraper: UniversalScraper, iterations: int) -> int:
+    """Compare threaded inline parsing with the process parse pool; return mismatches."""
+    pages = [(key, universal_page(scraper.configs[key])) for key in ('walmart', 'target', 'bestbuy', 'homedepot')] * 4
+    workers = max(2, min(4, os.cpu_count() or 1))
+    print(f"\n⏱️  {len(pages)} pages parsed from 8 threads (ms per batch, mean of {iterations}, {os.cpu_count()} CPUs)")
+    print(f"  {'mode':<28}{'ms':>10}{'speedup':>10}")
+
+    def parse_all(pool: ParsePool):
+        with ThreadPoolExecutor(max_workers=8) as threads:
+            return list(threads.map(
+                lambda page: pool.run(universal_scraper.extract_reviews, page[1], 'https://example.com',
+                                      page[0], scraper.configs[page[0]]),
+                pages))
+
+    inline, pooled = ParsePool(workers=0), ParsePool(workers=workers)
+    try:
+        expected = parse_all(inline)
+        if parse_all(pooled) != expected:  # also starts the workers
+            print("  ❌ parse pool extracts different reviews")
+            return 1
+        inline_ms = time_call(lambda: parse_all(inline), iterations)
+        pooled_ms = time_call(lambda: parse_all(pooled), iterations)
+    finally:
+        pooled.shutdown()
+    print(f"  {'inline (GIL-bound threads)':<28}{inline_ms:>10.2f}{1:>9.1f}x")
+    print(f"  {f'{workers} worker processes':<28}{pooled_ms:>10.2f}{inline_ms / pooled_ms:>9.1f}x")
+    return 0
+
+
+def bench_screen(scraper: UniversalScraper, iterations: int) -> int:
+    """Compare parsing pages without reviews to classifying their bytes; return mismatches."""
+    mismatches = 0
+    # Every page with reviews must be parsed as before
+    real_pages = [('amazon', amazon_page(), amazon_scraper.REVIEW_MARKERS),
+                  ('yelp', yelp_page(), yelp_scraper.REVIEW_MARKERS),
+                  ('walmart', walmart_page(), walmart_scraper.REVIEW_MARKERS),
+                  ('yelp (drifted)', drifted_yelp_page(), yelp_scraper.REVIEW_MARKERS),
+                  ('walmart (drifted)', drifted_walmart_page(), walmart_scraper.REVIEW_MARKERS)]
+    real_pages += [(f'amazon ({layout})', amazon_fixture_page(layout), amazon_scraper.REVIEW_MARKERS)
+                   for layout in ('current', 'legacy', 'sparse')]
+    real_pages += [(f'universal:{key}', universal_page(config, head_html=json_ld_script()), (b'review',))
+                   for key, config in scraper.configs.items()]
+    # Product titles that start like a sign-in page's
+    real_pages += [(f'amazon titled "{title}"',
+                    amazon_fixture_page('current').replace(b'<title>Product</title>', f'<title>{title}</title>'.encode()),
+                    amazon_scraper.REVIEW_MARKERS)
+                   for title in ('Sign-In Sheet Clipboard, 50 Pack', 'Log In Book for Passwords', 'Login Notebook')]
+    for name, page, markers in real_pages:
+        if page_classifier.classify_page(page, markers) != page_classifier.PAGE_OK:
+            print(f"  ❌ {name}: page with reviews classified as {page_classifier.classify_page(page, markers)}")
+            mismatches += 1
+    print(f"🔍 {len(real_pages) - mismatches}/{len(real_pages)} pages with reviews classified as parseable")
+
+    print(f"\n⏱️  Pages without reviews: parse vs classify (ms, mean of {iterations})")
+    print(f"  {'page':<28}{'KB':>6}{'verdict':>10}{'parse':>10}{'classify':>10}{'speedup':>10}")
+    for name, page, parse, expected in unusable_pages():
+        markers = amazon_scraper.REVIEW_MARKERS if name.startswith('amazon') else (b'review',)
+        verdict = page_classifier.classify_page(page, markers)
+        if verdict != expected or parse(page):
+            print(f"  ❌ {name}: classified as {verdict}, expected {expected}")
+            mismatches += 1
+            continue
+        parse_ms = time_call(lambda: parse(page), iterations)
+        classify_ms = time_call(lambda: page_classifier.classify_page(page, markers), iterations)
+        print(f"  {name:<28}{len(page) // 1024:>6}{verdict:>10}{parse_ms:>10.3f}{classify_ms:>10.3f}"
+              f"{parse_ms / classify_ms:>9.0f}x")
+    return mismatches
+
+
+def write_registry(directory: str, base, size: int, per_file: int = 500, tag: str = '') -> None:
+    """Write a synthetic site registry of `size` configs modeled on `base`."""
+    os.makedirs(directory, exist_ok=True)
+    entry = dataclasses.asdict(base)
+    for start in range(0, size, per_file):
+        sites = {f'store{i}': dict(entry, name=f'Store {i}{tag}', domain=f'store{i}-shop.com')
+                 for i in range(start, min(size, start + per_file))}
+        with open(os.path.join(directory, f'{start // per_file:04d}.json'), 'w', encoding='utf-8') as f:
+            json.dump(sites, f)
+
+
+def legacy_detect_platform(configs, url: str):
+    """Platform detection as it was: the first config whose domain is a substring of the host."""
+    domain = urlparse(url).netloc.lower()
+    for platform, config in configs.items():
+        if config.domain in domain:
+            return platform
+    return None
+
+
+def bench_detect(scraper: UniversalScraper, iterations: int) -> int:
+    """Compare the substring scan with the domain index; return mismatches."""
+    mismatches = misfires = 0
+    domains = [config.domain for config in scraper.configs.values()]
+    urls = [f'https://{prefix}{domain}/p/1' for domain in domains for prefix in ('', 'www.', 'm.')]
+    urls += ['https://www.shm.com/', 'https://www.bhm.com/', 'https://www.singapore.com/',
+             'https://www.walmart.com.example.org/', 'https://www.zoom.com/', 'https://www.amazon.com/']
+    for url in urls:
+        legacy, indexed = legacy_detect_platform(scraper.configs, url), scraper.detect_platform(url)
+        if legacy == indexed:
+            continue
+        host = urlparse(url).hostname
+        if indexed is None and not any(host == domain or host.endswith('.' + domain) for domain in domains):
+            misfires += 1
+            print(f"  fixed misfire: {host} no longer detected as {legacy}")
+        else:
+            print(f"  ❌ {url}: index says {indexed}, substring scan says {legacy}")
+            mismatches += 1
+    print(f"🔍 {len(urls) - misfires - mismatches}/{len(urls)} URLs detected as before, {misfires} misfires fixed")
+
+    base = next(iter(scraper.configs.values()))
+    lookups = 1000
+    print(f"\n⏱️  Platform detection per URL (µs, {lookups} URLs, best of {iterations})")
+    print(f"  {'configs':<28}{'scan':>10}{'index':>10}{'memo':>10}{'speedup':>10}")
+    workdir = tempfile.TemporaryDirectory()
+    for size in (len(scraper.configs), 1000, 10000):
+        synthetic = scraper
+        if size != len(scraper.configs):
+            write_registry(os.path.join(workdir.name, str(size)), base, size)
+            synthetic = UniversalScraper(rate_limiter=HostRateLimiter(),
+                                         registry=SiteRegistry(os.path.join(workdir.name, str(size)), check_interval=-1))
+        configs = synthetic.configs
+        keys = list(configs)
+        sample = [f'https://www.{configs[keys[i * 7919 % size]].domain}/p/{i}' for i in range(lookups)]
+        sample.append('https://www.unknown-store.com/p/1')
+
+        if any(legacy_detect_platform(configs, url) != synthetic.detect_platform(url) for url in sample):
+            print(f"  ❌ {size} configs: index disagrees with the substring scan")
+            mismatches += 1
+            continue
+
+        def cold():
+            synthetic.registry.snapshot().platform_for_host.cache_clear()
+            for url in sample:
+                synthetic.detect_platform(url)
+
+        scan_us = min(time_call(lambda: [legacy_detect_platform(configs, url) for url in sample], 1)
+                      for _ in range(iterations)) * 1000 / len(sample)
+        index_us = min(time_call(cold, 1) for _ in range(iterations)) * 1000 / len(sample)
+        memo_us = min(time_call(lambda: [synthetic.detect_platform(url) for url in sample], 1)
+                      for _ in range(iterations)) * 1000 / len(sample)
+        print(f"  {size:<28}{scan_us:>10.2f}{index_us:>10.2f}{memo_us:>10.2f}{scan_us / memo_us:>9.0f}x")
+    workdir.cleanup()
+    return mismatches
+
+
+def bench_registry(scraper: UniversalScraper, iterations: int) -> int:
+    """Time registry loads and reloads, and check readers only see complete versions; return mismatches."""
+    size, per_file = 10000, 500
+    base = next(iter(scraper.configs.values()))
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        write_registry(workdir, base, size, per_file)
+        registry = SiteRegistry(workdir, check_interval=-1)
+        if len(registry.snapshot().configs) != size:
+            print(f"  ❌ registry loaded {len(registry.snapshot().configs)} of {size} sites")
+            return 1
+
+        first_file = os.path.join(workdir, '0000.json')
+        with open(first_file, encoding='utf-8') as f:
+            first_sites = f.read()
+
+        def touch_one():
+            stat = os.stat(first_file)
+            os.utime(first_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+            registry.reload()
+
+        print(f"\n⏱️  Site registry with {size} sites in {size // per_file} files (ms, mean of {iterations})")
+        rows = (
+            ('cold load', lambda: SiteRegistry(workdir, check_interval=-1)),
+            ('change check, nothing new', lambda: registry.reload()),
+            ('reload, one file changed', touch_one),
+            ('reload, everything re-read', lambda: registry.reload(force=True)),
+            (f'UniversalScraper(), {len(scraper.configs)} sites', lambda: UniversalScraper(registry=scraper.registry))
+        )
+        for name, run in rows:
+            print(f"  {name:<36}{time_call(run, iterations):>10.2f}")
+
+        # Per-config memory against a plain dataclass with the same fields
+        plain_config = dataclasses.make_dataclass('PlainScrapeConfig', [
+            (field.name, field.type, dataclasses.field(default=field.default))
+            for field in dataclasses.fields(ScrapeConfig)])
+        entries = [dataclasses.asdict(config) for config in registry.snapshot().configs.values()]
+        sizes = {}
+        for name, config_type in (('plain dataclass', plain_config), ('frozen, slotted ScrapeConfig', ScrapeConfig)):
+            tracemalloc.start()
+            configs = [config_type(**entry) for entry in entries]
+            sizes[name] = tracemalloc.get_traced_memory()[0] / len(configs)
+            tracemalloc.stop()
+            del configs
+        print(f"\n📦 Memory per config, {size} configs (bytes)")
+        for name, per_config in sizes.items():
+            print(f"  {name:<36}{per_config:>10.0f}")
+        if sizes['frozen, slotted ScrapeConfig'] >= sizes['plain dataclass'] or hasattr(base, '__dict__'):
+            print("  ❌ ScrapeConfig is not slotted")
+            mismatches += 1
+
+        # Readers must only ever see complete versions while files are rewritten,
+        # including a file caught half-written
+        registry.check_interval = 0
+        stop = threading.Event()
+        seen = {'snapshots': 0, 'broken': 0, 'versions': set()}
+
+        def read():
+            while not stop.is_set():
+                sites = registry.snapshot()
+                seen['snapshots'] += 1
+                seen['versions'].add(sites.version)
+                if len(sites.configs) != size or sites.platform_for_host('www.store1-shop.com') != 'store1':
+                    seen['broken'] += 1
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        registry_logger = logging.getLogger('scrapers.site_registry')
+        log_level = registry_logger.level
+        registry_logger.setLevel(logging.CRITICAL)
+        for reader in readers:
+            reader.start()
+        for round_number in range(20):
+            with open(first_file, 'w', encoding='utf-8') as f:
+                f.write(first_sites[:len(first_sites) // 2])
+                f.flush()
+                time.sleep(0.005)
+                f.seek(0)
+                f.write(first_sites.replace('"Store 1"', f'"Store 1 r{round_number}"'))
+                f.truncate()
+            time.sleep(0.01)
+        stop.set()
+        for reader in readers:
+            reader.join()
+        registry_logger.setLevel(log_level)
+
+        if seen['broken']:
+            print(f"  ❌ readers saw {seen['broken']} incomplete registry versions")
+            mismatches += 1
+        print(f"🔍 {seen['snapshots']} snapshots read across {len(seen['versions'])} versions during hot reloads, "
+              f"{seen['broken']} incomplete; {registry.errors} half-written files rejected")
+    return mismatches
+
+
+def bench_startup(iterations: int, budget_ms: float) -> int:
+    """Time cold starts of the app against the budget; return failures."""
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env.pop('STARTUP_DEBUG', None)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (repo_dir, env.get('PYTHONPATH'))))
+
+    runs = []
+    # Run from a scratch directory so the app's logs and caches stay out of the tree
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            proc = subprocess.run([sys.executable, '-c', STARTUP_PROBE], cwd=workdir, env=env,
+                                  capture_output=True, text=True)
+            process_ms = (time.perf_counter() - start) * 1000
+            if proc.returncode != 0:
+                print(f"  ❌ app failed to start:\n{proc.stderr.strip()}")
+                return 1
+            run = json.loads(proc.stdout.strip().splitlines()[-1])
+            run['process_ms'] = process_ms
+            runs.append(run)
+
+    print(f"\n⏱️  Cold start to first /health response (ms, median of {iterations})")
+    rows = (
+        ('import app + GET /health', 'startup_ms'),
+        ('whole process', 'process_ms'),
+        ('first use of all four scrapers', 'first_use_ms')
+    )
+    for name, key in rows:
+        print(f"  {name:<36}{statistics.median(run[key] for run in runs):>10.2f}")
+
+    failures = 0
+    startup_ms = statistics.median(run['startup_ms'] for run in runs)
+    if startup_ms > budget_ms:
+        print(f"  ❌ startup took {startup_ms:.0f}ms, over the {budget_ms:.0f}ms budget")
+        failures += 1
+    heavy = sorted({name for run in runs for name in run['heavy']})
+    if heavy:
+        print(f"  ❌ imported before first use: {', '.join(heavy)}")
+        failures += 1
+    if any(run['status'] != 200 for run in runs):
+        print("  ❌ /health did not answer 200")
+        failures += 1
+    if any(run['amazon_instances'] != 1 for run in runs):
+        print("  ❌ concurrent first use built more than one Amazon scraper")
+        failures += 1
+    print(f"🔍 {startup_ms:.0f}ms of a {budget_ms:.0f}ms budget; no scraper imported before first use: {not heavy}")
+    return failures
+
+
+# Review vocabulary: filler, category keywords, and words that contain a
+# keyword without being one (e.g. 'benefit' contains 'fit')
+FILLER_WORDS = ('the', 'a', 'this', 'I', 'it', 'was', 'and', 'to', 'of', 'for', 'my', 'is', 'with', 'but',
+                'very', 'we', 'just', 'color', 'looks', 'nice', 'kids', 'table', 'legs', 'screws', 'minutes',
+                'husband', 'bought', 'again', 'ok', 'fine', 'works', 'as', 'expected', 'would', 'buy', 'Great!',
+                'love', 'it.', 'not', 'really', 'daughter', 'birthday', 'gift', 'after', 'two', 'weeks')
+TRICKY_WORDS = ('benefit', 'costume', 'lastly', 'xbox', 'unhelpful', 'input', 'together', 'Bigger', 'smallest',
+                'wearing', 'supported,', 'shipped.', 'RECEIVED', 'too', 'customer', 'service')
+
+
+def review_corpus(count: int, keywords: Dict[str, List[str]], seed: int = 7) -> List[str]:
+    """Build `count` synthetic reviews of 10-120 words, about one in five words a keyword."""
+    rng = random.Random(seed)
+    keyword_list = [keyword for words in keywords.values() for keyword in words]
+    reviews = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(10, 120)):
+            roll = rng.random()
+            if roll < 0.08:
+                word = rng.choice(keyword_list)
+                words.append(word.upper() if roll < 0.01 else word)
+            elif roll < 0.2:
+                words.append(rng.choice(TRICKY_WORDS))
+            else:
+                words.append(rng.choice(FILLER_WORDS))
+        reviews.append(' '.join(words).capitalize() + rng.choice(('.', '!', '\n')))
+    return reviews
+
+
+def legacy_categorize_review(keywords: Dict[str, List[str]], text: str) -> List[str]:
+    """Review categorization as it was: one substring scan per keyword."""
+    if not text:
+        return []
+    text_lower = text.lower()
+    matching_categories = []
+    for category, category_keywords in keywords.items():
+        for keyword in category_keywords:
+            if keyword.lower() in text_lower:
+                matching_categories.append(category)
+                break
+    return matching_categories
+
+
+def bench_categorize(iterations: int) -> int:
+    """Compare the original keyword loop with the analyzer on 100k reviews; return mismatches."""
+    analyzer = ReviewAnalyzer()
+    keywords = analyzer.criteria_keywords
+    count = 100000
+    reviews = review_corpus(count, keywords)
+    # Phrases split across lines or doubled spaces, and keywords inside other words
+    reviews += ['input together', 'put\ntogether', 'too  big', 'TOO BIG', 'good deal!', 'benefit', 'x', '',
+                'bang for buck', 'well  made', 'falls apart.', 'customer service', 'Customer\tservice']
+
+    mismatches = 0
+    for text in reviews:
+        if analyzer.categorize_review(text) != legacy_categorize_review(keywords, text):
+            if mismatches < 5:
+                print(f"  ❌ {text[:60]!r}: {analyzer.categorize_review(text)} != "
+                      f"{legacy_categorize_review(keywords, text)}")
+            mismatches += 1
+    print(f"🔍 {len(reviews) - mismatches}/{len(reviews)} reviews categorized as before")
+
+    print(f"\n⏱️  Categorizing {count} reviews (ms, best of {iterations})")
+    print(f"  {'corpus':<28}{'loop':>10}{'analyzer':>10}{'speedup':>10}")
+    plain = review_corpus(count, {'none': ['#']}, seed=11)
+    # Long reviews, with and without every category present
+    long_mixed = [' '.join(reviews[i:i + 40]) for i in range(0, count, 40)]
+    long_plain = [' '.join(plain[i:i + 40]) for i in range(0, count, 40)]
+    for name, corpus in (('mixed reviews', reviews[:count]), ('no category words', plain),
+                         ('40x long, mixed', long_mixed), ('40x long, no category words', long_plain)):
+        loop_ms = min(time_call(lambda: [legacy_categorize_review(keywords, text) for text in corpus], 1)
+                      for _ in range(iterations))
+        analyzer_ms = min(time_call(lambda: [analyzer.categorize_review(text) for text in corpus], 1)
+                          for _ in range(iterations))
+        print(f"  {name:<28}{loop_ms:>10.1f}{analyzer_ms:>10.1f}{loop_ms / analyzer_ms:>9.1f}x")
+    return mismatches
+
+
+def bench_structured(scraper: UniversalScraper, iterations: int) -> int:
+    """Compare embedded JSON extraction with the CSS path; return mismatches."""
+    print(f"\n⏱️  Embedded JSON vs CSS extraction (ms, mean of {iterations})")
+    print(f"  {'platform':<28}{'blob':>12}{'css':>10}{'json':>10}{'speedup':>10}")
+    mismatches = 0
+    for key in ('walmart', 'target', 'bestbuy', 'homedepot', 'wayfair'):
+        config = scraper.configs[key]
+        # Best Buy's CSS config reads the rating from the reviewer name element,
+        # so only the JSON path gets its ratings right
+        fields = ('reviewer_name', 'review_text', 'date')
+        if config.rating != config.reviewer_name:
+            fields += ('rating',)
+        css_config = dataclasses.replace(config, structured_data=False)
+        for blob, script in (('json-ld', json_ld_script()), ('__NEXT_DATA__', next_data_script())):
+            page = universal_page(config, head_html=script)
+            css = lambda: scraper._extract_reviews(page, 'https://example.com', key, css_config)
+            structured = lambda: scraper._extract_reviews(page, 'https://example.com', key, config)
+
+            css_reviews, structured_reviews = css(), structured()
+            if ([tuple(r[f] for f in fields) for r in css_reviews] !=
+                    [tuple(r[f] for f in fields) for r in structured_reviews] or
+                    not all(r['source'].endswith('_structured_data') for r in structured_reviews)):
+                print(f"  ❌ {key} ({blob}): embedded JSON reviews differ from CSS reviews")
+                mismatches += 1
+
+            css_ms, structured_ms = time_call(css, iterations), time_call(structured, iterations)
+            print(f"  {key:<28}{blob:>12}{css_ms:>10.2f}{structured_ms:>10.2f}{css_ms / structured_ms:>9.1f}x")
+    return mismatches
+
+
+def bench_parsers(scraper: UniversalScraper, iterations: int) -> int:
+    """Time every parser backend and check their parity; return mismatches."""
+    backends = list(PARSER_BACKENDS) if LXML_AVAILABLE else ['html.parser']
+    if not LXML_AVAILABLE:
+        print("⚠️  lxml is not installed; only html.parser is benchmarked")
+
+    cases = build_cases(scraper)
+
+    print("🔍 Parser parity check")
+    mismatches = check_parity(cases, backends)
+    print(f"  {len(cases) - mismatches}/{len(cases)} cases identical across {', '.join(backends)}")
+
+    print(f"\n⏱️  Parse time per page (ms, mean of {iterations})")
+    print(f"  {'case':<28}{'KB':>6}" + ''.join(f'{backend:>16}' for backend in backends))
+    totals = {backend: 0.0 for backend in backends}
+    for case in cases:
+        row = f"  {case['name']:<28}{case['size'] // 1024:>6}"
+        for backend in backends:
+            elapsed = time_call(lambda: case['run'](backend), iterations)
+            totals[backend] += elapsed
+            row += f'{elapsed:>16.2f}'
+        print(row)
+    print(f"  {'total':<34}" + ''.join(f'{totals[backend]:>16.2f}' for backend in backends))
+
+    if len(backends) > 1:
+        baseline = totals['html.parser']
+        for backend in backends[1:]:
+            print(f"  {backend}: {baseline / totals[backend]:.1f}x faster than html.parser")
+
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark review parsing and extraction')
+    parser.add_argument('--suite', choices=['all', 'parsers', 'selectors', 'incremental', 'structured', 'amazon',
+                                            'adaptive', 'pool', 'screen', 'detect', 'registry', 'startup',
+                                            'categorize'],
+                        default='all',
+                        help='Benchmark suite to run')
+    parser.add_argument('--iterations', type=int, default=5, help='Repetitions per case')
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET_MS,
+                        help='Cold start budget in ms for the startup suite')
+    args = parser.parse_args()
+
+    scraper = UniversalScraper()
+    mismatches = 0
+    if args.suite in ('all', 'parsers'):
+        mismatches += bench_parsers(scraper, args.iterations)
+    if args.suite in ('all', 'selectors'):
+        mismatches += bench_selectors(scraper, args.iterations)
+    if args.suite in ('all', 'incremental'):
+        mismatches += bench_incremental(scraper, args.iterations)
+    if args.suite in ('all', 'structured'):
+        mismatches += bench_structured(scraper, args.iterations)
+    if args.suite in ('all', 'amazon'):
+        mismatches += bench_amazon(args.iterations)
+    if args.suite in ('all', 'adaptive'):
+        mismatches += bench_adaptive(args.iterations)
+    if args.suite in ('all', 'pool'):
+        mismatches += bench_pool(scraper, args.iterations)
+    if args.suite in ('all', 'screen'):
+        mismatches += bench_screen(scraper, args.iterations)
+    if args.suite in ('all', 'detect'):
+        mismatches += bench_detect(scraper, args.iterations)
+    if args.suite in ('all', 'registry'):
+        mismatches += bench_registry(scraper, args.iterations)
+    if args.suite in ('all', 'startup'):
+        mismatches += bench_startup(args.iterations, args.startup_budget)
+    if args.suite in ('all', 'categorize'):
+        mismatches += bench_categorize(args.iterations)
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
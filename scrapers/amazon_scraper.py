@@ -9,27 +9,391 @@ import os
 import re
 import logging
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import List, Dict, Optional, Any
-from urllib.parse import urlparse, parse_qs
+from typing import Callable, List, Dict, Optional, Any, Tuple
+from urllib.parse import urlparse, parse_qs, urlencode
 import time
 import random
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from utils.http_transport import HttpTransport, RevalidationStore, get_shared_transport
+from utils.response_cache import ResponseCache, get_shared_response_cache
+from utils.rate_limiter import HostRateLimiter, HostBackoffError, get_shared_rate_limiter
+from utils.parsing import make_soup, strainer_for_rules, attrs_match
+from utils.selector_stats import SelectorStats, get_shared_selector_stats
+from utils.parse_pool import ParsePool, get_shared_parse_pool
+from utils.page_classifier import UnusablePageError, check_page, screen_download
+from utils.helpers import time_left
 
 # Amazon Product Advertising API doesn't provide review data anyway
 # We'll focus on web scraping which is more effective for reviews
 AMAZON_API_AVAILABLE = False
 
+# Review page URL variants, in default order of preference
+REVIEW_URL_VARIANTS = [
+    "https://www.amazon.com/product-reviews/{asin}/ref=cm_cr_dp_d_show_all_btm",
+    "https://www.amazon.com/dp/{asin}/ref=cm_cr_dp_d_show_all_btm",
+    "https://www.amazon.com/product-reviews/{asin}"
+]
+
+# Number of ASINs whose winning URL variant is remembered
+MAX_TRACKED_ASINS = 4096
+
+# Paged review listing used for harvesting, with its filter values
+REVIEW_PAGE_URL = "https://www.amazon.com/product-reviews/{asin}"
+STAR_FILTERS = {1: 'one_star', 2: 'two_star', 3: 'three_star', 4: 'four_star', 5: 'five_star'}
+STAR_FILTER_VALUES = set(STAR_FILTERS.values()) | {'all_stars', 'positive', 'critical'}
+SORT_ORDERS = ('helpful', 'recent')
+DEFAULT_HARVEST_REVIEWS = 500
+
+# Amazon review ids, as found in container ids such as "customer_review-R1X2Y3Z4W5V6U7"
+REVIEW_ID = re.compile(r'R[0-9A-Z]{8,}')
+
+# Multiple strategies to find review containers, in order of preference
+REVIEW_CONTAINER_RULES = [
+    ('div', {'data-hook': 'review'}),
+    ('div', {'class': re.compile(r'.*review.*container.*')}),
+    ('div', {'id': re.compile(r'customer_review')}),
+    ('div', {'class': 'cr-original-review-content'}),
+    ('div', {'class': 'review-item'})
+]
+
+# Keeps only review containers when parsing with the 'lxml-strainer' backend
+REVIEW_STRAINER = strainer_for_rules(REVIEW_CONTAINER_RULES)
+
+# A page without any of these (case-insensitive) has nothing for the container
+# rules or the text fallback to find
+REVIEW_MARKERS = (b'review', b'rating', b'star')
+
+# Host the container and field strategy statistics are kept under
+SELECTOR_STATS_HOST = 'www.amazon.com'
+
+# Strategies for each review field, in order of preference
+REVIEW_FIELD_RULES = {
+    'reviewer_name': [
+        ('span', {'class': 'a-profile-name'}),
+        ('div', {'class': 'a-profile-content'}),
+        ('a', {'class': 'a-profile'}),
+        ('span', {'class': re.compile(r'.*profile.*name.*')}),
+        ('div', {'class': re.compile(r'.*reviewer.*name.*')})
+    ],
+    'rating': [
+        ('i', {'data-hook': 'review-star-rating'}),
+        ('span', {'class': 'a-icon-alt'}),
+        ('i', {'class': re.compile(r'.*star.*')}),
+        ('div', {'class': re.compile(r'.*rating.*')}),
+        ('span', {'class': re.compile(r'.*star.*')})
+    ],
+    'title': [
+        ('a', {'data-hook': 'review-title'}),
+        ('span', {'data-hook': 'review-title'}),
+        ('h4', {'class': 'review-title'}),
+        ('h5', {'class': re.compile(r'.*title.*')}),
+        ('div', {'class': re.compile(r'.*title.*')})
+    ],
+    'text': [
+        ('span', {'data-hook': 'review-body'}),
+        ('div', {'data-hook': 'review-body'}),
+        ('div', {'class': 'review-text'}),
+        ('span', {'class': re.compile(r'.*review.*text.*')}),
+        ('div', {'class': re.compile(r'.*review.*content.*')})
+    ],
+    'date': [
+        ('span', {'data-hook': 'review-date'}),
+        ('span', {'class': 'review-date'}),
+        ('span', {'class': 'a-size-base'}),
+        ('div', {'class': re.compile(r'.*date.*')}),
+        ('time', {})
+    ],
+    'helpful_votes': [
+        ('span', {'data-hook': 'helpful-vote-statement'}),
+        ('span', {'class': 'review-votes'}),
+        ('div', {'class': re.compile(r'.*helpful.*')}),
+        ('span', {'class': re.compile(r'.*vote.*')})
+    ]
+}
+
+
+def _index_field_rules(field_rules: Dict[str, list]) -> Tuple[Dict[tuple, list], Dict[str, list]]:
+    """
+    Index field rules for node classification.
+    
+    Rules testing one attribute against a literal (data-hook="review-body",
+    class="a-profile-name") are keyed by (tag, attribute, value), so a node
+    finds them with dictionary lookups. Pattern and attribute-free rules are
+    grouped by tag and checked one by one.
+    """
+    literal_rules = {}
+    other_rules = {}
+    for field, rules in field_rules.items():
+        for index, (tag, attrs) in enumerate(rules):
+            if len(attrs) == 1 and isinstance(next(iter(attrs.values())), str):
+                attr, value = next(iter(attrs.items()))
+                literal_rules.setdefault((tag, attr, value), []).append((field, index))
+            else:
+                other_rules.setdefault(tag, []).append((field, index, attrs))
+    return literal_rules, other_rules
+
+
+LITERAL_FIELD_RULES, OTHER_FIELD_RULES = _index_field_rules(REVIEW_FIELD_RULES)
+FIELD_RULE_TAGS = {tag for rules in REVIEW_FIELD_RULES.values() for tag, _ in rules}
+LITERAL_RULE_ATTRS = sorted({attr for _, attr, _ in LITERAL_FIELD_RULES})
+FIELD_RULE_ATTRS = sorted({attr for rules in REVIEW_FIELD_RULES.values() for _, attrs in rules for attr in attrs})
+
+# Node classifications keyed by tag name and rule-relevant attributes. Review
+# pages repeat the same few class lists, so most nodes classify by lookup.
+MAX_CLASSIFICATIONS = 4096
+_classifications: Dict[tuple, List[Tuple[str, int]]] = {}
+
+
+def _classify(tag) -> List[Tuple[str, int]]:
+    """Return the (field, rule index) pairs whose rule matches a tag."""
+    key = (tag.name,) + tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (tag.attrs.get(attr) for attr in FIELD_RULE_ATTRS)
+    )
+    matched = _classifications.get(key)
+    if matched is not None:
+        return matched
+    
+    matched = []
+    for attr in LITERAL_RULE_ATTRS:
+        value = tag.attrs.get(attr)
+        if value is None:
+            continue
+        if isinstance(value, list):
+            # Multi-valued (class): each value, then the whole attribute
+            value = value + [' '.join(value)] if len(value) > 1 else value
+        else:
+            value = [value]
+        for candidate in value:
+            matched.extend(LITERAL_FIELD_RULES.get((tag.name, attr, candidate), ()))
+    for field, index, attrs in OTHER_FIELD_RULES.get(tag.name, ()):
+        if attrs_match(tag.attrs, attrs):
+            matched.append((field, index))
+    
+    if len(_classifications) >= MAX_CLASSIFICATIONS:
+        _classifications.clear()
+    _classifications[key] = matched
+    return matched
+
+RATING_NUMBER = re.compile(r'(\d+(?:\.\d+)?)')
+REVIEW_DATE_ON = re.compile(r'on (.+?)(?:\s*$)')
+
+
+def _read_rating(elem) -> Optional[float]:
+    """Read a rating from an element's aria-label, text or classes (None if none)."""
+    rating_text = elem.get('aria-label', '') or elem.get_text() or str(elem.get('class', []))
+    rating_match = RATING_NUMBER.search(rating_text)
+    if rating_match:
+        try:
+            return float(rating_match.group(1))
+        except ValueError:
+            pass
+    return None
+
+
+def _read_date(elem) -> str:
+    """Read a review date, unwrapping the "Reviewed in [Country] on [Date]" format."""
+    date_text = elem.get_text(strip=True) or elem.get('datetime', '')
+    date_match = REVIEW_DATE_ON.search(date_text)
+    return date_match.group(1).strip() if date_match else date_text
+
+
+def _read_text(elem) -> str:
+    """Read the stripped text of an element."""
+    return elem.get_text(strip=True)
+
+
+# How each field reads a matched element; None or '' falls through to the next rule
+FIELD_VALUE_READERS = {
+    'reviewer_name': _read_text,
+    'rating': _read_rating,
+    'title': _read_text,
+    'text': _read_text,
+    'date': _read_date,
+    'helpful_votes': _read_text
+}
+
+FIELD_DEFAULTS = {
+    'reviewer_name': 'Anonymous',
+    'rating': 0,
+    'title': '',
+    'text': '',
+    'date': '',
+    'helpful_votes': ''
+}
+
 logger = logging.getLogger(__name__)
 
 
+def find_reviews(soup, selector_stats: SelectorStats, read_reviews: Callable[[list], list]) -> list:
+    """Read reviews from the first container strategy whose containers hold any, in learned order."""
+    reviews = selector_stats.find_all_first(soup, SELECTOR_STATS_HOST, 'container', REVIEW_CONTAINER_RULES,
+                                            extract=read_reviews)
+    if reviews:
+        logger.info(f"Found {len(reviews)} reviews in review containers")
+        return reviews
+    
+    # Fallback: look for any div containing review-like content
+    containers = soup.find_all('div', string=re.compile(r'(review|rating|star)', re.I))
+    logger.info(f"Fallback: Found {len(containers)} potential review containers")
+    return read_reviews(containers)
+
+
+def container_review(container, asin: str, selector_stats: SelectorStats) -> Optional[Dict[str, Any]]:
+    """Build a review dict from a container, or None if it has no content."""
+    # Extract all fields in one pass over the container
+    fields = extract_fields(container, selector_stats)
+    
+    # Combine title and text
+    full_text = f"{fields['title']} {fields['text']}".strip()
+    
+    # Skip if no meaningful content
+    if not full_text and fields['rating'] == 0:
+        return None
+    
+    return {
+        'reviewer_name': fields['reviewer_name'],
+        'rating': fields['rating'],
+        'review_text': full_text,
+        'date': fields['date'],
+        'review_url': f"https://www.amazon.com/dp/{asin}",
+        'helpful_votes': fields['helpful_votes'],
+        'source': 'amazon_scraping'
+    }
+
+
+def extract_fields(container, selector_stats: SelectorStats) -> Dict[str, Any]:
+    """
+    Extract every review field from a container in a single traversal.
+    
+    Each descendant is classified once against the precompiled field
+    rules, keeping the first match per rule. A field takes the value of
+    the first rule (in learned preference order, see SelectorStats) whose
+    first match has usable content, which gives the same result as one
+    find() per rule. The traversal stops as soon as every field is
+    settled, so once the usual winners are learned it rarely goes past
+    the elements that hold them.
+    
+    Args:
+        container: Review container tag
+        selector_stats: Learned rule order
+        
+    Returns:
+        Dictionary with reviewer_name, rating, title, text, date and helpful_votes
+    """
+    orders = {field: selector_stats.order(SELECTOR_STATS_HOST, field, len(rules))
+              for field, rules in REVIEW_FIELD_RULES.items()}
+    values = {}
+    resolved = {}
+    
+    def resolve(field, final=False):
+        # Index of the first rule with usable content, or None while an
+        # earlier rule may still match later in the container
+        for index in orders[field]:
+            if (field, index) not in values:
+                if final:
+                    continue
+                return None
+            if values[(field, index)] not in (None, ''):
+                return index
+        return None
+    
+    for tag in container.descendants:
+        if tag.name not in FIELD_RULE_TAGS:
+            continue
+        
+        for field, index in _classify(tag):
+            if field in resolved or (field, index) in values:
+                continue
+            values[(field, index)] = FIELD_VALUE_READERS[field](tag)
+            winner = resolve(field)
+            if winner is not None:
+                resolved[field] = winner
+        if len(resolved) == len(REVIEW_FIELD_RULES):
+            break
+    
+    fields = {}
+    for field in REVIEW_FIELD_RULES:
+        winner = resolved[field] if field in resolved else resolve(field, final=True)
+        if winner is None:
+            fields[field] = FIELD_DEFAULTS[field]
+        else:
+            # Every rule preferred over the winner matched nothing usable
+            order = orders[field]
+            selector_stats.record(SELECTOR_STATS_HOST, field, winner, order[:order.index(winner)])
+            fields[field] = values[(field, winner)]
+    return fields
+
+
+def parse_review_page(content: bytes, asin: str, limit: Optional[int] = None, with_ids: bool = False,
+                      selector_stats: Optional[SelectorStats] = None) -> List[Dict[str, Any]]:
+    """
+    Parse the reviews on an Amazon review page.
+    
+    This is a module-level function so parse worker processes can run it.
+    
+    Args:
+        content: Raw HTML of the page
+        asin: Amazon ASIN the page belongs to
+        limit: Maximum number of review containers to read
+        with_ids: Add each review's Amazon review id ('' when its container has none)
+        selector_stats: Learned rule order; defaults to the shared statistics
+        
+    Returns:
+        List of review dictionaries
+    """
+    selector_stats = selector_stats or get_shared_selector_stats()
+    
+    def read_reviews(review_containers: list) -> List[Dict[str, Any]]:
+        """Build reviews from the containers one strategy found."""
+        reviews = []
+        for i, container in enumerate(review_containers[:limit]):
+            try:
+                logger.debug(f"Processing review container {i+1}")
+                
+                review_data = container_review(container, asin, selector_stats)
+                if review_data is None:
+                    continue
+                
+                if with_ids:
+                    id_match = REVIEW_ID.search(container.get('id') or '')
+                    review_data['review_id'] = id_match.group(0) if id_match else ''
+                reviews.append(review_data)
+                logger.debug(f"Successfully extracted review {i+1}: {len(review_data['review_text'])} chars")
+                
+            except Exception as e:
+                logger.warning(f"Error parsing individual Amazon review {i+1}: {str(e)}")
+                continue
+        
+        return reviews
+    
+    return find_reviews(make_soup(content, REVIEW_STRAINER), selector_stats, read_reviews)
+
+
 class AmazonScraper:
     """
     Scraper for Amazon product reviews with API and HTML parsing support.
     """
     
-    def __init__(self):
-        """Initialize the Amazon scraper with API credentials if available."""
+    def __init__(self, transport: Optional[HttpTransport] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 selector_stats: Optional[SelectorStats] = None,
+                 parse_pool: Optional[ParsePool] = None):
+        """
+        Initialize the Amazon scraper with API credentials if available.
+        
+        Args:
+            transport: Optional HTTP transport; defaults to the shared pool
+            response_cache: Optional on-disk response cache; defaults to the shared cache
+            rate_limiter: Optional per-host rate limiter; defaults to the shared limiter
+            selector_stats: Optional learned selector ordering; defaults to the shared statistics
+            parse_pool: Optional process pool for parsing; defaults to the shared pool
+        """
         self.access_key = os.getenv('AMAZON_ACCESS_KEY')
         self.secret_key = os.getenv('AMAZON_SECRET_KEY')
         self.partner_tag = os.getenv('AMAZON_PARTNER_TAG')
@@ -39,8 +403,40 @@ class AmazonScraper:
         # We primarily use web scraping for review collection
         logger.info("Amazon API not available - using web scraping only (API doesn't provide review data anyway)")
         
-        # Setup session for web requests with rotating user agents
-        self.session = requests.Session()
+        # Setup session for web requests with rotating user agents,
+        # on the shared connection pool
+        self.transport = transport or get_shared_transport()
+        self.session = self.transport.create_session()
+        self.response_cache = response_cache or get_shared_response_cache()
+        self.cache_ttl = int(os.getenv('AMAZON_CACHE_TTL', os.getenv('RESPONSE_CACHE_TTL', 300)))
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.rate_limiter.configure('amazon.com', float(os.getenv('AMAZON_RATE_LIMIT', 0.5)), 2)
+        
+        # Validators from earlier fetches, for cheap refreshes
+        self.revalidation = RevalidationStore()
+        
+        # Stop trying container and field strategies first once they keep missing
+        self.selector_stats = selector_stats or get_shared_selector_stats()
+        self.parse_pool = parse_pool or get_shared_parse_pool()
+        
+        # Hedged requests: start the next URL variant after hedge_delay seconds
+        self.hedged = os.getenv('AMAZON_HEDGED', 'true').lower() == 'true'
+        self.hedge_delay = float(os.getenv('AMAZON_HEDGE_DELAY', 2))
+        self._hedge_executor = ThreadPoolExecutor(
+            max_workers=len(REVIEW_URL_VARIANTS) * 4,
+            thread_name_prefix='amazon-hedge'
+        )
+        self._hedge_lock = threading.Lock()
+        self.winning_variants: "OrderedDict[str, int]" = OrderedDict()
+        self.variant_wins: Counter = Counter()
+        
+        # Paged harvesting: review pages fetched concurrently per ASIN
+        self.page_concurrency = max(1, int(os.getenv('AMAZON_PAGE_CONCURRENCY', 4)))
+        self.max_pages = int(os.getenv('AMAZON_MAX_PAGES', 50))
+        self._page_executor = ThreadPoolExecutor(
+            max_workers=self.page_concurrency * 4,
+            thread_name_prefix='amazon-page'
+        )
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -120,12 +516,17 @@ class AmazonScraper:
         logger.warning("Amazon Product Advertising API doesn't provide review data")
         raise Exception("Amazon API doesn't support review retrieval - using web scraping instead")
     
-    def get_reviews_via_scraping(self, asin: str) -> List[Dict[str, Any]]:
+    def get_reviews_via_scraping(self, asin: str, deadline: Optional[float] = None,
+                                 refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get reviews using HTML parsing/web scraping.
         
         Args:
             asin: Amazon ASIN
+            deadline: Optional time.monotonic() value to give up by; rate-limit
+                waits, request timeouts and hedging are cut short to meet it
+            refresh: Skip the response cache and revalidate against the last
+                fetch, for refresh loops that want the page as it is now
             
         Returns:
             List of review dictionaries
@@ -134,116 +535,63 @@ class AmazonScraper:
             # Update headers to avoid detection
             self._update_headers()
             
-            # Try multiple URL formats for better success rate
-            urls_to_try = [
-                f"https://www.amazon.com/product-reviews/{asin}/ref=cm_cr_dp_d_show_all_btm",
-                f"https://www.amazon.com/dp/{asin}/ref=cm_cr_dp_d_show_all_btm",
-                f"https://www.amazon.com/product-reviews/{asin}"
-            ]
+            # Try multiple URL formats for better success rate, starting with
+            # the variant that last worked for this ASIN
+            variant_order = self._variant_order(asin)
+            urls_to_try = [REVIEW_URL_VARIANTS[i].format(asin=asin) for i in variant_order]
             
-            soup = None
+            content = None
             successful_url = None
+            successful_response = None
+            sent_validators = False
             
-            # Try each URL until one works
-            for url in urls_to_try:
-                try:
-                    logger.info(f"Attempting to scrape Amazon reviews from: {url}")
-                    
-                    # Add random delay to avoid rate limiting
-                    time.sleep(random.uniform(2, 5))
-                    
-                    # Make request with additional headers to appear more legitimate
-                    headers = self.session.headers.copy()
-                    headers.update({
-                        'Referer': f'https://www.amazon.com/dp/{asin}',
-                        'Sec-Fetch-Dest': 'document',
-                        'Sec-Fetch-Mode': 'navigate',
-                        'Sec-Fetch-Site': 'same-origin',
-                        'Cache-Control': 'max-age=0'
-                    })
-                    
-                    response = self.session.get(url, headers=headers, timeout=20)
-                    
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
+            # Serve recent pages from the response cache without any request,
+            # unless refreshing
+            if self.response_cache and not refresh:
+                for url in urls_to_try:
+                    cached_content = self.response_cache.get(url, ttl=self.cache_ttl)
+                    if cached_content is not None:
+                        content = cached_content
                         successful_url = url
-                        logger.info(f"Successfully retrieved page content from: {url}")
+                        logger.info(f"Using cached page content for: {url}")
                         break
-                    else:
-                        logger.warning(f"HTTP {response.status_code} for URL: {url}")
-                        
-                except requests.RequestException as e:
-                    logger.warning(f"Request failed for {url}: {str(e)}")
-                    continue
-            
-            if not soup:
-                raise Exception("Failed to retrieve any Amazon review pages")
             
-            reviews = []
+            if content is None:
+                if self.hedged:
+                    outcome = self._race_variants(asin, urls_to_try, deadline)
+                else:
+                    outcome = self._try_variants_in_order(asin, urls_to_try, deadline)
+                
+                if not outcome:
+                    raise Exception("Failed to retrieve any Amazon review pages")
+                
+                url, kind, payload = outcome
+                if kind == 'unusable':
+                    # Amazon blocks by client, not by URL, so no variant would do better
+                    raise payload
+                self._record_winner(asin, variant_order[urls_to_try.index(url)])
+                
+                if kind == 'not_modified':
+                    logger.info(f"Amazon page not modified, reusing {len(payload)} reviews from: {url}")
+                    return payload
+                
+                successful_response, sent_validators = payload
+                content = successful_response.content
+                successful_url = url
+                if self.response_cache:
+                    self.response_cache.set(url, successful_response.content)
+                logger.info(f"Successfully retrieved page content from: {url}")
             
-            # Multiple strategies to find review containers
-            review_selectors = [
-                {'selector': 'div', 'attrs': {'data-hook': 'review'}},
-                {'selector': 'div', 'attrs': {'class': re.compile(r'.*review.*container.*')}},
-                {'selector': 'div', 'attrs': {'id': re.compile(r'customer_review')}},
-                {'selector': 'div', 'attrs': {'class': 'cr-original-review-content'}},
-                {'selector': 'div', 'attrs': {'class': 'review-item'}}
-            ]
-            
-            review_containers = []
-            for selector in review_selectors:
-                containers = soup.find_all(selector['selector'], selector['attrs'])
-                if containers:
-                    review_containers = containers
-                    logger.info(f"Found {len(containers)} review containers using selector: {selector}")
-                    break
+            if check_page(content, successful_url, REVIEW_MARKERS):
+                # Parse in a worker process when the parse pool is enabled
+                reviews = self.parse_pool.run(parse_review_page, content, asin, 10,  # Limit to 10 reviews
+                                              selector_stats=self.selector_stats)
+            else:
+                logger.info(f"No review section on {successful_url}, skipping parse")
+                reviews = []
             
-            if not review_containers:
-                # Fallback: look for any div containing review-like content
-                review_containers = soup.find_all('div', string=re.compile(r'(review|rating|star)', re.I))
-                logger.info(f"Fallback: Found {len(review_containers)} potential review containers")
-            
-            for i, container in enumerate(review_containers[:10]):  # Limit to 10 reviews
-                try:
-                    logger.debug(f"Processing review container {i+1}")
-                    
-                    # Extract reviewer name with multiple strategies
-                    reviewer_name = self._extract_reviewer_name(container)
-                    
-                    # Extract rating with multiple strategies
-                    rating = self._extract_rating(container)
-                    
-                    # Extract review title and text
-                    review_title, review_text = self._extract_review_content(container)
-                    
-                    # Extract date
-                    date = self._extract_review_date(container)
-                    
-                    # Extract helpful votes
-                    helpful_votes = self._extract_helpful_votes(container)
-                    
-                    # Combine title and text
-                    full_text = f"{review_title} {review_text}".strip()
-                    
-                    # Skip if no meaningful content
-                    if not full_text and rating == 0:
-                        continue
-                    
-                    review_data = {
-                        'reviewer_name': reviewer_name or 'Anonymous',
-                        'rating': rating,
-                        'review_text': full_text,
-                        'date': date,
-                        'review_url': f"https://www.amazon.com/dp/{asin}",
-                        'helpful_votes': helpful_votes,
-                        'source': 'amazon_scraping'
-                    }
-                    reviews.append(review_data)
-                    logger.debug(f"Successfully extracted review {i+1}: {len(full_text)} chars")
-                    
-                except Exception as e:
-                    logger.warning(f"Error parsing individual Amazon review {i+1}: {str(e)}")
-                    continue
+            if successful_response is not None:
+                self.revalidation.store(successful_url, successful_response, reviews, conditional=sent_validators)
             
             logger.info(f"Retrieved {len(reviews)} reviews via Amazon scraping from {successful_url}")
             return reviews
@@ -255,133 +603,349 @@ class AmazonScraper:
             logger.error(f"Amazon scraping error: {str(e)}")
             raise
     
-    def _extract_reviewer_name(self, container) -> str:
-        """Extract reviewer name from review container."""
-        name_selectors = [
-            ('span', {'class': 'a-profile-name'}),
-            ('div', {'class': 'a-profile-content'}),
-            ('a', {'class': 'a-profile'}),
-            ('span', {'class': re.compile(r'.*profile.*name.*')}),
-            ('div', {'class': re.compile(r'.*reviewer.*name.*')})
-        ]
+    def _variant_order(self, asin: str) -> List[int]:
+        """Order the review URL variants, putting the last winner for this ASIN first."""
+        order = list(range(len(REVIEW_URL_VARIANTS)))
+        with self._hedge_lock:
+            winner = self.winning_variants.get(asin)
+        if winner is not None:
+            order.remove(winner)
+            order.insert(0, winner)
+        return order
+    
+    def _record_winner(self, asin: str, variant: int) -> None:
+        """Remember which URL variant produced a usable page for an ASIN."""
+        with self._hedge_lock:
+            self.winning_variants[asin] = variant
+            self.winning_variants.move_to_end(asin)
+            while len(self.winning_variants) > MAX_TRACKED_ASINS:
+                self.winning_variants.popitem(last=False)
+            self.variant_wins[variant] += 1
+    
+    def _request_variant(self, asin: str, url: str,
+                         cancelled: Optional[threading.Event] = None,
+                         deadline: Optional[float] = None) -> Tuple[str, Any]:
+        """
+        Request one review URL variant.
+        
+        Args:
+            asin: Amazon ASIN
+            url: Variant URL to request
+            cancelled: Set when another variant has already won
+            deadline: Optional time.monotonic() value to give up by
+            
+        Returns:
+            Tuple of (kind, payload): ('ok', (response, sent_validators)),
+            ('not_modified', reviews), ('unusable', UnusablePageError) for block,
+            captcha and sign-in pages, ('unusable', HostBackoffError) while
+            Amazon is backed off, ('failed', reason) or ('cancelled', None)
+        """
+        if cancelled and cancelled.is_set():
+            return 'cancelled', None
+        
+        logger.info(f"Attempting to scrape Amazon reviews from: {url}")
         
-        for selector, attrs in name_selectors:
-            elem = container.find(selector, attrs)
-            if elem:
-                name = elem.get_text(strip=True)
-                if name and len(name) > 0:
-                    return name
-        return 'Anonymous'
+        # Wait only if Amazon's request budget is spent; a variant still
+        # waiting when another wins gives its slot back unused
+        try:
+            self.rate_limiter.acquire(urlparse(url).netloc, deadline, cancelled)
+        except CancelledError:
+            return 'cancelled', None
+        except TimeoutError as e:
+            return 'failed', str(e)
+        except HostBackoffError as e:
+            # Every variant goes to the same backed-off host
+            return 'unusable', e
+        if cancelled and cancelled.is_set():
+            return 'cancelled', None
+        
+        # Make request with additional headers to appear more legitimate
+        headers = self.session.headers.copy()
+        headers.update({
+            'Referer': f'https://www.amazon.com/dp/{asin}',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'same-origin',
+            'Cache-Control': 'max-age=0'
+        })
+        conditional_headers = self.revalidation.conditional_headers(url)
+        headers.update(conditional_headers)
+        
+        try:
+            response = self.session.get(url, headers=headers, timeout=time_left(deadline, 20))
+        except (requests.RequestException, TimeoutError) as e:
+            logger.warning(f"Request failed for {url}: {str(e)}")
+            return 'failed', str(e)
+        
+        if response.status_code == 304:
+            cached_reviews = self.revalidation.reuse(url)
+            if cached_reviews is not None:
+                return 'not_modified', cached_reviews
+            logger.warning(f"HTTP 304 without stored reviews for URL: {url}")
+            return 'failed', 'HTTP 304 without stored reviews'
+        
+        if response.status_code == 200:
+            try:
+                screen_download(response.content, url, self.rate_limiter)
+            except UnusablePageError as e:
+                logger.warning(f"Amazon served a {e.kind} page for URL: {url}")
+                return 'unusable', e
+            return 'ok', (response, bool(conditional_headers))
+        
+        logger.warning(f"HTTP {response.status_code} for URL: {url}")
+        return 'failed', f"HTTP {response.status_code}"
     
-    def _extract_rating(self, container) -> float:
-        """Extract rating from review container."""
-        rating_selectors = [
-            ('i', {'data-hook': 'review-star-rating'}),
-            ('span', {'class': 'a-icon-alt'}),
-            ('i', {'class': re.compile(r'.*star.*')}),
-            ('div', {'class': re.compile(r'.*rating.*')}),
-            ('span', {'class': re.compile(r'.*star.*')})
-        ]
+    def _try_variants_in_order(self, asin: str, urls: List[str],
+                               deadline: Optional[float] = None) -> Optional[Tuple[str, str, Any]]:
+        """Request each URL variant in turn until one is usable, Amazon blocks us or the deadline passes."""
+        for url in urls:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            kind, payload = self._request_variant(asin, url, deadline=deadline)
+            if kind in ('ok', 'not_modified', 'unusable'):
+                return url, kind, payload
+        return None
+    
+    def _race_variants(self, asin: str, urls: List[str],
+                       deadline: Optional[float] = None) -> Optional[Tuple[str, str, Any]]:
+        """
+        Request URL variants with hedging.
         
-        for selector, attrs in rating_selectors:
-            elem = container.find(selector, attrs)
-            if elem:
-                # Try to extract rating from various text formats
-                rating_text = elem.get('aria-label', '') or elem.get_text() or str(elem.get('class', []))
-                rating_match = re.search(r'(\d+(?:\.\d+)?)', rating_text)
-                if rating_match:
-                    try:
-                        return float(rating_match.group(1))
-                    except ValueError:
-                        continue
-        return 0
+        The next variant is started after hedge_delay seconds, or as soon as
+        an in-flight request fails. The first usable response wins and
+        the variants that haven't started yet are cancelled. A block page
+        ends the race too, since every variant would hit the same block, and
+        so does the deadline.
+        """
+        cancelled = threading.Event()
+        pending = list(urls)
+        in_flight = {}
+        next_launch = time.monotonic()
+        
+        try:
+            while pending or in_flight:
+                now = time.monotonic()
+                if pending and (now >= next_launch or not in_flight):
+                    url = pending.pop(0)
+                    in_flight[self._hedge_executor.submit(self._request_variant, asin, url, cancelled,
+                                                          deadline)] = url
+                    next_launch = now + self.hedge_delay
+                    continue
+                
+                timeout = max(0.0, next_launch - now) if pending else None
+                if deadline is not None:
+                    if now >= deadline:
+                        return None
+                    timeout = min(timeout, deadline - now) if timeout is not None else deadline - now
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    url = in_flight.pop(future)
+                    kind, payload = future.result()
+                    if kind == 'unusable':
+                        return url, kind, payload
+                    if kind in ('ok', 'not_modified'):
+                        if in_flight:
+                            logger.info(f"Hedged request won by {url}, abandoning {len(in_flight)} other(s)")
+                        return url, kind, payload
+                    # A failed variant frees its slot, start the next one now
+                    next_launch = time.monotonic()
+            
+            return None
+        finally:
+            cancelled.set()
+            for future in in_flight:
+                future.cancel()
     
-    def _extract_review_content(self, container) -> tuple:
-        """Extract review title and text from review container."""
-        # Extract title
-        title_selectors = [
-            ('a', {'data-hook': 'review-title'}),
-            ('span', {'data-hook': 'review-title'}),
-            ('h4', {'class': 'review-title'}),
-            ('h5', {'class': re.compile(r'.*title.*')}),
-            ('div', {'class': re.compile(r'.*title.*')})
-        ]
+    def review_page_url(self, asin: str, page: int, star_filter: Optional[str] = None,
+                        sort_by: Optional[str] = None) -> str:
+        """
+        Build the URL of one page of an ASIN's review listing.
         
-        review_title = ''
-        for selector, attrs in title_selectors:
-            elem = container.find(selector, attrs)
-            if elem:
-                title = elem.get_text(strip=True)
-                if title and len(title) > 0:
-                    review_title = title
-                    break
+        Args:
+            asin: Amazon ASIN
+            page: Page number, starting at 1
+            star_filter: Optional filterByStar value (e.g. 'five_star', 'critical')
+            sort_by: Optional sort order ('helpful' or 'recent')
+            
+        Returns:
+            Review page URL
+        """
+        params = {'reviewerType': 'all_reviews', 'pageNumber': page}
+        if star_filter:
+            params['filterByStar'] = star_filter
+        if sort_by:
+            params['sortBy'] = sort_by
+        return f"{REVIEW_PAGE_URL.format(asin=asin)}?{urlencode(params)}"
+    
+    def harvest_reviews(self, input_str: str, max_reviews: int = DEFAULT_HARVEST_REVIEWS,
+                        star_filter: Optional[Any] = None, sort_by: Optional[str] = None,
+                        concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Collect reviews across an ASIN's review pages.
         
-        # Extract text
-        text_selectors = [
-            ('span', {'data-hook': 'review-body'}),
-            ('div', {'data-hook': 'review-body'}),
-            ('div', {'class': 'review-text'}),
-            ('span', {'class': re.compile(r'.*review.*text.*')}),
-            ('div', {'class': re.compile(r'.*review.*content.*')})
-        ]
+        Pages are fetched concurrently, up to concurrency at a time (still
+        paced by Amazon's rate limit), and merged in page order. Reviews are
+        deduplicated by Amazon review id, and harvesting stops at max_reviews,
+        at the first page that fails or adds no new reviews, or after
+        AMAZON_MAX_PAGES pages.
         
-        review_text = ''
-        for selector, attrs in text_selectors:
-            elem = container.find(selector, attrs)
-            if elem:
-                text = elem.get_text(strip=True)
-                if text and len(text) > 0:
-                    review_text = text
+        Args:
+            input_str: Amazon ASIN or product URL
+            max_reviews: Number of reviews to collect
+            star_filter: Optional star count (1-5) or filterByStar value
+            sort_by: Optional sort order ('helpful' or 'recent')
+            concurrency: Pages in flight at once; defaults to AMAZON_PAGE_CONCURRENCY
+            
+        Returns:
+            List of review dictionaries, each with a review_id
+        """
+        asin = self.extract_asin(input_str)
+        if not asin:
+            raise Exception("Invalid Amazon ASIN or URL")
+        
+        if star_filter in STAR_FILTERS:
+            star_filter = STAR_FILTERS[star_filter]
+        if star_filter and star_filter not in STAR_FILTER_VALUES:
+            raise Exception(f"Invalid star filter: {star_filter}")
+        if sort_by and sort_by not in SORT_ORDERS:
+            raise Exception(f"Invalid sort order: {sort_by} (expected one of {', '.join(SORT_ORDERS)})")
+        concurrency = max(1, min(concurrency or self.page_concurrency, self.page_concurrency * 4))
+        
+        self._update_headers()
+        
+        reviews = []
+        seen = set()
+        errors = []
+        cancelled = threading.Event()
+        in_flight = {}
+        finished = {}
+        next_page = report_page = 1
+        page_size = 0
+        more = True
+        
+        try:
+            while more:
+                while next_page <= self.max_pages and len(in_flight) < concurrency:
+                    # Don't start pages the pages in flight will already cover
+                    if page_size and (next_page - report_page) * page_size >= max_reviews - len(reviews):
+                        break
+                    url = self.review_page_url(asin, next_page, star_filter, sort_by)
+                    in_flight[self._page_executor.submit(self._fetch_review_page, asin, url, cancelled)] = next_page
+                    next_page += 1
+                if not in_flight:
                     break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[in_flight.pop(future)] = future.result()
+                
+                # Merge in page order so the stop conditions match a serial walk
+                while more and report_page in finished:
+                    page_reviews, error = finished.pop(report_page)
+                    if error:
+                        logger.warning(f"Amazon review page {report_page} for {asin} failed: {error}")
+                        errors.append(error)
+                        more = False
+                        continue
+                    
+                    new_reviews = []
+                    for review in page_reviews:
+                        key = review['review_id'] or (review['reviewer_name'], review['date'], review['review_text'])
+                        if key not in seen:
+                            seen.add(key)
+                            new_reviews.append(review)
+                    
+                    if not new_reviews:
+                        logger.info(f"Amazon review page {report_page} for {asin} has no new reviews, stopping")
+                        more = False
+                        continue
+                    
+                    page_size = max(page_size, len(page_reviews))
+                    reviews.extend(new_reviews[:max_reviews - len(reviews)])
+                    more = len(reviews) < max_reviews
+                    report_page += 1
+        finally:
+            cancelled.set()
+            for future in in_flight:
+                future.cancel()
         
-        return review_title, review_text
+        if not reviews and errors:
+            raise Exception(f"Failed to retrieve Amazon review pages: {errors[0]}")
+        
+        logger.info(f"Harvested {len(reviews)} reviews for {asin} from {report_page - 1} pages")
+        return reviews
     
-    def _extract_review_date(self, container) -> str:
-        """Extract review date from review container."""
-        date_selectors = [
-            ('span', {'data-hook': 'review-date'}),
-            ('span', {'class': 'review-date'}),
-            ('span', {'class': 'a-size-base'}),
-            ('div', {'class': re.compile(r'.*date.*')}),
-            ('time', {})
-        ]
+    def _fetch_review_page(self, asin: str, url: str,
+                           cancelled: threading.Event) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Fetch and parse one review listing page.
         
-        for selector, attrs in date_selectors:
-            elem = container.find(selector, attrs)
-            if elem:
-                date_text = elem.get_text(strip=True) or elem.get('datetime', '')
-                if date_text:
-                    # Extract date from "Reviewed in [Country] on [Date]" format
-                    date_match = re.search(r'on (.+?)(?:\s*$)', date_text)
-                    if date_match:
-                        return date_match.group(1).strip()
-                    else:
-                        return date_text
-        return ''
+        Returns:
+            Tuple of (reviews, error); reviews carry a review_id ('' when the
+            container has none)
+        """
+        try:
+            content = self.response_cache.get(url, ttl=self.cache_ttl) if self.response_cache else None
+            response = None
+            sent_validators = False
+            
+            if content is None:
+                kind, payload = self._request_variant(asin, url, cancelled)
+                if kind == 'cancelled':
+                    return [], 'cancelled'
+                if kind == 'failed':
+                    return [], payload
+                if kind == 'unusable':
+                    return [], str(payload)
+                if kind == 'not_modified':
+                    return payload, None
+                
+                response, sent_validators = payload
+                content = response.content
+                if self.response_cache:
+                    self.response_cache.set(url, content)
+            
+            if not check_page(content, url, REVIEW_MARKERS):
+                return [], None
+            reviews = self.parse_pool.run(parse_review_page, content, asin, None, True,
+                                          selector_stats=self.selector_stats)
+            
+            if response is not None:
+                self.revalidation.store(url, response, reviews, conditional=sent_validators)
+            return reviews, None
+            
+        except Exception as e:
+            return [], str(e)
     
-    def _extract_helpful_votes(self, container) -> str:
-        """Extract helpful votes from review container."""
-        helpful_selectors = [
-            ('span', {'data-hook': 'helpful-vote-statement'}),
-            ('span', {'class': 'review-votes'}),
-            ('div', {'class': re.compile(r'.*helpful.*')}),
-            ('span', {'class': re.compile(r'.*vote.*')})
-        ]
+    def get_hedging_stats(self) -> Dict[str, Any]:
+        """
+        Report which review URL variants win.
         
-        for selector, attrs in helpful_selectors:
-            elem = container.find(selector, attrs)
-            if elem:
-                helpful_text = elem.get_text(strip=True)
-                if helpful_text and len(helpful_text) > 0:
-                    return helpful_text
-        return ''
+        Returns:
+            Dictionary with the hedging settings and wins per variant
+        """
+        with self._hedge_lock:
+            return {
+                'hedged': self.hedged,
+                'hedge_delay': self.hedge_delay,
+                'tracked_asins': len(self.winning_variants),
+                'variant_wins': {
+                    REVIEW_URL_VARIANTS[variant].format(asin='{asin}'): wins
+                    for variant, wins in sorted(self.variant_wins.items())
+                }
+            }
     
-    def get_reviews(self, input_str: str) -> List[Dict[str, Any]]:
+    def get_reviews(self, input_str: str, deadline: Optional[float] = None,
+                    refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get reviews from Amazon using API or scraping fallback.
         
         Args:
             input_str: Amazon ASIN or product URL
+            deadline: Optional time.monotonic() value to give up by
+            refresh: Revalidate the review page instead of serving it from the
+                response cache
             
         Returns:
             List of review dictionaries
@@ -395,4 +959,4 @@ class AmazonScraper:
             raise Exception("Invalid Amazon ASIN or URL")
         
         # Use web scraping (API doesn't support reviews anyway)
-        return self.get_reviews_via_scraping(asin)
+        return self.get_reviews_via_scraping(asin, deadline, refresh)
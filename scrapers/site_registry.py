@@ -0,0 +1,365 @@
+"""
+Site Registry
+
+Site configurations for the universal scraper live as JSON files in a
+registry directory (scrapers/sites by default), so sites can be added or
+changed without a deploy. The registry validates every entry, re-reads only
+files whose modification time changed, and publishes each complete load as
+an immutable snapshot, so in-flight scrapes never see a half-loaded registry.
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import functools
+import threading
+import dataclasses
+from types import MappingProxyType
+from typing import Dict, Optional, Any, Tuple, Union, Mapping, get_type_hints, get_origin, get_args
+from dataclasses import dataclass
+
+from utils.parsing import PARSER_BACKENDS
+
+logger = logging.getLogger(__name__)
+
+# Default registry directory, next to this module
+SITES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sites')
+
+# Number of hosts whose detected platform is remembered per snapshot
+PLATFORM_MEMO_SIZE = 4096
+
+SITE_KEY = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+@dataclass(frozen=True, slots=True)
+class ScrapeConfig:
+    """
+    Configuration for a website scraper.
+
+    Immutable and slotted, so a registry of thousands of sites stays small and
+    a snapshot's configurations can be shared between threads; derive
+    variants with dataclasses.replace().
+    """
+    name: str
+    domain: str
+    review_container: str
+    reviewer_name: str
+    rating: str
+    review_text: str
+    date: str
+    rating_scale: int = 5
+    max_reviews: int = 10
+    # Extra request headers as (name, value) pairs, a JSON object in the registry
+    headers: Optional[Tuple[Tuple[str, str], ...]] = None
+    # Fetching: seconds before a request times out and pages in flight per host
+    timeout: float = 10.0
+    concurrency: int = 4
+    cache_ttl: int = 300
+    rate_limit: float = 2.0
+    rate_burst: int = 5
+    # Parsing: HTML parser backend (None uses SCRAPER_PARSER) and embedded JSON reviews
+    parser: Optional[str] = None
+    structured_data: bool = True
+    # Pagination: a query parameter carrying the page number lets pages be
+    # fetched concurrently; otherwise the next-page link is followed
+    page_param: Optional[str] = None
+    next_page_selector: Optional[str] = "a[rel='next']"
+    first_page: int = 1
+    max_pages: int = 50
+
+
+# Schema of a registry entry, derived from ScrapeConfig
+CONFIG_FIELDS = {field.name: field for field in dataclasses.fields(ScrapeConfig)}
+# Types as written in the JSON files where they differ from the stored ones
+CONFIG_TYPES = dict(get_type_hints(ScrapeConfig), headers=Optional[Dict[str, str]])
+REQUIRED_FIELDS = [name for name, field in CONFIG_FIELDS.items()
+                   if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING]
+
+# Numeric fields that must be positive (cache_ttl may be 0)
+POSITIVE_FIELDS = ('rating_scale', 'max_reviews', 'timeout', 'concurrency', 'rate_limit', 'rate_burst', 'max_pages')
+
+
+def _matches_type(value: Any, hint: Any) -> bool:
+    """Check a JSON value against a ScrapeConfig type annotation."""
+    if get_origin(hint) is Union:
+        return any(_matches_type(value, arg) for arg in get_args(hint))
+    if hint is type(None):
+        return value is None
+    if get_origin(hint) is dict:
+        return isinstance(value, dict) and all(isinstance(k, str) and isinstance(v, str) for k, v in value.items())
+    if hint is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if hint is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, hint)
+
+
+def validate_site(key: Any, entry: Any) -> ScrapeConfig:
+    """
+    Validate one registry entry and build its configuration.
+
+    Args:
+        key: Platform key
+        entry: Decoded JSON object for the site
+
+    Returns:
+        ScrapeConfig for the site
+
+    Raises:
+        Exception: If the entry doesn't match the schema
+    """
+    if not isinstance(key, str) or not SITE_KEY.match(key):
+        raise Exception(f"invalid site key {key!r} (letters, digits, '_' and '-' only)")
+    if not isinstance(entry, dict):
+        raise Exception(f"site '{key}' must be an object")
+
+    unknown = sorted(set(entry) - set(CONFIG_FIELDS))
+    if unknown:
+        raise Exception(f"site '{key}' has unknown fields: {', '.join(unknown)}")
+    missing = [name for name in REQUIRED_FIELDS if name not in entry]
+    if missing:
+        raise Exception(f"site '{key}' is missing fields: {', '.join(missing)}")
+
+    for name, value in entry.items():
+        # Fields defaulting to None (e.g. headers) may also be set to null
+        if value is None and CONFIG_FIELDS[name].default is None:
+            continue
+        if not _matches_type(value, CONFIG_TYPES[name]):
+            raise Exception(f"site '{key}' field '{name}' has the wrong type ({type(value).__name__})")
+        if name in POSITIVE_FIELDS and value <= 0:
+            raise Exception(f"site '{key}' field '{name}' must be positive")
+
+    if entry.get('cache_ttl', 0) < 0:
+        raise Exception(f"site '{key}' field 'cache_ttl' must not be negative")
+    domain = entry['domain']
+    if not domain or '/' in domain or ':' in domain or domain != domain.strip():
+        raise Exception(f"site '{key}' domain must be a bare host name, got {domain!r}")
+    if entry.get('parser') not in (None,) + PARSER_BACKENDS:
+        raise Exception(f"site '{key}' parser must be one of {', '.join(PARSER_BACKENDS)}")
+
+    if entry.get('headers') is not None:
+        entry = dict(entry, headers=tuple(entry['headers'].items()))
+    return ScrapeConfig(**entry)
+
+
+class SiteSnapshot:
+    """
+    One fully loaded, immutable version of the registry.
+
+    Holds the configurations and their domain index; a scrape resolves its
+    platform and configuration from a single snapshot.
+    """
+
+    def __init__(self, configs: Dict[str, ScrapeConfig], version: int):
+        """
+        Build a snapshot and index its platforms by domain.
+
+        Args:
+            configs: Platform key -> configuration, in registry order
+            version: Registry version the snapshot was published as
+        """
+        self.configs: Mapping[str, ScrapeConfig] = MappingProxyType(configs)
+        self.version = version
+
+        index = {}
+        for platform, config in configs.items():
+            domain = config.domain.lower().strip('.')
+            if domain.startswith('www.'):
+                domain = domain[4:]
+            # The first configuration for a domain wins
+            index.setdefault(domain, platform)
+        self.domain_index = index
+        self.platform_for_host = functools.lru_cache(maxsize=PLATFORM_MEMO_SIZE)(self._lookup_host)
+
+    def _lookup_host(self, host: str) -> Optional[str]:
+        """Find the platform of a host or its closest indexed parent domain."""
+        index = self.domain_index
+        while True:
+            platform = index.get(host)
+            if platform is not None:
+                return platform
+            dot = host.find('.')
+            if dot == -1:
+                return None
+            host = host[dot + 1:]
+
+
+class SiteRegistry:
+    """
+    Site configurations loaded from a directory of JSON files, hot reloaded.
+
+    Each file maps platform keys to configuration objects; files are read in
+    name order. Parsed files are cached by modification time and size, so a
+    reload only re-reads what changed. A reload that fails validation is
+    logged and the previous snapshot stays in place.
+    """
+
+    def __init__(self, directory: Optional[str] = None, check_interval: Optional[float] = None):
+        """
+        Initialize the registry and load it.
+
+        Args:
+            directory: Registry directory; defaults to SITE_REGISTRY_DIR or scrapers/sites
+            check_interval: Minimum seconds between checks for changed files
+                (negative disables automatic reloads)
+
+        Raises:
+            Exception: If the initial load fails
+        """
+        self.directory = directory or os.getenv('SITE_REGISTRY_DIR', SITES_DIR)
+        self.check_interval = check_interval if check_interval is not None else float(os.getenv('SITE_REGISTRY_CHECK_INTERVAL', 5))
+
+        # path -> ((mtime_ns, size), {key: ScrapeConfig})
+        self._files: Dict[str, Tuple[Tuple[int, int], Dict[str, ScrapeConfig]]] = {}
+        self._snapshot: Optional[SiteSnapshot] = None
+        self._failed_signatures = None
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self.reloads = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+
+        if not self.reload():
+            raise Exception(f"Failed to load site registry from {self.directory}: {self.last_error}")
+
+    def snapshot(self) -> SiteSnapshot:
+        """
+        Get the current snapshot, picking up changed files once check_interval has passed.
+
+        Returns:
+            The latest fully loaded SiteSnapshot
+        """
+        if 0 <= self.check_interval <= time.monotonic() - self._checked_at:
+            # Only one thread checks; the others keep using the current snapshot
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._reload_locked(force=False)
+                finally:
+                    self._lock.release()
+        return self._snapshot
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload changed registry files and publish a new snapshot.
+
+        Args:
+            force: Re-read every file, even unchanged ones
+
+        Returns:
+            True if a new snapshot was published
+        """
+        with self._lock:
+            return self._reload_locked(force)
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Stat the registry files, in name order."""
+        signatures = {}
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith('.json') and not name.startswith('.'):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                signatures[path] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def _load_file(self, path: str) -> Dict[str, ScrapeConfig]:
+        """Read and validate one registry file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise Exception("expected an object mapping site keys to configurations")
+        return {key: validate_site(key, entry) for key, entry in data.items()}
+
+    def _reload_locked(self, force: bool) -> bool:
+        """Reload with the lock held."""
+        self._checked_at = time.monotonic()
+        signatures = None
+        current = None
+        try:
+            signatures = self._scan()
+            if not force and self._snapshot is not None:
+                if signatures == {path: entry[0] for path, entry in self._files.items()}:
+                    return False
+                if signatures == self._failed_signatures:
+                    # Still the same broken files; don't log them again
+                    return False
+
+            files = {}
+            for path, signature in signatures.items():
+                cached = self._files.get(path)
+                if cached is not None and cached[0] == signature and not force:
+                    files[path] = cached
+                else:
+                    current = path
+                    files[path] = (signature, self._load_file(path))
+            current = None
+
+            configs = {}
+            for path, (_, entries) in files.items():
+                for key, config in entries.items():
+                    if key in configs:
+                        raise Exception(f"site '{key}' is defined more than once")
+                    configs[key] = config
+            if not configs:
+                raise Exception("no sites defined")
+        except Exception as e:
+            self.errors += 1
+            self.last_error = f"{os.path.basename(current)}: {str(e)}" if current else str(e)
+            self._failed_signatures = signatures
+            if self._snapshot is not None:
+                logger.error(f"Site registry reload failed, keeping version {self._snapshot.version}: {self.last_error}")
+            return False
+
+        version = self._snapshot.version + 1 if self._snapshot else 1
+        self._files = files
+        self._failed_signatures = None
+        self.last_error = None
+        # Publishing is a single reference swap, so readers see the old or the new registry
+        self._snapshot = SiteSnapshot(configs, version)
+        self.reloads += 1
+        self.loaded_at = time.time()
+        logger.info(f"Loaded site registry version {version}: {len(configs)} sites from {len(files)} files")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Report the registry state.
+
+        Returns:
+            Dictionary with the directory, version, site and file counts and reload errors
+        """
+        snapshot = self._snapshot
+        return {
+            'directory': self.directory,
+            'version': snapshot.version if snapshot else 0,
+            'sites': len(snapshot.configs) if snapshot else 0,
+            'files': len(self._files),
+            'check_interval': self.check_interval,
+            'reloads': self.reloads,
+            'errors': self.errors,
+            'last_error': self.last_error,
+            'loaded_at': self.loaded_at
+        }
+
+
+_shared_registry = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_shared_site_registry() -> SiteRegistry:
+    """
+    Get the process-wide site registry, loading it on first use.
+
+    Returns:
+        Shared SiteRegistry for SITE_REGISTRY_DIR
+    """
+    global _shared_registry
+
+    if _shared_registry is None:
+        with _shared_registry_lock:
+            if _shared_registry is None:
+                _shared_registry = SiteRegistry()
+
+    return _shared_registry
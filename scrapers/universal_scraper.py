@@ -8,591 +8,408 @@ using configuration-driven approach.
 import os
 import re
 import json
+import queue
+import asyncio
 import logging
+import threading
+import contextlib
+import dataclasses
 import requests
-from bs4 import BeautifulSoup
+from collections import OrderedDict
+import soupsieve
 from datetime import datetime
-from typing import List, Dict, Optional, Any, Union
-from urllib.parse import urlparse
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Any, Union, Tuple, Callable, Iterator, Awaitable, Mapping
+from urllib.parse import urlparse, urljoin, parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.http_transport import HttpTransport, get_shared_transport
+from utils.response_cache import ResponseCache, get_shared_response_cache
+from utils.rate_limiter import HostRateLimiter, get_shared_rate_limiter
+from utils import parsing
+from utils.parsing import make_soup, selector_matcher, strainer_for_selector, iter_section_cuts, outermost_matches
+from utils.structured_data import extract_structured_reviews
+from utils.parse_pool import ParsePool, get_shared_parse_pool
+from utils.helpers import time_left
+from utils.page_classifier import check_page, screen_download
+from scrapers.site_registry import ScrapeConfig, SiteRegistry, SiteSnapshot, get_shared_site_registry
 
 logger = logging.getLogger(__name__)
 
+# Default limit for batch scraping; per-host limits come from each site's
+# ScrapeConfig.concurrency unless overridden
+DEFAULT_BATCH_CONCURRENCY = 32
 
-@dataclass
-class ScrapeConfig:
-    """Configuration for a website scraper"""
-    name: str
-    domain: str
-    review_container: str
-    reviewer_name: str
-    rating: str
-    review_text: str
-    date: str
-    rating_scale: int = 5
-    max_reviews: int = 10
-    headers: Dict[str, str] = None
+# Default review target for paginated scraping
+DEFAULT_PAGINATED_REVIEWS = 500
 
+# Compiled selector plans kept; each registry edit that changes a site's
+# selectors adds a plan, so the least recently used are dropped
+PLAN_CACHE_SIZE = int(os.getenv('SCRAPER_PLAN_CACHE_SIZE', 1024))
 
-class UniversalScraper:
+class SelectorPlan:
     """
-    Universal scraper that can handle thousands of websites using configuration.
+    A platform's CSS selectors compiled once into reusable soupsieve matchers.
+    
+    Selector strings are parsed when the plan is built instead of on every
+    select() call, so extraction only runs the compiled matchers.
+    """
+    
+    def __init__(self, config: ScrapeConfig):
+        """
+        Compile the selectors of a scrape configuration.
+        
+        Args:
+            config: Scrape configuration for the platform
+        """
+        self.container = soupsieve.compile(config.review_container)
+        self.reviewer_name = soupsieve.compile(config.reviewer_name)
+        self.rating = soupsieve.compile(config.rating)
+        self.review_text = soupsieve.compile(config.review_text)
+        self.date = soupsieve.compile(config.date)
+        
+        # Predicate for the outermost element a review container needs, used
+        # by the incremental parse, and the matching strainer for 'lxml-strainer'
+        self.section_matcher = selector_matcher(config.review_container)
+        self.strainer = strainer_for_selector(config.review_container)
+        
+        # Next-page link, for sites paginated without a page parameter
+        self.next_page = soupsieve.compile(config.next_page_selector) if config.next_page_selector else None
+        self.next_page_strainer = strainer_for_selector(config.next_page_selector) if config.next_page_selector else None
+
+
+# Compiled selector plans by the selectors they compile, built on first use
+# and shared by every registry version (and override) with the same selectors
+_plans: "OrderedDict[tuple, SelectorPlan]" = OrderedDict()
+_plans_lock = threading.Lock()
+
+
+def plan_for(config: ScrapeConfig) -> SelectorPlan:
+    """Get the compiled selectors for a configuration, compiling them once while they stay in use."""
+    key = (config.review_container, config.reviewer_name, config.rating,
+           config.review_text, config.date, config.next_page_selector)
+    with _plans_lock:
+        plan = _plans.get(key)
+        if plan is not None:
+            _plans.move_to_end(key)
+            return plan
+    
+    plan = SelectorPlan(config)
+    with _plans_lock:
+        _plans[key] = plan
+        while len(_plans) > PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+    return plan
+
+
+def extract_reviews(content: bytes, url: str, platform: str, config: ScrapeConfig,
+                    plan: Optional[SelectorPlan] = None) -> List[Dict[str, Any]]:
+    """
+    Extract reviews from a downloaded page.
+    
+    Reviews embedded as JSON (JSON-LD or __NEXT_DATA__) are used when
+    present; the platform's CSS selectors are the fallback. This is a
+    module-level function so parse worker processes can run it.
+    
+    Args:
+        content: Raw HTML of the page
+        url: URL the page was fetched from
+        platform: Platform key
+        config: Scrape configuration for the platform
+        plan: Compiled selectors; looked up by the config's selectors if omitted
+        
+    Returns:
+        List of review dictionaries
     """
+    if config.structured_data:
+        structured = extract_structured_reviews(content, config.max_reviews)
+        if structured:
+            logger.debug(f"Using {len(structured)} embedded JSON reviews for {config.name}")
+            return [structured_review(review, url, platform, config) for review in structured]
+    
+    plan = plan or plan_for(config)
     
-    def __init__(self):
-        """Initialize the universal scraper."""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
-        
-        # Load site configurations
-        self.configs = self._load_site_configs()
-    
-    def _load_site_configs(self) -> Dict[str, ScrapeConfig]:
-        """Load scraping configurations for all supported sites."""
-        configs = {}
-        
-        # Top 100+ Most Famous Stores & Review Platforms
-        sites_config = {
-            # Major US Retailers
-            "walmart": {
-                "name": "Walmart",
-                "domain": "walmart.com",
-                "review_container": "[data-automation-id='reviews-section'] [data-testid='reviews-section-review']",
-                "reviewer_name": "[data-automation-id='review-author-name']",
-                "rating": "[data-automation-id='review-star-rating']",
-                "review_text": "[data-automation-id='review-text']",
-                "date": "[data-automation-id='review-date']"
-            },
-            "target": {
-                "name": "Target", 
-                "domain": "target.com",
-                "review_container": "[data-test='review-content']",
-                "reviewer_name": "[data-test='review-author']",
-                "rating": "[data-test='review-stars']",
-                "review_text": "[data-test='review-text']",
-                "date": "[data-test='review-date']"
-            },
-            "costco": {
-                "name": "Costco",
-                "domain": "costco.com", 
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "bestbuy": {
-                "name": "Best Buy",
-                "domain": "bestbuy.com",
-                "review_container": ".review-item-content",
-                "reviewer_name": ".sr-only",
-                "rating": ".sr-only",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "homedepot": {
-                "name": "Home Depot",
-                "domain": "homedepot.com",
-                "review_container": "[data-testid='review']",
-                "reviewer_name": "[data-testid='review-author']",
-                "rating": "[data-testid='review-rating']",
-                "review_text": "[data-testid='review-text']",
-                "date": "[data-testid='review-date']"
-            },
-            "lowes": {
-                "name": "Lowe's",
-                "domain": "lowes.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-content",
-                "date": ".review-date"
-            },
-            "macys": {
-                "name": "Macy's",
-                "domain": "macys.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "kohls": {
-                "name": "Kohl's",
-                "domain": "kohls.com",
-                "review_container": "[data-testid='review-item']",
-                "reviewer_name": "[data-testid='reviewer-name']",
-                "rating": "[data-testid='review-rating']",
-                "review_text": "[data-testid='review-text']",
-                "date": "[data-testid='review-date']"
-            },
-            "jcpenney": {
-                "name": "JCPenney",
-                "domain": "jcpenney.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "sears": {
-                "name": "Sears",
-                "domain": "sears.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-stars",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "nordstrom": {
-                "name": "Nordstrom",
-                "domain": "nordstrom.com",
-                "review_container": "[data-testid='review']",
-                "reviewer_name": "[data-testid='reviewer-name']",
-                "rating": "[data-testid='review-rating']",
-                "review_text": "[data-testid='review-text']",
-                "date": "[data-testid='review-date']"
-            },
-            "bloomingdales": {
-                "name": "Bloomingdale's",
-                "domain": "bloomingdales.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "saksoff5th": {
-                "name": "Saks OFF 5TH",
-                "domain": "saksoff5th.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-display",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
+    reviews = []
+    
+    # Find review containers using the compiled selectors
+    review_containers = select_containers(content, plan, config)
+    
+    for container in review_containers:
+        try:
+            # Extract reviewer name
+            reviewer_name = 'Anonymous'
+            name_elem = plan.reviewer_name.select_one(container)
+            if name_elem:
+                reviewer_name = name_elem.get_text(strip=True)
             
-            # Electronics & Tech
-            "newegg": {
-                "name": "Newegg",
-                "domain": "newegg.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "microcenter": {
-                "name": "Micro Center",
-                "domain": "microcenter.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".star-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "tigerdirect": {
-                "name": "TigerDirect",
-                "domain": "tigerdirect.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "bhphotovideo": {
-                "name": "B&H Photo Video",
-                "domain": "bhphotovideo.com",
-                "review_container": "[data-selenium='reviewItem']",
-                "reviewer_name": "[data-selenium='reviewerName']",
-                "rating": "[data-selenium='reviewRating']",
-                "review_text": "[data-selenium='reviewText']",
-                "date": "[data-selenium='reviewDate']"
-            },
-            "adorama": {
-                "name": "Adorama",
-                "domain": "adorama.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-stars",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
+            # Extract rating
+            rating = 0
+            rating_elem = plan.rating.select_one(container)
+            if rating_elem:
+                rating_text = rating_elem.get('aria-label', '') or rating_elem.get_text()
+                rating_match = re.search(r'(\d+(?:\.\d+)?)', rating_text)
+                if rating_match:
+                    rating = float(rating_match.group(1))
             
-            # Marketplace Platforms  
-            "ebay": {
-                "name": "eBay",
-                "domain": "ebay.com",
-                "review_container": ".reviews .review-item-content",
-                "reviewer_name": ".review-item-author",
-                "rating": ".star-rating",
-                "review_text": ".review-item-text",
-                "date": ".review-item-date"
-            },
-            "etsy": {
-                "name": "Etsy",
-                "domain": "etsy.com", 
-                "review_container": "[data-region='review']",
-                "reviewer_name": "[data-region='review-author']",
-                "rating": "[data-region='review-rating']",
-                "review_text": "[data-region='review-text']",
-                "date": "[data-region='review-date']"
-            },
-            "facebook": {
-                "name": "Facebook Marketplace",
-                "domain": "facebook.com",
-                "review_container": "[data-testid='review-item']",
-                "reviewer_name": "[data-testid='reviewer-name']",
-                "rating": "[data-testid='review-rating']",
-                "review_text": "[data-testid='review-text']",
-                "date": "[data-testid='review-date']"
-            },
-            "mercari": {
-                "name": "Mercari",
-                "domain": "mercari.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-display",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "poshmark": {
-                "name": "Poshmark",
-                "domain": "poshmark.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".star-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
+            # Extract review text
+            review_text = ''
+            text_elem = plan.review_text.select_one(container)
+            if text_elem:
+                review_text = text_elem.get_text(strip=True)
             
-            # Home & Garden
-            "wayfair": {
-                "name": "Wayfair",
-                "domain": "wayfair.com",
-                "review_container": "[data-enzyme-id='ReviewListItem']",
-                "reviewer_name": "[data-enzyme-id='ReviewAuthor']",
-                "rating": "[data-enzyme-id='ReviewRating']", 
-                "review_text": "[data-enzyme-id='ReviewText']",
-                "date": "[data-enzyme-id='ReviewDate']"
-            },
-            "overstock": {
-                "name": "Overstock",
-                "domain": "overstock.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "ikea": {
-                "name": "IKEA",
-                "domain": "ikea.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-stars",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "ashleyfurniture": {
-                "name": "Ashley Furniture",
-                "domain": "ashleyfurniture.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".star-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "potterybarn": {
-                "name": "Pottery Barn",
-                "domain": "potterybarn.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "crateandbarrel": {
-                "name": "Crate & Barrel",
-                "domain": "crateandbarrel.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-display",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
+            # Extract date
+            date = ''
+            date_elem = plan.date.select_one(container)
+            if date_elem:
+                date = date_elem.get_text(strip=True) or date_elem.get('datetime', '')
             
-            # Fashion & Apparel
-            "nike": {
-                "name": "Nike",
-                "domain": "nike.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".star-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "adidas": {
-                "name": "Adidas",
-                "domain": "adidas.com",
-                "review_container": "[data-testid='review']",
-                "reviewer_name": "[data-testid='reviewer-name']",
-                "rating": "[data-testid='review-rating']",
-                "review_text": "[data-testid='review-text']",
-                "date": "[data-testid='review-date']"
-            },
-            "gap": {
-                "name": "Gap",
-                "domain": "gap.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-stars",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "hm": {
-                "name": "H&M",
-                "domain": "hm.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "zara": {
-                "name": "Zara",
-                "domain": "zara.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".star-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "forever21": {
-                "name": "Forever 21",
-                "domain": "forever21.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-display",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "uniqlo": {
-                "name": "Uniqlo",
-                "domain": "uniqlo.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-stars",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
+            # Skip if no meaningful content
+            if not review_text and rating == 0:
+                continue
             
-            # Grocery & Food
-            "wholefoods": {
-                "name": "Whole Foods",
-                "domain": "wholefoodsmarket.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".star-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "kroger": {
-                "name": "Kroger",
-                "domain": "kroger.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-display",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "safeway": {
-                "name": "Safeway",
-                "domain": "safeway.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "publix": {
-                "name": "Publix",
-                "domain": "publix.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".star-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
+            review_data = {
+                'reviewer_name': reviewer_name,
+                'rating': rating,
+                'review_text': review_text,
+                'date': date,
+                'review_url': url,
+                'source': f'{platform}_scraping',
+                'platform': config.name
+            }
+            reviews.append(review_data)
             
-            # Auto & Specialty
-            "autozone": {
-                "name": "AutoZone",
-                "domain": "autozone.com",
-                "review_container": ".review-content",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".star-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "gamestop": {
-                "name": "GameStop",
-                "domain": "gamestop.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".review-author",
-                "rating": ".review-rating",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
-            "petsmart": {
-                "name": "PetSmart",
-                "domain": "petsmart.com",
-                "review_container": ".review-item",
-                "reviewer_name": ".reviewer-name",
-                "rating": ".rating-stars",
-                "review_text": ".review-text",
-                "date": ".review-date"
-            },
+        except Exception as e:
+            logger.warning(f"Error parsing individual review: {str(e)}")
+            continue
+    
+    return reviews
+
+
+def structured_review(review: Dict[str, Any], url: str, platform: str, config: ScrapeConfig) -> Dict[str, Any]:
+    """Convert a review decoded from embedded JSON to the standard review dict."""
+    rating = review['rating']
+    if review['best_rating'] and review['best_rating'] != config.rating_scale:
+        rating = round(rating * config.rating_scale / review['best_rating'], 2)
+    
+    return {
+        'reviewer_name': review['reviewer_name'],
+        'rating': rating,
+        'review_text': review['review_text'],
+        'title': review['title'],
+        'date': review['date'],
+        'review_url': url,
+        'source': f'{platform}_structured_data',
+        'platform': config.name
+    }
+
+
+def select_containers(content: bytes, plan: SelectorPlan, config: ScrapeConfig) -> list:
+    """
+    Parse a page and return its first max_reviews review containers.
+    
+    With incremental parsing on, the page is scanned for the ends of review
+    sections and only the part up to the last closed section is parsed,
+    stopping as soon as those sections hold max_reviews containers or the
+    review list enclosing them closes. Falls back to parsing the whole page
+    otherwise.
+    
+    Args:
+        content: Raw HTML of the page
+        plan: Compiled selectors for the platform
+        config: Scrape configuration for the platform
+        
+    Returns:
+        List of review container tags
+    """
+    if parsing.INCREMENTAL_PARSE and plan.section_matcher:
+        # A single-compound selector matches each section itself, so no
+        # container count can reach max_reviews before that many sections close
+        single_compound = len(config.review_container.split()) == 1
+        threshold = config.max_reviews if single_compound else 1
+        
+        for cut, closed, finished in iter_section_cuts(content, plan.section_matcher):
+            if closed < threshold and not finished:
+                continue
             
-            # Review Platforms
-            "tripadvisor": {
-                "name": "TripAdvisor",
-                "domain": "tripadvisor.com",
-                "review_container": "[data-test-target='review-card']",
-                "reviewer_name": "[data-test-target='reviewer-name']",
-                "rating": "[data-test-target='review-rating']",
-                "review_text": "[data-test-target='review-text']",
-                "date": "[data-test-target='review-date']"
-            },
-            "trustpilot": {
-                "name": "Trustpilot",
-                "domain": "trustpilot.com",
-                "review_container": "[data-service-review-card-paper]",
-                "reviewer_name": "[data-consumer-name-typography]",
-                "rating": "[data-service-review-rating]",
-                "review_text": "[data-service-review-text-typography]",
-                "date": "[data-service-review-date-time-ago]"
-            },
-            "glassdoor": {
-                "name": "Glassdoor",
-                "domain": "glassdoor.com",
-                "review_container": "[data-test='review-item']",
-                "reviewer_name": "[data-test='reviewer-name']",
-                "rating": "[data-test='review-rating']",
-                "review_text": "[data-test='review-text']",
-                "date": "[data-test='review-date']"
-            }
-        }
+            soup = make_soup(content[:cut], plan.strainer, backend=config.parser)
+            containers = []
+            for section in outermost_matches(soup, plan.section_matcher, limit=closed):
+                if plan.container.match(section):
+                    containers.append(section)
+                containers.extend(plan.container.select(section))
+            
+            if len(containers) >= config.max_reviews or finished:
+                logger.debug(f"Parsed {cut} of {len(content)} bytes for {config.name}")
+                return containers[:config.max_reviews]
+            
+            # Grow the prefix geometrically so repeated attempts stay linear
+            threshold = closed * 2
+    
+    soup = make_soup(content, plan.strainer, backend=config.parser)
+    return plan.container.select(soup, limit=config.max_reviews)
+
+
+class UniversalScraper:
+    """
+    Universal scraper that can handle thousands of websites using configuration.
+    """
+    
+    def __init__(self, transport: Optional[HttpTransport] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 parse_pool: Optional[ParsePool] = None,
+                 registry: Optional[SiteRegistry] = None):
+        """
+        Initialize the universal scraper.
         
-        # Convert to ScrapeConfig objects
-        for key, config in sites_config.items():
-            configs[key] = ScrapeConfig(**config)
+        Args:
+            transport: Optional HTTP transport; defaults to the shared pool
+            response_cache: Optional on-disk response cache; defaults to the shared cache
+            rate_limiter: Optional per-host rate limiter; defaults to the shared limiter
+            parse_pool: Optional process pool for parsing; defaults to the shared pool
+            registry: Optional site registry; defaults to the shared registry
+        """
+        self.transport = transport or get_shared_transport()
+        self.session = self.transport.create_session()
+        self.response_cache = response_cache or get_shared_response_cache()
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.parse_pool = parse_pool or get_shared_parse_pool()
+        
+        # Site configurations come from the shared, hot-reloaded registry;
+        # selectors are compiled on first use (see plan_for)
+        self.registry = registry or get_shared_site_registry()
+        self._rate_rules: Dict[str, Tuple[float, int]] = {}
+        self._rates_version = 0
+        self._sites()
+    
+    @property
+    def configs(self) -> Mapping[str, ScrapeConfig]:
+        """Site configurations of the current registry snapshot, by platform key."""
+        return self._sites().configs
+    
+    def _sites(self) -> SiteSnapshot:
+        """
+        Get the current registry snapshot.
         
-        return configs
+        When the registry has published a new version, the request budgets of
+        new or changed platforms are applied to the rate limiter first.
+        """
+        sites = self.registry.snapshot()
+        if sites.version != self._rates_version:
+            for config in sites.configs.values():
+                rule = (config.rate_limit, config.rate_burst)
+                if self._rate_rules.get(config.domain) != rule:
+                    self.rate_limiter.configure(config.domain, *rule)
+                    self._rate_rules[config.domain] = rule
+            self._rates_version = sites.version
+        return sites
     
     def detect_platform(self, url: str) -> Optional[str]:
-        """Detect which platform a URL belongs to."""
+        """
+        Detect which platform a URL belongs to.
+        
+        A platform matches its domain and any subdomain of it, with the most
+        specific domain winning, so lookups take one dictionary probe per
+        host label however many platforms are configured.
+        """
+        return self._detect_platform(url, self._sites())
+    
+    def _detect_platform(self, url: str, sites: SiteSnapshot) -> Optional[str]:
+        """Detect a URL's platform in a given registry snapshot."""
         try:
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc.lower()
-            
-            for platform, config in self.configs.items():
-                if config.domain in domain:
-                    return platform
-            
-            return None
+            host = (urlparse(url).hostname or '').rstrip('.')
+            return sites.platform_for_host(host) if host else None
         except Exception as e:
             logger.error(f"Error detecting platform: {str(e)}")
             return None
     
-    def scrape_reviews(self, url: str, platform: str = None) -> List[Dict[str, Any]]:
+    def _resolve_platform(self, url: str, platform: str = None) -> Tuple[str, ScrapeConfig]:
+        """Resolve the platform key and configuration for a URL, from one registry snapshot."""
+        sites = self._sites()
+        
+        # Auto-detect platform if not provided
+        if not platform:
+            platform = self._detect_platform(url, sites)
+        
+        if not platform or platform not in sites.configs:
+            raise Exception(f"Unsupported platform. Supported: {list(sites.configs.keys())}")
+        
+        return platform, sites.configs[platform]
+    
+    def _fetch(self, url: str, config: ScrapeConfig, deadline: Optional[float] = None) -> bytes:
+        """Download a page, or read it from the response cache, and return its raw body."""
+        cached = self._read_cache(url, config)
+        if cached is not None:
+            return cached
+        
+        self.rate_limiter.acquire(urlparse(url).netloc, deadline)
+        return self._download(url, config, deadline)
+    
+    def _read_cache(self, url: str, config: ScrapeConfig) -> Optional[bytes]:
+        """Return a fresh cached body for a URL, if any."""
+        if not self.response_cache:
+            return None
+        return self.response_cache.get(url, ttl=config.cache_ttl)
+    
+    def _download(self, url: str, config: ScrapeConfig, deadline: Optional[float] = None) -> bytes:
+        """Download a page with the platform's timeout and headers, and store it in the response cache."""
+        response = self.session.get(url, timeout=time_left(deadline, config.timeout),
+                                    headers=dict(config.headers) if config.headers else None)
+        response.raise_for_status()
+        
+        # Block pages are neither cached nor parsed
+        screen_download(response.content, url, self.rate_limiter)
+        if self.response_cache:
+            self.response_cache.set(url, response.content)
+        return response.content
+    
+    def _worth_parsing(self, content: bytes, url: str, config: ScrapeConfig) -> bool:
+        """
+        Check a page's raw bytes before parsing it.
+        
+        Returns False for pages without review markup; block pages (e.g.
+        served from a stale cache) raise UnusablePageError.
+        """
+        # Review containers and embedded review JSON both mention 'review';
+        # configs whose container selector doesn't skip the empty check
+        markers = (b'review',) if 'review' in config.review_container.lower() else None
+        if check_page(content, url, markers):
+            return True
+        logger.info(f"No review section on {url}, skipping parse")
+        return False
+    
+    def _extract_reviews(self, content: bytes, url: str, platform: str, config: ScrapeConfig) -> List[Dict[str, Any]]:
+        """Extract reviews from a downloaded page (see extract_reviews), in the parse pool when enabled."""
+        if not self._worth_parsing(content, url, config):
+            return []
+        return self.parse_pool.run(extract_reviews, content, url, platform, config)
+    
+    async def _extract_reviews_async(self, content: bytes, url: str, platform: str,
+                                     config: ScrapeConfig) -> List[Dict[str, Any]]:
+        """Extract reviews without holding up the event loop while a parse worker runs."""
+        if not self._worth_parsing(content, url, config):
+            return []
+        return await self.parse_pool.run_async(extract_reviews, content, url, platform, config)
+    
+    def scrape_reviews(self, url: str, platform: str = None,
+                       deadline: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Scrape reviews from any supported website.
         
         Args:
             url: URL to scrape
             platform: Optional platform override
+            deadline: Optional time.monotonic() value to give up by
             
         Returns:
             List of review dictionaries
         """
         try:
-            # Auto-detect platform if not provided
-            if not platform:
-                platform = self.detect_platform(url)
-            
-            if not platform or platform not in self.configs:
-                raise Exception(f"Unsupported platform. Supported: {list(self.configs.keys())}")
-            
-            config = self.configs[platform]
+            platform, config = self._resolve_platform(url, platform)
             
             # Make request
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            content = self._fetch(url, config, deadline)
             
-            reviews = []
-            
-            # Find review containers using CSS selectors
-            review_containers = soup.select(config.review_container)
-            
-            for container in review_containers[:config.max_reviews]:
-                try:
-                    # Extract reviewer name
-                    reviewer_name = 'Anonymous'
-                    name_elem = container.select_one(config.reviewer_name)
-                    if name_elem:
-                        reviewer_name = name_elem.get_text(strip=True)
-                    
-                    # Extract rating
-                    rating = 0
-                    rating_elem = container.select_one(config.rating)
-                    if rating_elem:
-                        rating_text = rating_elem.get('aria-label', '') or rating_elem.get_text()
-                        rating_match = re.search(r'(\d+(?:\.\d+)?)', rating_text)
-                        if rating_match:
-                            rating = float(rating_match.group(1))
-                    
-                    # Extract review text
-                    review_text = ''
-                    text_elem = container.select_one(config.review_text)
-                    if text_elem:
-                        review_text = text_elem.get_text(strip=True)
-                    
-                    # Extract date
-                    date = ''
-                    date_elem = container.select_one(config.date)
-                    if date_elem:
-                        date = date_elem.get_text(strip=True) or date_elem.get('datetime', '')
-                    
-                    # Skip if no meaningful content
-                    if not review_text and rating == 0:
-                        continue
-                    
-                    review_data = {
-                        'reviewer_name': reviewer_name,
-                        'rating': rating,
-                        'review_text': review_text,
-                        'date': date,
-                        'review_url': url,
-                        'source': f'{platform}_scraping',
-                        'platform': config.name
-                    }
-                    reviews.append(review_data)
-                    
-                except Exception as e:
-                    logger.warning(f"Error parsing individual review: {str(e)}")
-                    continue
+            reviews = self._extract_reviews(content, url, platform, config)
             
             logger.info(f"Retrieved {len(reviews)} reviews from {config.name}")
             return reviews
@@ -604,6 +421,337 @@ class UniversalScraper:
             logger.error(f"{platform} scraping error: {str(e)}")
             raise
     
+    def scrape_many(self, urls: List[str], platform: str = None,
+                    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                    per_host_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Scrape reviews from many URLs concurrently.
+        
+        Fetches run on an asyncio event loop under a global concurrency limit
+        and a per-host limit, so a batch of slow retailers overlaps its network
+        waits instead of paying for them one after another.
+        
+        Args:
+            urls: URLs to scrape
+            platform: Optional platform override applied to every URL
+            concurrency: Maximum number of fetches in flight overall
+            per_host_concurrency: Maximum number of fetches in flight per host;
+                defaults to each platform's configured concurrency
+            
+        Returns:
+            One result per input URL, in input order, each with 'url',
+            'platform', 'reviews' and 'error' keys
+        """
+        if not urls:
+            return []
+        
+        results = asyncio.run(self._scrape_batch(urls, platform, concurrency, per_host_concurrency))
+        
+        failed = sum(1 for result in results if result['error'])
+        logger.info(f"Batch scraped {len(results)} URLs ({failed} failed)")
+        return results
+    
+    def iter_scrape_many(self, urls: List[str], platform: str = None,
+                         concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                         per_host_concurrency: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Scrape many URLs concurrently, yielding each result as soon as it finishes.
+        
+        The batch runs on its own event loop in a background thread, so callers
+        such as streaming HTTP responses can consume results in completion
+        order. Results have the same shape as those from scrape_many().
+        """
+        if not urls:
+            return
+        
+        yield from self._stream(
+            lambda on_result: self._scrape_batch(urls, platform, concurrency, per_host_concurrency,
+                                                 on_result=on_result),
+            name='universal-batch'
+        )
+    
+    def scrape_pages(self, url: str, platform: str = None,
+                     max_reviews: int = DEFAULT_PAGINATED_REVIEWS,
+                     per_host_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Scrape reviews across a product's review pages.
+        
+        Args:
+            url: URL of the first review page
+            platform: Optional platform override
+            max_reviews: Number of reviews to stop at
+            per_host_concurrency: Maximum number of pages in flight; defaults to
+                the platform's configured concurrency
+            
+        Returns:
+            Reviews in page order, at most max_reviews of them
+        """
+        pages = list(self.iter_scrape_pages(url, platform, max_reviews, per_host_concurrency))
+        errors = [page['error'] for page in pages if page['error']]
+        if errors and not any(page['reviews'] for page in pages):
+            raise Exception(errors[0])
+        
+        reviews = [review for page in pages for review in page['reviews']]
+        logger.info(f"Retrieved {len(reviews)} reviews from {len(pages)} pages of {url}")
+        return reviews
+    
+    def iter_scrape_pages(self, url: str, platform: str = None,
+                          max_reviews: int = DEFAULT_PAGINATED_REVIEWS,
+                          per_host_concurrency: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Scrape a product's review pages, yielding each page as soon as it is ready.
+        
+        Platforms with a page_param have their pages fetched concurrently,
+        up to per_host_concurrency (or the platform's concurrency) at a
+        time; others follow the next-page
+        link one page after another. Scraping stops once max_reviews reviews
+        were yielded, a page fails, comes back empty or repeats an earlier
+        one, or max_pages is reached. A page whose embedded JSON reviews
+        repeat an earlier page's is read with the CSS selectors instead.
+        
+        The platform is resolved before any page is fetched, so an
+        unsupported URL raises here rather than ending the stream early.
+        
+        Yields:
+            Page results with 'url', 'page', 'platform', 'reviews' and 'error' keys,
+            in page order
+        """
+        resolved_platform, _ = self._resolve_platform(url, platform)
+        return self._stream(
+            lambda on_page: self._scrape_pages(url, resolved_platform, max_reviews, per_host_concurrency, on_page),
+            name='universal-pages'
+        )
+    
+    def _stream(self, start: Callable[[Callable[[Dict[str, Any]], None]], Awaitable[Any]],
+                name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Run a coroutine on its own event loop in a background thread and yield
+        everything it reports through its callback, as it is reported. An
+        exception that ends the coroutine is raised once its reports are consumed.
+        
+        Closing the generator early (e.g. a streaming client disconnecting)
+        cancels the coroutine, so no further pages are fetched for nobody.
+        """
+        results: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        failure = []
+        stopped = threading.Event()
+        running = {}
+        
+        def report(result: Dict[str, Any]) -> None:
+            if stopped.is_set():
+                running['task'].cancel()
+                return
+            results.put(result)
+        
+        async def main():
+            running['loop'] = asyncio.get_running_loop()
+            running['task'] = asyncio.current_task()
+            if not stopped.is_set():
+                await start(report)
+        
+        def run():
+            try:
+                asyncio.run(main())
+            except asyncio.CancelledError:
+                logger.info(f"{name} cancelled, its consumer went away")
+            except Exception as e:
+                logger.error(f"{name} aborted: {str(e)}")
+                failure.append(e)
+            finally:
+                results.put(None)
+        
+        worker = threading.Thread(target=run, name=name, daemon=True)
+        worker.start()
+        
+        try:
+            while True:
+                result = results.get()
+                if result is None:
+                    break
+                yield result
+        finally:
+            stopped.set()
+            if 'task' in running:
+                # The loop may already have finished and closed
+                with contextlib.suppress(RuntimeError):
+                    running['loop'].call_soon_threadsafe(running['task'].cancel)
+        
+        if failure:
+            raise failure[0]
+    
+    async def _fetch_async(self, url: str, config: ScrapeConfig, executor: ThreadPoolExecutor,
+                           host_limit: asyncio.Semaphore,
+                           global_limit: Optional[asyncio.Semaphore] = None) -> bytes:
+        """
+        Fetch a page from the event loop, honoring the host's concurrency and rate limits.
+        
+        The host slot and rate budget are taken before the global slot, so a
+        busy host never holds global capacity while it waits.
+        """
+        content = self._read_cache(url, config)
+        if content is not None:
+            return content
+        
+        loop = asyncio.get_running_loop()
+        async with host_limit:
+            await self.rate_limiter.acquire_async(urlparse(url).netloc.lower())
+            async with global_limit or contextlib.nullcontext():
+                return await loop.run_in_executor(executor, self._download, url, config)
+    
+    def _page_url(self, url: str, config: ScrapeConfig, page: int) -> str:
+        """Build the URL of a review page by setting the platform's page parameter."""
+        parsed = urlparse(url)
+        query = [(key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+                 if key != config.page_param]
+        query.append((config.page_param, str(page)))
+        return parsed._replace(query=urlencode(query)).geturl()
+    
+    def _next_page_url(self, content: bytes, url: str, plan: SelectorPlan) -> Optional[str]:
+        """Find the next-page link on a page, resolved against the page URL."""
+        soup = make_soup(content, plan.next_page_strainer, backend='lxml-strainer')
+        link = plan.next_page.select_one(soup)
+        href = link.get('href') if link else None
+        return urljoin(url, href) if href else None
+    
+    async def _scrape_pages(self, url: str, platform: Optional[str], max_reviews: int,
+                            per_host_concurrency: Optional[int],
+                            on_page: Callable[[Dict[str, Any]], None]) -> None:
+        """Run a paginated scrape on the current event loop, reporting each page to ``on_page``."""
+        resolved_platform, config = self._resolve_platform(url, platform)
+        per_host_concurrency = max(1, per_host_concurrency or config.concurrency)
+        plan = plan_for(config)
+        # Keep every review on a page rather than the single-page cap
+        page_config = dataclasses.replace(config, max_reviews=max_reviews)
+        selector_config = dataclasses.replace(page_config, structured_data=False)
+        
+        host_limit = asyncio.Semaphore(per_host_concurrency)
+        executor = ThreadPoolExecutor(max_workers=per_host_concurrency, thread_name_prefix='universal-page')
+        remaining = max_reviews
+        seen_pages = set()
+        
+        async def scrape_page(page: int, page_url: str) -> Tuple[Dict[str, Any], Optional[bytes]]:
+            result = {'url': page_url, 'page': page, 'platform': resolved_platform, 'reviews': [], 'error': None}
+            content = None
+            try:
+                content = await self._fetch_async(page_url, config, executor, host_limit)
+                result['reviews'] = await self._extract_reviews_async(content, page_url, resolved_platform, page_config)
+            except Exception as e:
+                logger.warning(f"Page {page} of {url} failed: {str(e)}")
+                result['error'] = str(e)
+            return result, content
+        
+        def report(result: Dict[str, Any]) -> bool:
+            """Report a page; returns False once no further pages are worth fetching."""
+            nonlocal remaining
+            signature = tuple(review['review_text'] for review in result['reviews'])
+            # Many sites serve the last page again for page numbers past the end
+            repeated = bool(signature) and signature in seen_pages
+            seen_pages.add(signature)
+            if repeated:
+                result['reviews'] = []
+            
+            result['reviews'] = result['reviews'][:max(0, remaining)]
+            remaining -= len(result['reviews'])
+            on_page(result)
+            return not result['error'] and bool(signature) and not repeated and remaining > 0
+        
+        async def settle(result: Dict[str, Any], content: Optional[bytes]) -> bool:
+            """Report a page, reading it with the CSS selectors if its embedded JSON repeats an earlier page."""
+            reviews = result['reviews']
+            # Some sites embed the first page's reviews on every page, which
+            # would otherwise look like the end of the pages
+            if (reviews and content is not None and reviews[0]['source'].endswith('_structured_data')
+                    and tuple(review['review_text'] for review in reviews) in seen_pages):
+                try:
+                    result['reviews'] = await self._extract_reviews_async(content, result['url'], resolved_platform,
+                                                                          selector_config)
+                except Exception as e:
+                    logger.warning(f"Page {result['page']} of {url} failed: {str(e)}")
+                    result['error'] = str(e)
+            return report(result)
+        
+        try:
+            last_page = config.first_page + config.max_pages - 1
+            
+            if config.page_param:
+                # Pages are fetched concurrently but reported in page order, so
+                # the review cap and end detection behave as in a serial scrape
+                next_page = report_page = config.first_page
+                finished = {}
+                in_flight = set()
+                more = True
+                while more:
+                    while next_page <= last_page and len(in_flight) < per_host_concurrency:
+                        page_url = url if next_page == config.first_page else self._page_url(url, config, next_page)
+                        in_flight.add(asyncio.ensure_future(scrape_page(next_page, page_url)))
+                        next_page += 1
+                    if not in_flight:
+                        break
+                    
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        result, content = task.result()
+                        finished[result['page']] = result, content
+                    while more and report_page in finished:
+                        more = await settle(*finished.pop(report_page))
+                        report_page += 1
+                
+                for task in in_flight:
+                    task.cancel()
+            else:
+                page, page_url, visited = config.first_page, url, set()
+                while page_url and page <= last_page and page_url not in visited:
+                    visited.add(page_url)
+                    result, content = await scrape_page(page, page_url)
+                    if not await settle(result, content) or not plan.next_page:
+                        break
+                    page_url = self._next_page_url(content, page_url, plan)
+                    page += 1
+        finally:
+            executor.shutdown(wait=False)
+    
+    async def _scrape_batch(self, urls: List[str], platform: Optional[str], concurrency: int,
+                            per_host_concurrency: Optional[int],
+                            on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Run a batch of scrapes on the current event loop.
+        
+        Blocking fetches are handed to a thread pool sized to the global limit,
+        while extraction runs as each page arrives. ``on_result`` is called
+        with every result as soon as it is ready.
+        """
+        concurrency = max(1, concurrency)
+        
+        global_limit = asyncio.Semaphore(concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='universal-fetch')
+        
+        async def scrape_one(url: str) -> Dict[str, Any]:
+            result = {'url': url, 'platform': None, 'reviews': [], 'error': None}
+            try:
+                resolved_platform, config = self._resolve_platform(url, platform)
+                result['platform'] = resolved_platform
+                
+                host = urlparse(url).netloc.lower()
+                if host not in host_limits:
+                    host_limits[host] = asyncio.Semaphore(max(1, per_host_concurrency or config.concurrency))
+                host_limit = host_limits[host]
+                content = await self._fetch_async(url, config, executor, host_limit, global_limit)
+                
+                result['reviews'] = await self._extract_reviews_async(content, url, resolved_platform, config)
+            except Exception as e:
+                logger.warning(f"Batch scrape failed for {url}: {str(e)}")
+                result['error'] = str(e)
+            
+            if on_result:
+                on_result(result)
+            return result
+        
+        try:
+            return await asyncio.gather(*(scrape_one(url) for url in urls))
+        finally:
+            executor.shutdown(wait=False)
+    
     def get_supported_platforms(self) -> List[Dict[str, str]]:
         """Get list of all supported platforms."""
         return [
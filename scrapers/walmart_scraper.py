@@ -8,32 +8,178 @@ import os
 import re
 import logging
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from urllib.parse import urlparse, parse_qs
 
+from utils.http_transport import HttpTransport, RevalidationStore, get_shared_transport
+from utils.response_cache import ResponseCache, get_shared_response_cache
+from utils.rate_limiter import HostRateLimiter, get_shared_rate_limiter
+from utils.parsing import make_soup, strainer_for_rules
+from utils.selector_stats import SelectorStats, get_shared_selector_stats
+from utils.parse_pool import ParsePool, get_shared_parse_pool
+from utils.page_classifier import check_page, screen_download
+from utils.helpers import time_left
+
 logger = logging.getLogger(__name__)
 
+# Review container strategies (Walmart's structure), in order of preference
+REVIEW_CONTAINER_RULES = [
+    ('div', {'data-testid': 'reviews-section'}),
+    ('div', {'class': re.compile(r'review.*item')}),
+    ('div', {'class': re.compile(r'customer.*review')})
+]
+
+# Keeps only review containers when parsing with the 'lxml-strainer' backend
+REVIEW_STRAINER = strainer_for_rules(REVIEW_CONTAINER_RULES)
+
+# A page without any of these (case-insensitive) has no reviews to parse
+REVIEW_MARKERS = (b'review',)
+
+# Strategies for each review field, in default order of preference
+REVIEW_FIELD_RULES = {
+    'reviewer_name': [
+        ('span', {'class': re.compile(r'reviewer.*name')}),
+        ('div', {'class': re.compile(r'customer.*name')})
+    ],
+    'rating': [
+        ('div', {'aria-label': re.compile(r'\d+ star')}),
+        ('span', {'class': re.compile(r'star.*rating')})
+    ],
+    'review_text': [
+        ('div', {'class': re.compile(r'review.*text')}),
+        ('span', {'class': re.compile(r'review.*content')})
+    ],
+    'date': [
+        ('span', {'class': re.compile(r'review.*date')}),
+        ('time', {})
+    ]
+}
+
+# Host the container and field strategy statistics are kept under
+SELECTOR_STATS_HOST = 'www.walmart.com'
+
+
+def parse_review_page(content: bytes, url: str,
+                      selector_stats: Optional[SelectorStats] = None) -> List[Dict[str, Any]]:
+    """
+    Parse the reviews on a Walmart page.
+    
+    This is a module-level function so parse worker processes can run it.
+    
+    Args:
+        content: Raw HTML of the page
+        url: URL the page was fetched from
+        selector_stats: Learned rule order; defaults to the shared statistics
+        
+    Returns:
+        List of review dictionaries
+    """
+    selector_stats = selector_stats or get_shared_selector_stats()
+    
+    # Parse HTML
+    soup = make_soup(content, REVIEW_STRAINER)
+    
+    def read_reviews(review_containers: list) -> List[Dict[str, Any]]:
+        """Build reviews from the containers one strategy found."""
+        reviews = []
+        
+        for container in review_containers[:10]:  # Limit to 10 reviews
+            try:
+                # Extract reviewer name
+                name_elem = selector_stats.find_first(container, SELECTOR_STATS_HOST, 'reviewer_name',
+                                                      REVIEW_FIELD_RULES['reviewer_name'])
+                
+                reviewer_name = 'Anonymous'
+                if name_elem:
+                    reviewer_name = name_elem.get_text(strip=True)
+                
+                # Extract rating
+                rating_elem = selector_stats.find_first(container, SELECTOR_STATS_HOST, 'rating',
+                                                        REVIEW_FIELD_RULES['rating'])
+                
+                rating = 0
+                if rating_elem:
+                    rating_text = rating_elem.get('aria-label', '') or rating_elem.get_text()
+                    rating_match = re.search(r'(\d+)', rating_text)
+                    if rating_match:
+                        rating = int(rating_match.group(1))
+                
+                # Extract review text
+                text_elem = selector_stats.find_first(container, SELECTOR_STATS_HOST, 'review_text',
+                                                      REVIEW_FIELD_RULES['review_text'])
+                
+                review_text = ''
+                if text_elem:
+                    review_text = text_elem.get_text(strip=True)
+                
+                # Extract date
+                date_elem = selector_stats.find_first(container, SELECTOR_STATS_HOST, 'date',
+                                                      REVIEW_FIELD_RULES['date'])
+                
+                date = ''
+                if date_elem:
+                    date = date_elem.get_text(strip=True) or date_elem.get('datetime', '')
+                
+                # Skip if no meaningful content
+                if not review_text and rating == 0:
+                    continue
+                
+                review_data = {
+                    'reviewer_name': reviewer_name,
+                    'rating': rating,
+                    'review_text': review_text,
+                    'date': date,
+                    'review_url': url,
+                    'source': 'walmart_scraping'
+                }
+                reviews.append(review_data)
+                
+            except Exception as e:
+                logger.warning(f"Error parsing individual Walmart review: {str(e)}")
+                continue
+        
+        return reviews
+    
+    # Use the first container strategy whose containers hold reviews, in
+    # learned order; one matching unrelated elements counts as a miss
+    return selector_stats.find_all_first(soup, SELECTOR_STATS_HOST, 'container', REVIEW_CONTAINER_RULES,
+                                         extract=read_reviews)
+
 
 class WalmartScraper:
     """
     Scraper for Walmart product reviews.
     """
     
-    def __init__(self):
-        """Initialize the Walmart scraper."""
-        # Setup session for web requests
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+    def __init__(self, transport: Optional[HttpTransport] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 selector_stats: Optional[SelectorStats] = None,
+                 parse_pool: Optional[ParsePool] = None):
+        """
+        Initialize the Walmart scraper.
+        
+        Args:
+            transport: Optional HTTP transport; defaults to the shared pool
+            response_cache: Optional on-disk response cache; defaults to the shared cache
+            rate_limiter: Optional per-host rate limiter; defaults to the shared limiter
+            selector_stats: Optional learned selector ordering; defaults to the shared statistics
+            parse_pool: Optional process pool for parsing; defaults to the shared pool
+        """
+        # Setup session for web requests on the shared connection pool
+        self.transport = transport or get_shared_transport()
+        self.session = self.transport.create_session()
+        self.response_cache = response_cache or get_shared_response_cache()
+        self.cache_ttl = int(os.getenv('WALMART_CACHE_TTL', os.getenv('RESPONSE_CACHE_TTL', 300)))
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        
+        # Validators from earlier fetches, for cheap refreshes
+        self.revalidation = RevalidationStore()
+        
+        # Stop trying container and field strategies first once they keep missing
+        self.selector_stats = selector_stats or get_shared_selector_stats()
+        self.parse_pool = parse_pool or get_shared_parse_pool()
     
     def extract_product_id(self, input_str: str) -> str:
         """
@@ -69,12 +215,16 @@ class WalmartScraper:
             logger.error(f"Error extracting product ID from Walmart URL: {str(e)}")
             return ""
     
-    def get_reviews(self, input_str: str) -> List[Dict[str, Any]]:
+    def get_reviews(self, input_str: str, deadline: Optional[float] = None,
+                    refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get reviews from Walmart product pages.
         
         Args:
             input_str: Walmart product ID or URL
+            deadline: Optional time.monotonic() value to give up by
+            refresh: Skip the response cache and revalidate against the last
+                fetch, for refresh loops that want the page as it is now
             
         Returns:
             List of review dictionaries
@@ -91,74 +241,46 @@ class WalmartScraper:
             # Construct Walmart URL
             url = f"https://www.walmart.com/ip/{product_id}"
             
-            # Make request
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Serve recent pages from the response cache, unless refreshing
+            content = None
+            if self.response_cache and not refresh:
+                content = self.response_cache.get(url, ttl=self.cache_ttl)
+            response = None
+            conditional_headers = {}
             
-            reviews = []
+            if content is None:
+                # Make request, revalidating against the last fetch if possible
+                conditional_headers = self.revalidation.conditional_headers(url)
+                self.rate_limiter.acquire(urlparse(url).netloc, deadline)
+                response = self.session.get(url, headers=conditional_headers, timeout=time_left(deadline, 10))
+                
+                if response.status_code == 304:
+                    cached_reviews = self.revalidation.reuse(url)
+                    if cached_reviews is not None:
+                        logger.info(f"Walmart page not modified, reusing {len(cached_reviews)} reviews")
+                        return cached_reviews
+                    # Validators were dropped in the meantime, fetch the full page
+                    conditional_headers = {}
+                    self.rate_limiter.acquire(urlparse(url).netloc, deadline)
+                    response = self.session.get(url, timeout=time_left(deadline, 10))
+                
+                response.raise_for_status()
+                content = response.content
+                
+                # Block pages are neither cached nor parsed
+                screen_download(content, url, self.rate_limiter)
+                if self.response_cache:
+                    self.response_cache.set(url, content)
             
-            # Find review containers (Walmart's structure)
-            review_containers = soup.find_all('div', {'data-testid': 'reviews-section'}) or \
-                               soup.find_all('div', class_=re.compile(r'review.*item')) or \
-                               soup.find_all('div', class_=re.compile(r'customer.*review'))
+            if check_page(content, url, REVIEW_MARKERS):
+                # Parse in a worker process when the parse pool is enabled
+                reviews = self.parse_pool.run(parse_review_page, content, url, selector_stats=self.selector_stats)
+            else:
+                logger.info(f"No review section on {url}, skipping parse")
+                reviews = []
             
-            for container in review_containers[:10]:  # Limit to 10 reviews
-                try:
-                    # Extract reviewer name
-                    name_elem = container.find('span', class_=re.compile(r'reviewer.*name')) or \
-                               container.find('div', class_=re.compile(r'customer.*name'))
-                    
-                    reviewer_name = 'Anonymous'
-                    if name_elem:
-                        reviewer_name = name_elem.get_text(strip=True)
-                    
-                    # Extract rating
-                    rating_elem = container.find('div', {'aria-label': re.compile(r'\d+ star')}) or \
-                                 container.find('span', class_=re.compile(r'star.*rating'))
-                    
-                    rating = 0
-                    if rating_elem:
-                        rating_text = rating_elem.get('aria-label', '') or rating_elem.get_text()
-                        rating_match = re.search(r'(\d+)', rating_text)
-                        if rating_match:
-                            rating = int(rating_match.group(1))
-                    
-                    # Extract review text
-                    text_elem = container.find('div', class_=re.compile(r'review.*text')) or \
-                               container.find('span', class_=re.compile(r'review.*content'))
-                    
-                    review_text = ''
-                    if text_elem:
-                        review_text = text_elem.get_text(strip=True)
-                    
-                    # Extract date
-                    date_elem = container.find('span', class_=re.compile(r'review.*date')) or \
-                               container.find('time')
-                    
-                    date = ''
-                    if date_elem:
-                        date = date_elem.get_text(strip=True) or date_elem.get('datetime', '')
-                    
-                    # Skip if no meaningful content
-                    if not review_text and rating == 0:
-                        continue
-                    
-                    review_data = {
-                        'reviewer_name': reviewer_name,
-                        'rating': rating,
-                        'review_text': review_text,
-                        'date': date,
-                        'review_url': url,
-                        'source': 'walmart_scraping'
-                    }
-                    reviews.append(review_data)
-                    
-                except Exception as e:
-                    logger.warning(f"Error parsing individual Walmart review: {str(e)}")
-                    continue
+            if response is not None:
+                self.revalidation.store(url, response, reviews, conditional=bool(conditional_headers))
             
             logger.info(f"Retrieved {len(reviews)} reviews from Walmart")
             return reviews
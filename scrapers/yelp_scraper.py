@@ -7,12 +7,15 @@ and HTML parsing fallback methods.
 
 import os
 import re
+import time
 import logging
+import threading
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from urllib.parse import urlparse, parse_qs
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from yelpapi import YelpAPI
@@ -20,16 +23,174 @@ try:
 except ImportError:
     YELP_API_AVAILABLE = False
 
+from utils.http_transport import HttpTransport, RevalidationStore, get_shared_transport
+from utils.response_cache import ResponseCache, get_shared_response_cache
+from utils.rate_limiter import HostRateLimiter, get_shared_rate_limiter
+from utils.parsing import make_soup, strainer_for_rules
+from utils.review_cache import ReviewCache
+from utils.selector_stats import SelectorStats, get_shared_selector_stats
+from utils.parse_pool import ParsePool, get_shared_parse_pool
+from utils.page_classifier import check_page, screen_download
+from utils.helpers import time_left
+
 logger = logging.getLogger(__name__)
 
+# Host the Fusion API is rate limited under
+YELP_API_HOST = 'api.yelp.com'
+
+# Number of businesses whose review totals are remembered
+MAX_TRACKED_BUSINESSES = 4096
+
+# Review container strategies (Yelp's structure may change), in order of preference
+REVIEW_CONTAINER_RULES = [
+    ('div', {'data-testid': 'serp-ia-card'}),
+    ('div', {'class': re.compile(r'review.*')}),
+    ('li', {'class': re.compile(r'review.*')}),
+    ('div', {'class': 'review-content'}),
+    ('div', {'class': 'review-wrapper'})
+]
+
+# Keeps only review containers when parsing with the 'lxml-strainer' backend
+REVIEW_STRAINER = strainer_for_rules(REVIEW_CONTAINER_RULES)
+
+# A page without any of these (case-insensitive) has no reviews to parse
+REVIEW_MARKERS = (b'review', b'serp-ia-card')
+
+# Strategies for each review field, in default order of preference
+REVIEW_FIELD_RULES = {
+    'reviewer_name': [
+        ('span', {'class': re.compile(r'user.*name')}),
+        ('a', {'class': re.compile(r'user.*link')}),
+        ('div', {'class': re.compile(r'user.*info')})
+    ],
+    'rating': [
+        ('div', {'aria-label': re.compile(r'\d+ star')}),
+        ('div', {'class': re.compile(r'rating')}),
+        ('span', {'class': re.compile(r'star')})
+    ],
+    'review_text': [
+        ('span', {'class': re.compile(r'raw__')}),
+        ('p', {'class': re.compile(r'comment')}),
+        ('div', {'class': re.compile(r'review.*text')})
+    ],
+    'date': [
+        ('span', {'class': re.compile(r'date')}),
+        ('time', {}),
+        ('div', {'class': re.compile(r'date')})
+    ]
+}
+
+# Host the container and field strategy statistics are kept under
+SELECTOR_STATS_HOST = 'www.yelp.com'
+
+
+def parse_review_page(content: bytes, url: str,
+                      selector_stats: Optional[SelectorStats] = None) -> List[Dict[str, Any]]:
+    """
+    Parse the reviews on a Yelp page.
+    
+    This is a module-level function so parse worker processes can run it.
+    
+    Args:
+        content: Raw HTML of the page
+        url: URL the page was fetched from
+        selector_stats: Learned rule order; defaults to the shared statistics
+        
+    Returns:
+        List of review dictionaries
+    """
+    selector_stats = selector_stats or get_shared_selector_stats()
+    
+    # Parse HTML
+    soup = make_soup(content, REVIEW_STRAINER)
+    
+    def read_reviews(review_containers: list) -> List[Dict[str, Any]]:
+        """Build reviews from the containers one strategy found."""
+        reviews = []
+        
+        for container in review_containers[:10]:  # Limit to 10 reviews
+            try:
+                # Extract reviewer name
+                name_elem = selector_stats.find_first(container, SELECTOR_STATS_HOST, 'reviewer_name',
+                                                      REVIEW_FIELD_RULES['reviewer_name'])
+                
+                reviewer_name = 'Anonymous'
+                if name_elem:
+                    reviewer_name = name_elem.get_text(strip=True)
+                
+                # Extract rating
+                rating_elem = selector_stats.find_first(container, SELECTOR_STATS_HOST, 'rating',
+                                                        REVIEW_FIELD_RULES['rating'])
+                
+                rating = 0
+                if rating_elem:
+                    rating_text = rating_elem.get('aria-label', '') or rating_elem.get_text()
+                    rating_match = re.search(r'(\d+)', rating_text)
+                    if rating_match:
+                        rating = int(rating_match.group(1))
+                
+                # Extract review text
+                text_elem = selector_stats.find_first(container, SELECTOR_STATS_HOST, 'review_text',
+                                                      REVIEW_FIELD_RULES['review_text'])
+                
+                review_text = ''
+                if text_elem:
+                    review_text = text_elem.get_text(strip=True)
+                
+                # Extract date
+                date_elem = selector_stats.find_first(container, SELECTOR_STATS_HOST, 'date',
+                                                      REVIEW_FIELD_RULES['date'])
+                
+                date = ''
+                if date_elem:
+                    date = date_elem.get_text(strip=True) or date_elem.get('datetime', '')
+                
+                # Skip if no meaningful content
+                if not review_text and rating == 0:
+                    continue
+                
+                review_data = {
+                    'reviewer_name': reviewer_name,
+                    'rating': rating,
+                    'review_text': review_text,
+                    'date': date,
+                    'review_url': url,
+                    'source': 'yelp_scraping'
+                }
+                reviews.append(review_data)
+                
+            except Exception as e:
+                logger.warning(f"Error parsing individual review: {str(e)}")
+                continue
+        
+        return reviews
+    
+    # Use the first container strategy whose containers hold reviews, in
+    # learned order; one matching unrelated elements counts as a miss
+    return selector_stats.find_all_first(soup, SELECTOR_STATS_HOST, 'container', REVIEW_CONTAINER_RULES,
+                                         extract=read_reviews)
+
 
 class YelpScraper:
     """
     Scraper for Yelp business reviews with API and HTML parsing support.
     """
     
-    def __init__(self):
-        """Initialize the Yelp scraper with API key if available."""
+    def __init__(self, transport: Optional[HttpTransport] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 selector_stats: Optional[SelectorStats] = None,
+                 parse_pool: Optional[ParsePool] = None):
+        """
+        Initialize the Yelp scraper with API key if available.
+        
+        Args:
+            transport: Optional HTTP transport; defaults to the shared pool
+            response_cache: Optional on-disk response cache; defaults to the shared cache
+            rate_limiter: Optional per-host rate limiter; defaults to the shared limiter
+            selector_stats: Optional learned selector ordering; defaults to the shared statistics
+            parse_pool: Optional process pool for parsing; defaults to the shared pool
+        """
         self.api_key = os.getenv('YELP_API_KEY')
         self.yelp_api = None
         
@@ -44,17 +205,36 @@ class YelpScraper:
         else:
             logger.info("Yelp API not available, will use HTML parsing")
         
-        # Setup session for web requests
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        # Setup session for web requests on the shared connection pool
+        self.transport = transport or get_shared_transport()
+        self.session = self.transport.create_session()
+        self.response_cache = response_cache or get_shared_response_cache()
+        self.cache_ttl = int(os.getenv('YELP_CACHE_TTL', os.getenv('RESPONSE_CACHE_TTL', 300)))
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.rate_limiter.configure('yelp.com', float(os.getenv('YELP_RATE_LIMIT', 1)))
+        
+        # Validators from earlier fetches, for cheap refreshes
+        self.revalidation = RevalidationStore()
+        
+        # Stop trying container and field strategies first once they keep missing
+        self.selector_stats = selector_stats or get_shared_selector_stats()
+        self.parse_pool = parse_pool or get_shared_parse_pool()
+        
+        # Fusion API paging and bulk calls
+        self.rate_limiter.configure(YELP_API_HOST, float(os.getenv('YELP_API_RATE_LIMIT', 10)))
+        self.api_page_size = int(os.getenv('YELP_API_PAGE_SIZE', 50))
+        self.api_concurrency = max(1, int(os.getenv('YELP_API_CONCURRENCY', 8)))
+        self._api_executor = ThreadPoolExecutor(max_workers=self.api_concurrency, thread_name_prefix='yelp-api')
+        self._bulk_executor = ThreadPoolExecutor(max_workers=self.api_concurrency, thread_name_prefix='yelp-bulk')
+        
+        # Review totals and page sizes learned per business, so repeat calls
+        # fetch every page at once instead of probing the first page
+        self.business_ttl = int(os.getenv('YELP_BUSINESS_TTL', 86400))
+        self._businesses: "OrderedDict[str, Tuple[float, Dict[str, int]]]" = OrderedDict()
+        self._business_lock = threading.Lock()
+        
+        # API review lists, reused for YELP_API_CACHE_TTL seconds
+        self.api_cache = ReviewCache(ttl=int(os.getenv('YELP_API_CACHE_TTL', 300)))
     
     def extract_business_id(self, input_str: str) -> str:
         """
@@ -90,12 +270,47 @@ class YelpScraper:
             logger.error(f"Error extracting business ID from URL: {str(e)}")
             return ""
     
-    def get_reviews_via_api(self, business_id: str) -> List[Dict[str, Any]]:
+    def _query_reviews(self, business_id: str, offset: int, limit: int,
+                       deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Request one page of a business's reviews from the Fusion API."""
+        self.rate_limiter.acquire(YELP_API_HOST, deadline)
+        return self.yelp_api.reviews_query(id=business_id, offset=offset, limit=limit)
+    
+    def _business_info(self, business_id: str) -> Optional[Dict[str, int]]:
+        """Return the remembered review total and page size of a business, if fresh."""
+        with self._business_lock:
+            entry = self._businesses.get(business_id)
+            if entry is None:
+                return None
+            stored_at, info = entry
+            if time.monotonic() - stored_at > self.business_ttl:
+                del self._businesses[business_id]
+                return None
+            return info
+    
+    def _remember_business(self, business_id: str, total: int, page_size: int) -> None:
+        """Remember a business's review total and the page size the API honours."""
+        with self._business_lock:
+            self._businesses[business_id] = (time.monotonic(), {'total': total, 'page_size': page_size})
+            self._businesses.move_to_end(business_id)
+            while len(self._businesses) > MAX_TRACKED_BUSINESSES:
+                self._businesses.popitem(last=False)
+    
+    def get_reviews_via_api(self, business_id: str, max_reviews: int = 10,
+                            deadline: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Get reviews using the Yelp Fusion API.
         
+        Reviews are paged with offset/limit. The first call for a business
+        learns its review total, after which the remaining pages are requested
+        concurrently; later calls request every page at once. Results are
+        reused for YELP_API_CACHE_TTL seconds.
+        
         Args:
             business_id: Yelp business ID
+            max_reviews: Maximum number of reviews to return
+            deadline: Optional time.monotonic() value to stop waiting for
+                the API's request budget by
             
         Returns:
             List of review dictionaries
@@ -103,35 +318,134 @@ class YelpScraper:
         if not self.yelp_api:
             raise Exception("Yelp API not available")
         
+        cache_url = f"https://www.yelp.com/biz/{business_id}"
+        cache_key = f"yelp_api:{max_reviews}"
+        cached_reviews = self.api_cache.get(cache_url, cache_key)
+        if cached_reviews is not None:
+            logger.info(f"Reusing {len(cached_reviews)} Yelp API reviews for {business_id}")
+            return cached_reviews
+        
         try:
-            # Get business reviews
-            reviews_response = self.yelp_api.reviews_query(id=business_id)
+            responses = []
+            info = self._business_info(business_id)
+            if info is None:
+                # Probe the first page to learn the total and the page size served
+                page_size = min(self.api_page_size, max_reviews)
+                first_response = self._query_reviews(business_id, 0, page_size, deadline)
+                responses.append(first_response)
+                served = len(first_response.get('reviews', []))
+                info = {'total': first_response.get('total', served),
+                        'page_size': served if 0 < served < page_size else self.api_page_size}
+                self._remember_business(business_id, info['total'], info['page_size'])
+                first_offset = served if served else None
+            else:
+                first_offset = 0
+            
+            page_size = min(info['page_size'], max_reviews)
+            offsets = range(first_offset, min(info['total'], max_reviews), page_size) if first_offset is not None else []
+            pages = list(self._api_executor.map(
+                lambda offset: self._query_reviews(business_id, offset, page_size, deadline), offsets))
+            if any(len(page.get('reviews', [])) < page_size for page in pages[:-1]):
+                # The API serves smaller pages than remembered, probe again next time
+                with self._business_lock:
+                    self._businesses.pop(business_id, None)
+            responses.extend(pages)
             
             reviews = []
-            for review in reviews_response.get('reviews', [])[:10]:  # Limit to 10 reviews
-                review_data = {
-                    'reviewer_name': review.get('user', {}).get('name', 'Anonymous'),
-                    'rating': review.get('rating', 0),
-                    'review_text': review.get('text', ''),
-                    'date': review.get('time_created', ''),
-                    'review_url': review.get('url', ''),
-                    'source': 'yelp_api'
-                }
-                reviews.append(review_data)
+            seen = set()
+            for reviews_response in responses:
+                for review in reviews_response.get('reviews', []):
+                    review_id = review.get('id') or review.get('url')
+                    if review_id in seen:
+                        continue
+                    seen.add(review_id)
+                    review_data = {
+                        'reviewer_name': review.get('user', {}).get('name', 'Anonymous'),
+                        'rating': review.get('rating', 0),
+                        'review_text': review.get('text', ''),
+                        'date': review.get('time_created', ''),
+                        'review_url': review.get('url', ''),
+                        'source': 'yelp_api'
+                    }
+                    reviews.append(review_data)
+            reviews = reviews[:max_reviews]
             
-            logger.info(f"Retrieved {len(reviews)} reviews via Yelp API")
+            self.api_cache.set(cache_url, cache_key, reviews)
+            logger.info(f"Retrieved {len(reviews)} reviews via Yelp API in {len(responses)} calls")
             return reviews
             
         except Exception as e:
             logger.error(f"Yelp API error: {str(e)}")
             raise
     
-    def get_reviews_via_scraping(self, business_id: str) -> List[Dict[str, Any]]:
+    def get_reviews_bulk(self, inputs: List[str], max_reviews: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        Get reviews for many Yelp businesses at once.
+        
+        API calls for all businesses run concurrently (YELP_API_CONCURRENCY
+        at a time, within the API rate limit). HTML scraping is used only for
+        the businesses whose API call failed, or for all of them when the API
+        isn't configured.
+        
+        Args:
+            inputs: Yelp business IDs or URLs
+            max_reviews: Maximum number of reviews per business
+            
+        Returns:
+            Dictionary keyed by input, in input order, with 'business_id',
+            'reviews', 'source' and 'error' for each business
+        """
+        results = {}
+        business_ids = {}
+        for input_str in inputs:
+            business_id = self.extract_business_id(input_str)
+            if business_id:
+                business_ids[input_str] = business_id
+            results[input_str] = {
+                'business_id': business_id,
+                'reviews': [],
+                'source': None,
+                'error': None if business_id else "Invalid Yelp business ID or URL"
+            }
+        
+        failed = dict(business_ids)
+        if self.yelp_api:
+            futures = {
+                input_str: self._bulk_executor.submit(self.get_reviews_via_api, business_id, max_reviews)
+                for input_str, business_id in business_ids.items()
+            }
+            for input_str, future in futures.items():
+                try:
+                    results[input_str].update(reviews=future.result(), source='yelp_api')
+                    del failed[input_str]
+                except Exception as e:
+                    logger.warning(f"Yelp API failed for {business_ids[input_str]}, falling back to scraping: {str(e)}")
+        
+        futures = {
+            input_str: self._bulk_executor.submit(self.get_reviews_via_scraping, business_id)
+            for input_str, business_id in failed.items()
+        }
+        for input_str, future in futures.items():
+            try:
+                results[input_str].update(reviews=future.result()[:max_reviews], source='yelp_scraping')
+            except Exception as e:
+                results[input_str]['error'] = str(e)
+        
+        logger.info(f"Bulk Yelp scrape: {len(business_ids) - len(failed)} via API, "
+                    f"{len(failed)} via scraping, {len(inputs) - len(business_ids)} invalid")
+        return results
+    
+    def get_reviews_via_scraping(self, business_id: str, deadline: Optional[float] = None,
+                                 refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get reviews using HTML parsing/web scraping.
         
         Args:
             business_id: Yelp business ID
+            deadline: Optional time.monotonic() value to give up by; rate-limit
+                waits and request timeouts are cut short to meet it
+            refresh: Skip the response cache and revalidate against the last
+                fetch, for refresh loops that want the page as it is now
             
         Returns:
             List of review dictionaries
@@ -140,83 +454,46 @@ class YelpScraper:
             # Construct Yelp URL
             url = f"https://www.yelp.com/biz/{business_id}"
             
-            # Make request
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Serve recent pages from the response cache, unless refreshing
+            content = None
+            if self.response_cache and not refresh:
+                content = self.response_cache.get(url, ttl=self.cache_ttl)
+            response = None
+            conditional_headers = {}
             
-            reviews = []
-            
-            # Find review containers (Yelp's structure may change)
-            review_containers = soup.find_all('div', {'data-testid': 'serp-ia-card'}) or \
-                               soup.find_all('div', class_=re.compile(r'review.*')) or \
-                               soup.find_all('li', class_=re.compile(r'review.*'))
+            if content is None:
+                # Make request, revalidating against the last fetch if possible
+                conditional_headers = self.revalidation.conditional_headers(url)
+                self.rate_limiter.acquire(urlparse(url).netloc, deadline)
+                response = self.session.get(url, headers=conditional_headers, timeout=time_left(deadline, 10))
+                
+                if response.status_code == 304:
+                    cached_reviews = self.revalidation.reuse(url)
+                    if cached_reviews is not None:
+                        logger.info(f"Yelp page not modified, reusing {len(cached_reviews)} reviews")
+                        return cached_reviews
+                    # Validators were dropped in the meantime, fetch the full page
+                    conditional_headers = {}
+                    self.rate_limiter.acquire(urlparse(url).netloc, deadline)
+                    response = self.session.get(url, timeout=time_left(deadline, 10))
+                
+                response.raise_for_status()
+                content = response.content
+                
+                # Block pages are neither cached nor parsed
+                screen_download(content, url, self.rate_limiter)
+                if self.response_cache:
+                    self.response_cache.set(url, content)
             
-            if not review_containers:
-                # Try alternative selectors
-                review_containers = soup.find_all('div', class_='review-content') or \
-                                   soup.find_all('div', class_='review-wrapper')
+            if check_page(content, url, REVIEW_MARKERS):
+                # Parse in a worker process when the parse pool is enabled
+                reviews = self.parse_pool.run(parse_review_page, content, url, selector_stats=self.selector_stats)
+            else:
+                logger.info(f"No review section on {url}, skipping parse")
+                reviews = []
             
-            for container in review_containers[:10]:  # Limit to 10 reviews
-                try:
-                    # Extract reviewer name
-                    name_elem = container.find('span', class_=re.compile(r'user.*name')) or \
-                               container.find('a', class_=re.compile(r'user.*link')) or \
-                               container.find('div', class_=re.compile(r'user.*info'))
-                    
-                    reviewer_name = 'Anonymous'
-                    if name_elem:
-                        reviewer_name = name_elem.get_text(strip=True)
-                    
-                    # Extract rating
-                    rating_elem = container.find('div', {'aria-label': re.compile(r'\d+ star')}) or \
-                                 container.find('div', class_=re.compile(r'rating')) or \
-                                 container.find('span', class_=re.compile(r'star'))
-                    
-                    rating = 0
-                    if rating_elem:
-                        rating_text = rating_elem.get('aria-label', '') or rating_elem.get_text()
-                        rating_match = re.search(r'(\d+)', rating_text)
-                        if rating_match:
-                            rating = int(rating_match.group(1))
-                    
-                    # Extract review text
-                    text_elem = container.find('span', class_=re.compile(r'raw__')) or \
-                               container.find('p', class_=re.compile(r'comment')) or \
-                               container.find('div', class_=re.compile(r'review.*text'))
-                    
-                    review_text = ''
-                    if text_elem:
-                        review_text = text_elem.get_text(strip=True)
-                    
-                    # Extract date
-                    date_elem = container.find('span', class_=re.compile(r'date')) or \
-                               container.find('time') or \
-                               container.find('div', class_=re.compile(r'date'))
-                    
-                    date = ''
-                    if date_elem:
-                        date = date_elem.get_text(strip=True) or date_elem.get('datetime', '')
-                    
-                    # Skip if no meaningful content
-                    if not review_text and rating == 0:
-                        continue
-                    
-                    review_data = {
-                        'reviewer_name': reviewer_name,
-                        'rating': rating,
-                        'review_text': review_text,
-                        'date': date,
-                        'review_url': url,
-                        'source': 'yelp_scraping'
-                    }
-                    reviews.append(review_data)
-                    
-                except Exception as e:
-                    logger.warning(f"Error parsing individual review: {str(e)}")
-                    continue
+            if response is not None:
+                self.revalidation.store(url, response, reviews, conditional=bool(conditional_headers))
             
             logger.info(f"Retrieved {len(reviews)} reviews via Yelp scraping")
             return reviews
@@ -228,12 +505,18 @@ class YelpScraper:
             logger.error(f"Yelp scraping error: {str(e)}")
             raise
     
-    def get_reviews(self, input_str: str) -> List[Dict[str, Any]]:
+    def get_reviews(self, input_str: str, deadline: Optional[float] = None,
+                    refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get reviews from Yelp using API or scraping fallback.
         
         Args:
             input_str: Yelp business ID or URL
+            deadline: Optional time.monotonic() value to give up by (bounds
+                rate limit waits and the scraping fallback; API calls
+                themselves use the client's own timeout)
+            refresh: Revalidate a scraped page instead of serving it from the
+                response cache
             
         Returns:
             List of review dictionaries
@@ -249,9 +532,9 @@ class YelpScraper:
         # Try API first if available
         if self.yelp_api:
             try:
-                return self.get_reviews_via_api(business_id)
+                return self.get_reviews_via_api(business_id, deadline=deadline)
             except Exception as e:
                 logger.warning(f"Yelp API failed, falling back to scraping: {str(e)}")
         
         # Fallback to scraping
-        return self.get_reviews_via_scraping(business_id)
+        return self.get_reviews_via_scraping(business_id, deadline, refresh)
@@ -8,8 +8,13 @@ and other common operations.
 import os
 import logging
 import json
+import time
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'ref', 'ref_', 'tag'}
 
 
 def setup_logging() -> None:
@@ -180,6 +185,56 @@ def clean_review_data(reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return cleaned_reviews
 
 
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent links share one cache key.
+    
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters, and sorts the remaining query parameters.
+    
+    Args:
+        url: URL to normalize
+        
+    Returns:
+        Canonical URL string
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    
+    return urlunparse((scheme, netloc, parsed.path or '/', parsed.params, urlencode(query), ''))
+
+
+def time_left(deadline: Optional[float], cap: float) -> float:
+    """
+    Get the time a blocking call may take before a deadline.
+    
+    Args:
+        deadline: time.monotonic() value the work must finish by, or None
+        cap: Longest wait allowed regardless of the deadline
+        
+    Returns:
+        Seconds until the deadline, at most cap
+        
+    Raises:
+        TimeoutError: If the deadline has already passed
+    """
+    if deadline is None:
+        return cap
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("Scrape deadline passed")
+    return min(cap, remaining)
+
+
 def get_user_agent() -> str:
     """
     Get a random user agent string for web requests.
@@ -200,19 +255,26 @@ def get_user_agent() -> str:
     return random.choice(user_agents)
 
 
-def rate_limit_delay(min_delay: float = 1.0, max_delay: float = 3.0) -> None:
+def rate_limit_delay(host: str = 'default', deadline: Optional[float] = None) -> float:
     """
-    Add a random delay to avoid rate limiting.
+    Wait until the shared per-host rate limiter allows a request.
+    
+    Only blocks when the host's request budget is spent.
     
     Args:
-        min_delay: Minimum delay in seconds
-        max_delay: Maximum delay in seconds
+        host: Host the request is going to
+        deadline: Optional time.monotonic() value to give up by
+        
+    Returns:
+        Seconds waited
+        
+    Raises:
+        TimeoutError: If the wait would run past the deadline
+        HostBackoffError: If the host is backing off after a block page
     """
-    import time
-    import random
+    from utils.rate_limiter import get_shared_rate_limiter
     
-    delay = random.uniform(min_delay, max_delay)
-    time.sleep(delay)
+    return get_shared_rate_limiter().acquire(host, deadline)
 
 
 def is_valid_json(json_str: str) -> bool:
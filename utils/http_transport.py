@@ -0,0 +1,261 @@
+"""
+Shared HTTP Transport
+
+This module provides a single tuned connection pool that every scraper
+shares, so repeated scrapes reuse keep-alive connections instead of paying
+TCP/TLS setup costs on each request.
+"""
+
+import os
+import logging
+import threading
+import requests
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Browser-like headers used by every scraper session
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+class HttpTransport:
+    """
+    Connection pool shared by all scraper sessions.
+
+    Each scraper keeps its own ``requests.Session`` (and therefore its own
+    headers and cookies), but every session is mounted on the same adapter, so
+    they all draw from one set of per-host keep-alive pools.
+    """
+
+    def __init__(self, pool_hosts: Optional[int] = None, pool_per_host: Optional[int] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_hosts: Number of per-host pools kept alive overall
+            pool_per_host: Number of connections kept alive per host
+        """
+        self.pool_hosts = pool_hosts or int(os.getenv('HTTP_POOL_HOSTS', 64))
+        self.pool_per_host = pool_per_host or int(os.getenv('HTTP_POOL_PER_HOST', 32))
+
+        self.adapter = HTTPAdapter(
+            pool_connections=self.pool_hosts,
+            pool_maxsize=self.pool_per_host,
+            pool_block=False
+        )
+        self._sessions_created = 0
+        self._lock = threading.Lock()
+
+    def create_session(self, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+        """
+        Create a session bound to the shared connection pool.
+
+        Args:
+            headers: Optional headers applied on top of DEFAULT_HEADERS
+
+        Returns:
+            Configured requests session
+        """
+        session = requests.Session()
+        session.mount('http://', self.adapter)
+        session.mount('https://', self.adapter)
+        session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            session.headers.update(headers)
+
+        with self._lock:
+            self._sessions_created += 1
+
+        return session
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Report connection reuse for the pools currently held.
+
+        Returns:
+            Dictionary with pool sizes, totals and a per-host breakdown
+        """
+        pools = self.adapter.poolmanager.pools
+        hosts = {}
+        total_requests = 0
+        total_connections = 0
+
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+
+            requests_made = getattr(pool, 'num_requests', 0)
+            connections_opened = getattr(pool, 'num_connections', 0)
+            # The pool queue is pre-filled with None placeholders for unopened slots
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0
+
+            total_requests += requests_made
+            total_connections += connections_opened
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                'requests': requests_made,
+                'connections_opened': connections_opened,
+                'connections_reused': max(0, requests_made - connections_opened),
+                'idle_connections': idle
+            }
+
+        return {
+            'pool_hosts': self.pool_hosts,
+            'pool_per_host': self.pool_per_host,
+            'sessions': self._sessions_created,
+            'total_requests': total_requests,
+            'connections_opened': total_connections,
+            'connections_reused': max(0, total_requests - total_connections),
+            'reuse_ratio': (total_requests - total_connections) / total_requests if total_requests else 0.0,
+            'hosts': hosts
+        }
+
+
+_shared_transport = None
+_shared_transport_lock = threading.Lock()
+
+
+def get_shared_transport() -> HttpTransport:
+    """
+    Get the process-wide transport, creating it on first use.
+
+    Returns:
+        Shared HttpTransport instance
+    """
+    global _shared_transport
+
+    if _shared_transport is None:
+        with _shared_transport_lock:
+            if _shared_transport is None:
+                _shared_transport = HttpTransport()
+                logger.info(
+                    f"Created shared HTTP transport ({_shared_transport.pool_hosts} host pools, "
+                    f"{_shared_transport.pool_per_host} connections per host)"
+                )
+
+    return _shared_transport
+
+
+class RevalidationStore:
+    """
+    Remembers HTTP validators and parsed reviews per URL.
+
+    Refresh loops send ``If-None-Match`` / ``If-Modified-Since`` from the
+    stored validators; a 304 answer lets the scraper reuse the reviews it
+    parsed last time instead of downloading and parsing the page again.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries: Maximum number of URLs remembered (least recently used are dropped)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.revalidated = 0
+        self.modified = 0
+        self.unconditional = 0
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build conditional request headers for a URL.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            Headers to add to the request (empty if nothing is stored)
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def reuse(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the stored reviews for a URL after a 304 response.
+
+        Args:
+            url: URL that answered 304 Not Modified
+
+        Returns:
+            Copy of the previously parsed reviews, or None if nothing is stored
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self._entries.move_to_end(url)
+            self.revalidated += 1
+            reviews = entry['reviews']
+
+        return [dict(review) for review in reviews]
+
+    def store(self, url: str, response: requests.Response, reviews: List[Dict[str, Any]],
+              conditional: bool = False) -> None:
+        """
+        Remember the validators from a full response and the reviews parsed from it.
+
+        Args:
+            url: URL that was requested
+            response: Full (200) response for the URL
+            reviews: Reviews parsed from the response
+            conditional: Whether the request carried validators
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        with self._lock:
+            if conditional:
+                self.modified += 1
+            else:
+                self.unconditional += 1
+
+            if not etag and not last_modified:
+                self._entries.pop(url, None)
+                return
+
+            self._entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'reviews': [dict(review) for review in reviews]
+            }
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Report revalidation counters.
+
+        Returns:
+            Dictionary with hit/miss counts and the number of URLs tracked
+        """
+        with self._lock:
+            conditional_requests = self.revalidated + self.modified
+            return {
+                'tracked_urls': len(self._entries),
+                'revalidated': self.revalidated,
+                'modified': self.modified,
+                'unconditional': self.unconditional,
+                'hit_ratio': self.revalidated / conditional_requests if conditional_requests else 0.0
+            }
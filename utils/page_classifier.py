@@ -0,0 +1,200 @@
+"""
+Pre-Parse Page Classification
+
+Retailers answer scrapers with captcha, robot-check and sign-in pages, often
+with HTTP 200. Parsing those runs every selector chain and the expensive
+fallbacks only to find nothing, so this module classifies a page from its
+raw bytes first: block pages are reported as a typed error (and never
+cached), and pages without any review markup skip the parse altogether.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional, Sequence
+from urllib.parse import urlparse
+
+from utils.rate_limiter import HostRateLimiter
+
+# Page verdicts
+PAGE_OK = 'ok'
+PAGE_EMPTY = 'empty'
+PAGE_BLOCKED = 'blocked'
+PAGE_CAPTCHA = 'captcha'
+PAGE_LOGIN = 'login'
+
+# Verdicts for pages that can never yield reviews, whatever the selectors
+UNUSABLE_KINDS = (PAGE_BLOCKED, PAGE_CAPTCHA, PAGE_LOGIN)
+
+# Block pages give themselves away near the top; real pages are only
+# scanned this far for block markers
+HEAD_BYTES = 65536
+
+# Markers of bot-block and captcha pages, matched as plain substrings of the
+# lowercased head. Only markers that don't turn up on real product pages
+# belong here, since a match skips the page.
+BODY_MARKERS = (
+    (b'/errors/validatecaptcha', 'captcha'),
+    (b'enter the characters you see below', 'captcha'),
+    (b'px-captcha', 'captcha'),
+    (b'captcha-delivery.com', 'captcha'),
+    (b'to discuss automated access to amazon data', 'blocked'),
+)
+
+# Page titles of block, captcha and sign-in pages (lowercased). Sign-in
+# titles must be whole, since product titles can start with "sign-in" too
+TITLE_MARKERS = re.compile(
+    rb'(?P<captcha>robot or human\?)'
+    rb'|(?P<blocked>robot check$|access denied$|attention required! \| cloudflare|just a moment\.\.\.$)'
+    rb'|(?P<login>(?:amazon\s+)?(?:sign[\s-]?in|log[\s-]?in)$)'
+)
+
+# Default review markers; a page without any of them (case-insensitive)
+# has no review section to parse
+DEFAULT_REVIEW_MARKERS = (b'review',)
+
+# Chunk size for the review marker scan, so pages with reviews near the top
+# aren't lowercased in full
+SCAN_CHUNK = 65536
+
+
+class UnusablePageError(Exception):
+    """
+    A page that can never yield reviews: a bot block, captcha or sign-in wall.
+    """
+
+    def __init__(self, kind: str, url: str):
+        """
+        Initialize the error.
+
+        Args:
+            kind: Page verdict (one of UNUSABLE_KINDS)
+            url: URL the page was fetched from
+        """
+        super().__init__(f"{kind} page returned for {url}")
+        self.kind = kind
+        self.url = url
+
+    @property
+    def retryable(self) -> bool:
+        """Whether the page may go away after backing off (blocks do, sign-in walls don't)."""
+        return self.kind in (PAGE_BLOCKED, PAGE_CAPTCHA)
+
+
+def find_unusable(content: bytes) -> Optional[str]:
+    """
+    Look for bot-block, captcha and sign-in markers at the top of a page.
+
+    Args:
+        content: Raw page body
+
+    Returns:
+        The unusable verdict, or None if the page looks like a real one
+    """
+    head = content[:HEAD_BYTES].lower()
+    for marker, kind in BODY_MARKERS:
+        if marker in head:
+            return kind
+
+    start = head.find(b'<title')
+    if start == -1:
+        return None
+    start = head.find(b'>', start) + 1
+    end = head.find(b'</title', start)
+    if start == 0 or end == -1:
+        return None
+    match = TITLE_MARKERS.match(head[start:end].strip())
+    return match.lastgroup if match else None
+
+
+@lru_cache(maxsize=64)
+def _lowered(markers: tuple) -> tuple:
+    """Lowercase a marker tuple once."""
+    return tuple(marker.lower() for marker in markers)
+
+
+def has_review_markers(content: bytes, markers: Sequence[bytes] = DEFAULT_REVIEW_MARKERS) -> bool:
+    """
+    Check whether a page mentions any review marker, case-insensitively.
+
+    Args:
+        content: Raw page body
+        markers: Byte strings, any of which a page with reviews contains
+
+    Returns:
+        True if any marker occurs in the page
+    """
+    markers = _lowered(tuple(markers))
+    overlap = max(len(marker) for marker in markers) - 1
+    for start in range(0, len(content), SCAN_CHUNK):
+        chunk = content[max(0, start - overlap):start + SCAN_CHUNK].lower()
+        if any(marker in chunk for marker in markers):
+            return True
+    return False
+
+
+def screen_download(content: bytes, url: str, rate_limiter: HostRateLimiter) -> None:
+    """
+    Check a freshly downloaded page for blocks before it is cached or parsed.
+
+    A block backs off the host in the rate limiter, so retries and the
+    following requests wait instead of hammering it; a usable page resets
+    the back-off.
+
+    Args:
+        content: Raw page body
+        url: URL the page was fetched from
+        rate_limiter: Limiter the host's requests go through
+
+    Raises:
+        UnusablePageError: For block, captcha and sign-in pages
+    """
+    host = urlparse(url).netloc
+    kind = find_unusable(content)
+    if kind is None:
+        rate_limiter.clear_penalty(host)
+        return
+    if kind != PAGE_LOGIN:
+        rate_limiter.penalize(host)
+    raise UnusablePageError(kind, url)
+
+
+def classify_page(content: bytes, review_markers: Optional[Sequence[bytes]] = DEFAULT_REVIEW_MARKERS) -> str:
+    """
+    Classify a page from its raw bytes, without parsing it.
+
+    Args:
+        content: Raw page body
+        review_markers: Byte strings any page with reviews contains, or None
+            to skip the empty-page check
+
+    Returns:
+        PAGE_OK, PAGE_EMPTY or one of UNUSABLE_KINDS
+    """
+    kind = find_unusable(content)
+    if kind:
+        return kind
+    if review_markers and not has_review_markers(content, review_markers):
+        return PAGE_EMPTY
+    return PAGE_OK
+
+
+def check_page(content: bytes, url: str,
+               review_markers: Optional[Sequence[bytes]] = DEFAULT_REVIEW_MARKERS) -> bool:
+    """
+    Decide whether a page is worth parsing.
+
+    Args:
+        content: Raw page body
+        url: URL the page was fetched from
+        review_markers: See classify_page()
+
+    Returns:
+        True if the page should be parsed, False if it has no review section
+
+    Raises:
+        UnusablePageError: For block, captcha and sign-in pages
+    """
+    kind = classify_page(content, review_markers)
+    if kind in UNUSABLE_KINDS:
+        raise UnusablePageError(kind, url)
+    return kind == PAGE_OK
@@ -0,0 +1,220 @@
+"""
+Process-Pool HTML Parsing
+
+BeautifulSoup parsing and review extraction are pure Python and CPU-bound,
+so concurrent requests in one process contend for the GIL. This module
+optionally hands the parse stage to a pool of worker processes: raw
+response bytes go in, plain review dicts come back.
+
+The pool is off by default (SCRAPER_PARSE_WORKERS=0) and every call then
+runs inline, exactly as before.
+"""
+
+import os
+import asyncio
+import logging
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for parsing; 0 parses inline in the calling thread
+PARSE_WORKERS = int(os.getenv('SCRAPER_PARSE_WORKERS', 0))
+
+
+def _init_worker() -> None:
+    """Pre-import the parsers and scrapers so a worker's first parse is as fast as its last."""
+    from utils import parsing
+    from utils.selector_stats import get_shared_selector_stats
+    import scrapers.amazon_scraper  # noqa: F401
+    import scrapers.yelp_scraper  # noqa: F401
+    import scrapers.walmart_scraper  # noqa: F401
+    import scrapers.universal_scraper  # noqa: F401
+
+    # Workers keep their own copy of the learned selector order and send their
+    # rule wins back to the parent, which records and persists them
+    get_shared_selector_stats(persist=False)
+    parsing.make_soup(b'<html><body><div class="review"><span>warm-up</span></div></body></html>')
+
+
+def _run_with_selector_stats(func: Callable[..., Any], *args: Any) -> Tuple[Any, List[tuple]]:
+    """Call a parse function in a worker with its selector statistics, returning the rule wins it recorded."""
+    from utils.selector_stats import get_shared_selector_stats
+
+    selector_stats = get_shared_selector_stats(persist=False)
+    selector_stats.journal = []
+    try:
+        return func(*args, selector_stats=selector_stats), selector_stats.journal
+    finally:
+        selector_stats.journal = None
+
+
+class ParsePool:
+    """
+    Runs module-level parse functions in worker processes, or inline when disabled.
+
+    Functions and their positional arguments must be picklable. Keyword
+    arguments are only passed when a call runs inline, so callers can hand
+    over in-process state (compiled plans) that workers rebuild for
+    themselves. A ``selector_stats`` keyword is the exception: workers parse
+    with their own copy of the statistics and return the rule wins they
+    recorded, which are then recorded in the given statistics, so selector
+    learning reaches the parent and is persisted there.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Initialize the pool; worker processes start on first use.
+
+        Args:
+            workers: Number of worker processes (0 disables the pool)
+        """
+        self.workers = PARSE_WORKERS if workers is None else workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.inline = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether parses are sent to worker processes."""
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the worker pool, starting it on first use."""
+        with self._lock:
+            if self._executor is None:
+                # Fork is unsafe in a threaded server, so workers start from a clean process
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                                     initializer=_init_worker)
+                logger.info(f"Started parse pool with {self.workers} worker processes")
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken pool so the next call starts a fresh one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self.failures += 1
+        executor.shutdown(wait=False)
+
+    @staticmethod
+    def _submit(executor: ProcessPoolExecutor, func: Callable[..., Any], args: tuple,
+                inline_kwargs: Dict[str, Any]) -> Future:
+        """Send a call to a worker, wrapped to report its rule wins when it uses selector statistics."""
+        if inline_kwargs.get('selector_stats') is not None:
+            return executor.submit(_run_with_selector_stats, func, *args)
+        return executor.submit(func, *args)
+
+    @staticmethod
+    def _collect(outcome: Any, inline_kwargs: Dict[str, Any]) -> Any:
+        """Record a worker's rule wins in the caller's selector statistics and return its result."""
+        selector_stats = inline_kwargs.get('selector_stats')
+        if selector_stats is None:
+            return outcome
+        result, wins = outcome
+        for host, group, index, missed in wins:
+            selector_stats.record(host, group, index, missed)
+        return result
+
+    def run(self, func: Callable[..., Any], *args: Any, **inline_kwargs: Any) -> Any:
+        """
+        Call a parse function, in a worker process when the pool is enabled.
+
+        Args:
+            func: Module-level function to call
+            *args: Picklable positional arguments
+            **inline_kwargs: Extra keyword arguments, used only inline (a
+                selector_stats one also receives a worker call's rule wins)
+
+        Returns:
+            The function's return value
+        """
+        if not self.enabled:
+            self.inline += 1
+            return func(*args, **inline_kwargs)
+
+        executor = self._get_executor()
+        try:
+            future = self._submit(executor, func, args, inline_kwargs)
+            self.submitted += 1
+            return self._collect(future.result(), inline_kwargs)
+        except BrokenProcessPool as e:
+            logger.warning(f"Parse pool broke, parsing inline: {str(e)}")
+            self._discard(executor)
+            self.inline += 1
+            return func(*args, **inline_kwargs)
+
+    async def run_async(self, func: Callable[..., Any], *args: Any, **inline_kwargs: Any) -> Any:
+        """
+        Await a parse function without blocking the event loop.
+
+        Inline calls run in the loop's default thread pool, so other fetches
+        keep making progress while a page is parsed.
+        """
+        loop = asyncio.get_running_loop()
+        inline = functools.partial(func, *args, **inline_kwargs)
+        if not self.enabled:
+            self.inline += 1
+            return await loop.run_in_executor(None, inline)
+
+        executor = self._get_executor()
+        try:
+            future = self._submit(executor, func, args, inline_kwargs)
+            self.submitted += 1
+            return self._collect(await asyncio.wrap_future(future), inline_kwargs)
+        except BrokenProcessPool as e:
+            logger.warning(f"Parse pool broke, parsing inline: {str(e)}")
+            self._discard(executor)
+            self.inline += 1
+            return await loop.run_in_executor(None, inline)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Report pool usage.
+
+        Returns:
+            Dictionary with the worker count and call counters
+        """
+        return {
+            'workers': self.workers,
+            'running': self._executor is not None,
+            'submitted': self.submitted,
+            'inline': self.inline,
+            'failures': self.failures
+        }
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_parse_pool() -> ParsePool:
+    """
+    Get the process-wide parse pool, creating it on first use.
+
+    Returns:
+        Shared ParsePool sized by SCRAPER_PARSE_WORKERS
+    """
+    global _shared_pool
+
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = ParsePool()
+
+    return _shared_pool
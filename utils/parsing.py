@@ -0,0 +1,314 @@
+"""
+HTML Parser Backends
+
+This module builds BeautifulSoup trees for all scrapers with a configurable
+backend: the pure-Python 'html.parser', 'lxml', or 'lxml-strainer', which
+uses lxml and only builds the parts of the page that can hold reviews.
+
+It also provides a cheap event-driven scan that finds where review sections
+end, so callers can build a tree for just the start of a huge page.
+"""
+
+import os
+import re
+import logging
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'lxml-strainer')
+
+# Backend used when callers don't ask for one
+DEFAULT_PARSER_BACKEND = os.getenv('SCRAPER_PARSER', 'lxml' if LXML_AVAILABLE else 'html.parser')
+
+# Stop parsing once enough review sections have been seen (needs lxml for the scan)
+INCREMENTAL_PARSE = os.getenv('SCRAPER_INCREMENTAL_PARSE', 'true').lower() == 'true'
+
+# The HTML push parser of libxml2 before 2.11 stops emitting events after a
+# few feeds, so the scan would never find a cut and only add work
+PUSH_PARSER_USABLE = LXML_AVAILABLE and etree.LIBXML_VERSION >= (2, 11)
+if INCREMENTAL_PARSE and LXML_AVAILABLE and not PUSH_PARSER_USABLE:
+    logger.warning(f"libxml2 {'.'.join(map(str, etree.LIBXML_VERSION))} is too old for incremental "
+                   f"parsing, pages are parsed in full")
+
+# Bytes fed to the section scanner at a time
+PARSE_CHUNK_SIZE = int(os.getenv('SCRAPER_PARSE_CHUNK', 64 * 1024))
+
+# One compound selector part: .class, #id, [attr] or [attr=value]
+_SELECTOR_PART = re.compile(
+    r"""\.(?P<cls>[\w-]+)"""
+    r"""|\#(?P<id>[\w-]+)"""
+    r"""|\[\s*(?P<attr>[\w-]+)\s*(?:=\s*(?P<quote>['"]?)(?P<value>.*?)(?P=quote))?\s*\]"""
+)
+_TAG_NAME = re.compile(r'^[a-zA-Z][\w-]*')
+
+
+def make_soup(content: Union[bytes, str], strainer: Optional[SoupStrainer] = None,
+              backend: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse HTML with the configured backend.
+
+    Args:
+        content: Raw HTML
+        strainer: Review-section strainer, used only by the 'lxml-strainer' backend
+        backend: Parser backend override
+
+    Returns:
+        Parsed BeautifulSoup tree
+    """
+    backend = backend or DEFAULT_PARSER_BACKEND
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{backend}'. Supported: {list(PARSER_BACKENDS)}")
+
+    if backend == 'html.parser' or not LXML_AVAILABLE:
+        return BeautifulSoup(content, 'html.parser')
+
+    if backend == 'lxml-strainer' and strainer is not None:
+        return BeautifulSoup(content, 'lxml', parse_only=strainer)
+
+    return BeautifulSoup(content, 'lxml')
+
+
+def _class_list(value) -> Iterable[str]:
+    """Split a class attribute, which is a raw string while parsing."""
+    if isinstance(value, str):
+        return value.split()
+    return value or []
+
+
+def _first_compound(selector: str) -> Optional[str]:
+    """Return the leftmost compound selector, or None for selector lists."""
+    depth = 0
+    quote = None
+    for i, char in enumerate(selector):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif depth == 0 and char == ',':
+            return None
+        elif depth == 0 and (char.isspace() or char in '>+~'):
+            return selector[:i]
+    return selector
+
+
+def selector_matcher(selector: str) -> Optional[Callable[[str, dict], bool]]:
+    """
+    Build a (tag name, attrs) predicate for the first compound of a CSS selector.
+
+    Every element matched by the full selector is, or lies inside, an element
+    matching its first compound. Selectors using syntax beyond tags, classes,
+    ids and [attr]/[attr=value] get no matcher.
+
+    Args:
+        selector: CSS selector for review containers
+
+    Returns:
+        Predicate, or None when the selector can't be matched safely
+    """
+    compound = _first_compound(selector.strip())
+    if not compound:
+        return None
+
+    tag_match = _TAG_NAME.match(compound)
+    tag = tag_match.group(0).lower() if tag_match else None
+    rest = compound[tag_match.end():] if tag_match else compound
+
+    classes = []
+    attrs: Dict[str, Optional[str]] = {}
+    position = 0
+    for part in _SELECTOR_PART.finditer(rest):
+        if part.start() != position:
+            return None
+        position = part.end()
+        if part.group('cls'):
+            classes.append(part.group('cls'))
+        elif part.group('id'):
+            attrs['id'] = part.group('id')
+        else:
+            attrs[part.group('attr')] = part.group('value')
+    if position != len(rest) or not (tag or classes or attrs):
+        return None
+
+    def matches(name, tag_attrs):
+        if tag and name != tag:
+            return False
+        if classes and not set(classes).issubset(_class_list(tag_attrs.get('class'))):
+            return False
+        for attr, value in attrs.items():
+            if attr not in tag_attrs or (value is not None and tag_attrs[attr] != value):
+                return False
+        return True
+
+    return matches
+
+
+def strainer_for_selector(selector: str) -> Optional[SoupStrainer]:
+    """
+    Build a strainer that keeps the outermost element a CSS selector needs.
+
+    Keeping the element that matches the selector's first compound (with its
+    whole subtree) preserves every match of the full selector.
+
+    Args:
+        selector: CSS selector for review containers
+
+    Returns:
+        SoupStrainer, or None when the selector can't be strained safely
+    """
+    matcher = selector_matcher(selector)
+    return SoupStrainer(matcher) if matcher else None
+
+
+def attrs_match(tag_attrs: dict, rule_attrs: dict) -> bool:
+    """
+    Check tag attributes against a find_all-style attrs dict, the way BeautifulSoup does.
+
+    Strings must equal the value and compiled patterns must be found in it.
+    For the multi-valued class attribute, each class is tried on its own
+    and then the whole attribute string.
+
+    Args:
+        tag_attrs: Attributes of a tag (class may be a list or a raw string)
+        rule_attrs: Expected attribute values
+
+    Returns:
+        True if every expected attribute matches
+    """
+    for attr, expected in rule_attrs.items():
+        actual = tag_attrs.get(attr)
+        if actual is None:
+            return False
+        if attr == 'class':
+            values = list(_class_list(actual))
+            candidates = values + [' '.join(values)]
+        else:
+            candidates = [' '.join(actual) if isinstance(actual, list) else actual]
+        if isinstance(expected, str):
+            if expected not in candidates:
+                return False
+        elif not any(expected.search(candidate) for candidate in candidates):
+            return False
+    return True
+
+
+def strainer_for_rules(rules: Iterable[tuple]) -> SoupStrainer:
+    """
+    Build a strainer that keeps elements matching any of several find_all rules.
+
+    Args:
+        rules: (tag name, attrs) pairs as passed to find_all, where attribute
+            values are strings or compiled patterns
+
+    Returns:
+        SoupStrainer matching the union of the rules
+    """
+    compiled = [(name, attrs) for name, attrs in rules]
+
+    def matches(name, tag_attrs):
+        for rule_name, rule_attrs in compiled:
+            if rule_name and name != rule_name:
+                continue
+            if attrs_match(tag_attrs, rule_attrs):
+                return True
+        return False
+
+    return SoupStrainer(matches)
+
+
+def iter_section_cuts(content: bytes, matcher: Callable[[str, dict], bool],
+                      chunk_size: Optional[int] = None) -> Iterator[Tuple[int, int, bool]]:
+    """
+    Scan a page for the ends of review sections without building a tree.
+
+    The page is fed to lxml's event parser in chunks. After each chunk in
+    which another outermost matching element closed, this yields a cut offset
+    such that ``content[:cut]`` holds every closed section in full. Cuts are
+    placed just before a '<', so they never split a multi-byte character.
+
+    The scan ends early once the element enclosing the first section (the
+    review list) closes, since no sections follow it on a page with fewer
+    reviews than the caller wants.
+
+    Args:
+        content: Raw HTML
+        matcher: (tag name, attrs) predicate for section elements
+        chunk_size: Bytes fed per step
+
+    Yields:
+        (cut offset, number of closed outermost sections, whether the review
+        list has closed, making this the last cut)
+    """
+    if not PUSH_PARSER_USABLE:
+        return
+
+    chunk_size = chunk_size or PARSE_CHUNK_SIZE
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+    section = None
+    review_list = None
+    closed = 0
+
+    for offset in range(0, len(content), chunk_size):
+        parser.feed(content[offset:offset + chunk_size])
+        closed_before = closed
+        finished = False
+
+        for event, element in parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+            if event == 'start':
+                if section is None and matcher(element.tag, element.attrib):
+                    section = element
+                    if review_list is None:
+                        review_list = element.getparent()
+            else:
+                if element is section:
+                    section = None
+                    closed += 1
+                elif element is review_list:
+                    finished = True
+                    break
+                # Free the subtree; only the open sections matter from here on
+                element.clear()
+
+        if closed > closed_before or finished:
+            cut = content.find(b'<', offset + chunk_size)
+            yield (cut if cut != -1 else len(content)), closed, finished
+        if finished:
+            return
+
+
+def outermost_matches(soup: BeautifulSoup, matcher: Callable[[str, dict], bool],
+                      limit: Optional[int] = None) -> List[Tag]:
+    """
+    Find matching elements that are not nested inside another match, in document order.
+
+    Args:
+        soup: Parsed tree
+        matcher: (tag name, attrs) predicate
+        limit: Maximum number of elements returned
+
+    Returns:
+        List of outermost matching tags
+    """
+    sections = []
+    for tag in soup.find_all(lambda tag: matcher(tag.name, tag.attrs)):
+        if sections and sections[-1] in tag.parents:
+            continue
+        sections.append(tag)
+        if limit and len(sections) >= limit:
+            break
+    return sections
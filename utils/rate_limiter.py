@@ -0,0 +1,333 @@
+"""
+Per-Host Rate Limiting
+
+This module provides a token-bucket rate limiter shared by all scrapers.
+Requests only wait when a host's budget is actually spent, instead of
+sleeping a random amount before every request. Hosts that served a block
+page are backed off: requests to them fail at once until the back-off ends.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import CancelledError
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class HostBackoffError(Exception):
+    """
+    A request to a host that is backing off after serving a block page.
+    """
+
+    # Like a block page, the host may serve real pages again once the back-off ends
+    kind = 'backoff'
+    retryable = True
+
+    def __init__(self, host: str, retry_after: float):
+        """
+        Initialize the error.
+
+        Args:
+            host: Host being backed off
+            retry_after: Seconds until the back-off ends
+        """
+        super().__init__(f"{host} is backing off after a block page, retry in {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations.
+
+    ``reserve()`` always takes a token and returns how long the caller must
+    wait for it. The balance may go negative, which queues concurrent callers
+    fairly without any of them holding a lock while they wait.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens stored
+        """
+        self.rate = max(rate, 1e-6)
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token.
+
+        Returns:
+            Seconds to wait before the token may be used (0 if available now)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def release(self) -> None:
+        """Give back a token that was reserved but not used."""
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+
+class HostRateLimiter:
+    """
+    Token buckets keyed by host, with per-domain rate rules.
+    """
+
+    def __init__(self, default_rate: Optional[float] = None, default_burst: Optional[float] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            default_rate: Requests per second for hosts without a rule
+            default_burst: Burst size for hosts without a rule
+        """
+        self.default_rate = default_rate or float(os.getenv('RATE_LIMIT_DEFAULT', 2))
+        self.default_burst = default_burst or float(os.getenv('RATE_LIMIT_BURST', 5))
+
+        # Back-off after a host serves a block page, doubling while blocks continue
+        self.block_backoff = float(os.getenv('RATE_LIMIT_BLOCK_BACKOFF', 30))
+        self.block_backoff_max = float(os.getenv('RATE_LIMIT_BLOCK_BACKOFF_MAX', 300))
+
+        self._rules: Dict[str, Tuple[float, float]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        # Kept apart from the buckets, so reconfiguring a domain keeps its back-offs
+        self._block_streaks: Dict[str, int] = {}
+        self._backoff_until: Dict[str, float] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, domain: str, rate: float, burst: Optional[float] = None) -> None:
+        """
+        Set the rate for a domain and all of its subdomains.
+
+        Args:
+            domain: Domain such as 'amazon.com'
+            rate: Requests per second
+            burst: Burst size (defaults to the limiter default)
+        """
+        domain = domain.lower()
+        with self._lock:
+            self._rules[domain] = (rate, burst or self.default_burst)
+            # Drop existing buckets so the new rule takes effect
+            for host in list(self._buckets):
+                if host == domain or host.endswith('.' + domain):
+                    del self._buckets[host]
+
+    def _bucket(self, host: str) -> TokenBucket:
+        """Get or create the bucket for a host."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.default_rate, self.default_burst
+                labels = host.split('.')
+                for i in range(len(labels)):
+                    rule = self._rules.get('.'.join(labels[i:]))
+                    if rule:
+                        rate, burst = rule
+                        break
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+                self._stats.setdefault(host, {'requests': 0, 'waits': 0, 'total_wait': 0.0, 'max_wait': 0.0,
+                                              'penalties': 0, 'rejected': 0})
+            return bucket
+
+    def reserve(self, host: str) -> float:
+        """
+        Reserve a request slot for a host.
+
+        Args:
+            host: Host name (port is ignored)
+
+        Returns:
+            Seconds the caller must wait before sending the request
+
+        Raises:
+            HostBackoffError: If the host is backing off (no slot is taken)
+        """
+        host = host.lower().split(':')[0]
+        bucket = self._bucket(host)
+
+        until = self._backoff_until.get(host)
+        if until is not None:
+            remaining = until - time.monotonic()
+            if remaining > 0:
+                with self._lock:
+                    self._stats[host]['rejected'] += 1
+                raise HostBackoffError(host, remaining)
+
+        delay = bucket.reserve()
+
+        with self._lock:
+            stats = self._stats[host]
+            stats['requests'] += 1
+            if delay > 0:
+                stats['waits'] += 1
+                stats['total_wait'] += delay
+                stats['max_wait'] = max(stats['max_wait'], delay)
+
+        return delay
+
+    def acquire(self, host: str, deadline: Optional[float] = None,
+                cancelled: Optional[threading.Event] = None) -> float:
+        """
+        Block until a request to the host is allowed.
+
+        Args:
+            host: Host name
+            deadline: Optional time.monotonic() value the request must start by
+            cancelled: Optional event that abandons the wait when set; the
+                reserved slot is given back for other requests
+
+        Returns:
+            Seconds waited
+
+        Raises:
+            HostBackoffError: If the host is backing off after a block page
+            TimeoutError: If the wait would run past the deadline (the
+                reserved slot is not returned)
+            CancelledError: If cancelled was set before the wait ended
+        """
+        delay = self.reserve(host)
+        if deadline is not None and time.monotonic() + delay > deadline:
+            raise TimeoutError(f"Rate limit wait of {delay:.2f}s for {host} would pass the deadline")
+        if delay > 0:
+            logger.debug(f"Rate limit: waiting {delay:.2f}s for {host}")
+            if cancelled is None:
+                time.sleep(delay)
+            elif cancelled.wait(delay):
+                self.release(host)
+                raise CancelledError(f"Rate limit wait for {host} was cancelled")
+        return delay
+
+    def release(self, host: str) -> None:
+        """
+        Give back a slot reserved for a request that was never sent.
+
+        Args:
+            host: Host name
+        """
+        host = host.lower().split(':')[0]
+        self._bucket(host).release()
+        with self._lock:
+            self._stats[host]['requests'] -= 1
+
+    async def acquire_async(self, host: str) -> float:
+        """
+        Wait on the event loop until a request to the host is allowed.
+
+        Args:
+            host: Host name
+
+        Returns:
+            Seconds waited
+
+        Raises:
+            HostBackoffError: If the host is backing off after a block page
+        """
+        delay = self.reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def penalize(self, host: str) -> float:
+        """
+        Back off a host that served a block or captcha page.
+
+        Every request to the host raises HostBackoffError until the back-off
+        ends, rather than sleeping it out in the caller's thread. The back-off
+        doubles with each block in a row (up to block_backoff_max) until
+        clear_penalty().
+
+        Args:
+            host: Host name
+
+        Returns:
+            Back-off in seconds
+        """
+        host = host.lower().split(':')[0]
+        self._bucket(host)
+        with self._lock:
+            streak = self._block_streaks.get(host, 0) + 1
+            self._block_streaks[host] = streak
+            self._stats[host]['penalties'] += 1
+            backoff = min(self.block_backoff * 2 ** (streak - 1), self.block_backoff_max)
+            self._backoff_until[host] = max(self._backoff_until.get(host, 0.0), time.monotonic() + backoff)
+
+        logger.warning(f"{host} is blocking requests, backing off {backoff:.1f}s (block #{streak} in a row)")
+        return backoff
+
+    def clear_penalty(self, host: str) -> None:
+        """
+        Reset a host's back-off streak after it served a usable page.
+
+        Args:
+            host: Host name
+        """
+        host = host.lower().split(':')[0]
+        if host in self._block_streaks or host in self._backoff_until:
+            with self._lock:
+                self._block_streaks.pop(host, None)
+                self._backoff_until.pop(host, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Report wait-time metrics.
+
+        Returns:
+            Dictionary with totals and a per-host breakdown
+        """
+        with self._lock:
+            hosts = {host: dict(stats) for host, stats in self._stats.items()}
+
+        total_requests = sum(stats['requests'] for stats in hosts.values())
+        total_wait = sum(stats['total_wait'] for stats in hosts.values())
+        return {
+            'default_rate': self.default_rate,
+            'default_burst': self.default_burst,
+            'total_requests': total_requests,
+            'total_waits': sum(stats['waits'] for stats in hosts.values()),
+            'total_penalties': sum(stats['penalties'] for stats in hosts.values()),
+            'total_rejected': sum(stats['rejected'] for stats in hosts.values()),
+            'block_backoff': self.block_backoff,
+            'total_wait_seconds': round(total_wait, 3),
+            'average_wait_seconds': round(total_wait / total_requests, 3) if total_requests else 0.0,
+            'hosts': hosts
+        }
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> HostRateLimiter:
+    """
+    Get the process-wide rate limiter, creating it on first use.
+
+    Returns:
+        Shared HostRateLimiter instance
+    """
+    global _shared_limiter
+
+    if _shared_limiter is None:
+        with _shared_limiter_lock:
+            if _shared_limiter is None:
+                _shared_limiter = HostRateLimiter()
+
+    return _shared_limiter
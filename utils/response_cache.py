@@ -0,0 +1,270 @@
+"""
+On-Disk Response Cache
+
+This module provides a persistent cache of raw HTML responses keyed by
+canonical URL, so repeat lookups of the same page skip the network entirely.
+Entries expire by TTL and the cache is kept under a byte budget by evicting
+the least recently used files.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, Any, Optional
+
+from utils.helpers import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Suffix for cache entries; temp files written before the atomic rename use a prefix
+ENTRY_SUFFIX = '.cache'
+TEMP_PREFIX = '.tmp-'
+
+
+class ResponseCache:
+    """
+    Persistent cache of raw response bodies.
+
+    Each entry is one file holding a JSON metadata line followed by the body.
+    Files are written to a temp file and renamed into place, so readers in
+    other processes never see a partial entry. File modification time doubles
+    as the LRU timestamp: hits touch the file, eviction removes the oldest.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None,
+                 default_ttl: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Total byte budget before LRU eviction
+            default_ttl: TTL in seconds used when callers don't pass one
+        """
+        self.cache_dir = cache_dir or os.getenv('RESPONSE_CACHE_DIR', os.path.join('.cache', 'responses'))
+        self.max_bytes = max_bytes or int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+        self.default_ttl = default_ttl if default_ttl is not None else int(os.getenv('RESPONSE_CACHE_TTL', 300))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._approx_bytes = self._scan_size()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _path(self, url: str) -> str:
+        """Get the entry path for a URL."""
+        digest = hashlib.sha256(canonicalize_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + ENTRY_SUFFIX)
+
+    def _scan_size(self) -> int:
+        """Sum the size of all entries currently on disk."""
+        total = 0
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(ENTRY_SUFFIX):
+                        try:
+                            total += entry.stat().st_size
+                        except FileNotFoundError:
+                            continue
+        except FileNotFoundError:
+            return 0
+        return total
+
+    def get(self, url: str, ttl: Optional[int] = None) -> Optional[bytes]:
+        """
+        Get a cached response body.
+
+        Args:
+            url: URL of the page
+            ttl: Maximum entry age in seconds (defaults to default_ttl)
+
+        Returns:
+            Cached body, or None on a miss or expired entry
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        path = self._path(url)
+
+        try:
+            with open(path, 'rb') as f:
+                metadata = json.loads(f.readline())
+                if time.time() - metadata['stored_at'] > ttl:
+                    body = None
+                else:
+                    body = f.read()
+        except (FileNotFoundError, ValueError, KeyError):
+            body = None
+
+        with self._lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if body is not None:
+            # Mark as recently used for LRU eviction
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+
+        return body
+
+    def set(self, url: str, content: bytes) -> None:
+        """
+        Store a response body.
+
+        Args:
+            url: URL of the page
+            content: Raw response body
+        """
+        path = self._path(url)
+        metadata = json.dumps({'url': canonicalize_url(url), 'stored_at': time.time()}).encode('utf-8')
+
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(metadata + b'\n')
+                    f.write(content)
+                os.replace(temp_path, path)
+            except Exception:
+                try:
+                    os.remove(temp_path)
+                except FileNotFoundError:
+                    pass
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to write response cache entry for {url}: {str(e)}")
+            return
+
+        with self._lock:
+            self.writes += 1
+            self._approx_bytes += len(metadata) + 1 + len(content)
+            over_budget = self._approx_bytes > self.max_bytes
+
+        if over_budget:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache is under 90% of its budget."""
+        entries = []
+        now = time.time()
+
+        with os.scandir(self.cache_dir) as scan:
+            for entry in scan:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                elif entry.name.startswith(TEMP_PREFIX) and now - stat.st_mtime > 3600:
+                    # Leftover from a writer that died before renaming
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                evicted += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+        with self._lock:
+            self._approx_bytes = total
+            self.evictions += evicted
+
+        if evicted:
+            logger.info(f"Evicted {evicted} response cache entries")
+
+    def purge(self, url: Optional[str] = None) -> int:
+        """
+        Remove cached entries.
+
+        Args:
+            url: URL to purge; purges every entry when omitted
+
+        Returns:
+            Number of entries removed
+        """
+        if url:
+            paths = [self._path(url)]
+        else:
+            with os.scandir(self.cache_dir) as scan:
+                paths = [entry.path for entry in scan if entry.name.endswith(ENTRY_SUFFIX)]
+
+        removed = 0
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+
+        with self._lock:
+            self._approx_bytes = self._scan_size()
+
+        logger.info(f"Purged {removed} response cache entries")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Report cache usage.
+
+        Returns:
+            Dictionary with hit/miss counts and disk usage
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'cache_dir': self.cache_dir,
+                'bytes': self._approx_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache, creating it on first use.
+
+    Returns:
+        Shared ResponseCache, or None when RESPONSE_CACHE_ENABLED is false
+    """
+    global _shared_cache
+
+    if os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() != 'true':
+        return None
+
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = ResponseCache()
+                logger.info(f"Response cache at {_shared_cache.cache_dir} ({_shared_cache.max_bytes} bytes)")
+
+    return _shared_cache
@@ -74,6 +74,10 @@ class ReviewAnalyzer:
             ]
         }
         
+        # Keywords lowercased once rather than per review
+        self._category_keywords = [(category, [keyword.lower() for keyword in keywords])
+                                   for category, keywords in self.criteria_keywords.items()]
+        
         # Sentiment indicators
         self.positive_words = {
             'excellent', 'amazing', 'great', 'love', 'perfect', 'awesome',
@@ -166,9 +170,9 @@ class ReviewAnalyzer:
         text_lower = text.lower()
         matching_categories = []
         
-        for category, keywords in self.criteria_keywords.items():
+        for category, keywords in self._category_keywords:
             for keyword in keywords:
-                if keyword.lower() in text_lower:
+                if keyword in text_lower:
                     matching_categories.append(category)
                     break  # Found match for this category
         
@@ -0,0 +1,116 @@
+"""
+Parsed Review Cache
+
+This module provides an in-memory LRU cache of parsed review lists, so
+refiltering the same product with different search parameters is a pure
+in-memory pass instead of a fresh fetch and parse.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+
+from utils.helpers import canonicalize_url
+
+
+class ReviewCache:
+    """
+    Thread-safe LRU cache of parsed reviews with a TTL.
+
+    Entries are keyed by (canonical URL, platform).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of review lists kept
+            ttl: Seconds an entry stays fresh
+        """
+        self.max_entries = max_entries or int(os.getenv('REVIEW_CACHE_SIZE', 512))
+        self.ttl = ttl if ttl is not None else int(os.getenv('REVIEW_CACHE_TTL', 300))
+
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def _key(url: str, platform: Optional[str]) -> Tuple[str, str]:
+        """Build the cache key for a URL and platform."""
+        return canonicalize_url(url), platform or ''
+
+    def get(self, url: str, platform: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached reviews.
+
+        Args:
+            url: Product URL
+            platform: Platform key
+
+        Returns:
+            Cached review list, or None on a miss or expired entry
+        """
+        key = self._key(url, platform)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, reviews = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(reviews)
+
+    def set(self, url: str, platform: Optional[str], reviews: List[Dict[str, Any]]) -> None:
+        """
+        Store parsed reviews.
+
+        Args:
+            url: Product URL
+            platform: Platform key
+            reviews: Parsed review list
+        """
+        key = self._key(url, platform)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(reviews))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Report cache usage.
+
+        Returns:
+            Dictionary with hit/miss counts and size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,275 @@
+"""
+Learned Selector Ordering
+
+Scrapers try several fallback strategies to find review containers and
+fields, because retailers change their markup. This module keeps per-host
+success statistics for those strategies so ones that keep missing stop being
+tried first, and persists them as JSON so the ordering survives restarts.
+"""
+
+import os
+import json
+import time
+import atexit
+import logging
+import tempfile
+import threading
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Misses in a row (while a later strategy won) before a strategy is tried last
+SKIP_AFTER_MISSES = int(os.getenv('SELECTOR_STATS_SKIP_AFTER', 5))
+
+# Every this many lookups of a group with skipped strategies, the declared order is tried again
+PROBE_INTERVAL = int(os.getenv('SELECTOR_STATS_PROBE_INTERVAL', 20))
+
+
+class SelectorStats:
+    """
+    Thread-safe per-host win counts for ordered fallback strategies.
+
+    Strategies are identified by their index in the scraper's rule list and
+    grouped per (host, group), where a group is e.g. 'container' or a field
+    name. The declared order is kept, except that a strategy which missed
+    skip_after times in a row while a later one won moves to the end. A win
+    never moves a strategy ahead of one that still matches, so a generic
+    fallback can't displace a precise rule; and every probe_interval-th
+    lookup uses the declared order, so a skipped rule that matches again is
+    restored.
+    """
+
+    def __init__(self, path: Optional[str] = None, save_interval: Optional[float] = None,
+                 persist: bool = True, skip_after: Optional[int] = None,
+                 probe_interval: Optional[int] = None):
+        """
+        Initialize the statistics, loading earlier ones from disk.
+
+        Args:
+            path: JSON file the statistics are persisted to
+            save_interval: Minimum seconds between automatic saves
+            persist: Whether to write the statistics back (off in parse workers,
+                which only read them, so processes don't overwrite each other)
+            skip_after: Misses in a row before a strategy is tried last
+            probe_interval: Lookups between retries of the declared order
+        """
+        self.path = path or os.getenv('SELECTOR_STATS_PATH', os.path.join('.cache', 'selector_stats.json'))
+        self.save_interval = save_interval if save_interval is not None else float(os.getenv('SELECTOR_STATS_SAVE_INTERVAL', 60))
+        self.persist = persist
+        self.skip_after = max(1, skip_after or SKIP_AFTER_MISSES)
+        self.probe_interval = max(1, probe_interval or PROBE_INTERVAL)
+
+        # (host, group) -> {'wins': {index: count}, 'misses': {index: misses in a row}}
+        self._groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # Lookups per (host, group) with skipped strategies, for probing
+        self._lookups: Dict[Tuple[str, str], int] = {}
+        # When a list, every record() is also appended to it (see ParsePool)
+        self.journal: Optional[List[tuple]] = None
+        self._orders: Dict[Tuple[str, str, int], List[int]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+        self.load()
+
+    def order(self, host: str, group: str, count: int) -> List[int]:
+        """
+        Get the order to try a group's strategies in.
+
+        Args:
+            host: Host the strategies run against
+            group: Strategy group, e.g. 'container' or a field name
+            count: Number of strategies in the group
+
+        Returns:
+            Strategy indices in declared order, skipped strategies last
+        """
+        key = (host, group, count)
+        order = self._orders.get(key)
+        if order is not None:
+            return order
+
+        with self._lock:
+            entry = self._groups.get((host, group))
+            skipped = [index for index in range(count)
+                       if entry and entry['misses'].get(index, 0) >= self.skip_after]
+            if not skipped:
+                # Only orders without skipped strategies are cached, so
+                # probing below sees every lookup of the others
+                order = self._orders[key] = list(range(count))
+                return order
+
+            lookups = self._lookups.get((host, group), 0) + 1
+            self._lookups[(host, group)] = lookups
+            if lookups % self.probe_interval == 0:
+                return list(range(count))
+            return [index for index in range(count) if index not in skipped] + skipped
+
+    def record(self, host: str, group: str, index: int, missed: Iterable[int] = ()) -> None:
+        """
+        Record that a strategy produced a result.
+
+        Args:
+            host: Host the strategy ran against
+            group: Strategy group
+            index: Index of the winning strategy
+            missed: Strategies tried before it that produced nothing
+        """
+        missed = list(missed)
+        with self._lock:
+            entry = self._groups.setdefault((host, group), {'wins': {}, 'misses': {}})
+            wins, misses = entry['wins'], entry['misses']
+            wins[index] = wins.get(index, 0) + 1
+            changed = misses.pop(index, 0) >= self.skip_after
+            for other in missed:
+                misses[other] = misses.get(other, 0) + 1
+                changed = changed or misses[other] == self.skip_after
+            if changed:
+                # A strategy was skipped or restored, so the order changed
+                for key in [key for key in self._orders if key[:2] == (host, group)]:
+                    del self._orders[key]
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= self.save_interval
+            if self.journal is not None:
+                self.journal.append((host, group, index, missed))
+
+        if due:
+            self.save()
+
+    def find_first(self, node, host: str, group: str, rules: List[tuple]):
+        """
+        Find the first element matched by a group of find() rules, in learned order.
+
+        Args:
+            node: Tag to search in
+            host: Host the page came from
+            group: Strategy group
+            rules: (tag, attrs) rules in default order of preference
+
+        Returns:
+            First matching element, or None
+        """
+        order = self.order(host, group, len(rules))
+        for position, index in enumerate(order):
+            tag, attrs = rules[index]
+            elem = node.find(tag, attrs)
+            if elem:
+                self.record(host, group, index, order[:position])
+                return elem
+        return None
+
+    def find_all_first(self, node, host: str, group: str, rules: List[tuple],
+                       extract: Optional[Callable[[list], list]] = None) -> list:
+        """
+        Find all elements of the first find_all() rule that matches, in learned order.
+
+        Args:
+            node: Tag to search in
+            host: Host the page came from
+            group: Strategy group
+            rules: (tag, attrs) rules in default order of preference
+            extract: Optional function turning matched elements into results;
+                a rule whose elements give no results counts as a miss, so a
+                generic rule matching unrelated elements never wins
+
+        Returns:
+            Matching elements, or extract()'s results (empty when no rule matches)
+        """
+        order = self.order(host, group, len(rules))
+        for position, index in enumerate(order):
+            tag, attrs = rules[index]
+            elems = node.find_all(tag, attrs)
+            if elems and extract:
+                elems = extract(elems)
+            if elems:
+                self.record(host, group, index, order[:position])
+                return elems
+        return []
+
+    def load(self) -> None:
+        """Load persisted statistics, ignoring a missing or unreadable file."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable selector stats at {self.path}: {str(e)}")
+            return
+
+        with self._lock:
+            for host, groups in data.items():
+                for group, entry in groups.items():
+                    self._groups[(host, group)] = {
+                        'wins': {int(index): int(count) for index, count in entry['wins'].items()},
+                        'misses': {int(index): int(count) for index, count in entry.get('misses', {}).items()}
+                    }
+            self._orders.clear()
+
+    def save(self) -> None:
+        """Persist the statistics if they changed since the last save."""
+        with self._lock:
+            if not self._dirty or not self.persist:
+                return
+            data = {}
+            for (host, group), entry in self._groups.items():
+                data.setdefault(host, {})[group] = {'wins': dict(entry['wins']), 'misses': dict(entry['misses'])}
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        try:
+            directory = os.path.dirname(self.path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, sort_keys=True)
+                os.replace(temp_path, self.path)
+            except Exception:
+                try:
+                    os.remove(temp_path)
+                except FileNotFoundError:
+                    pass
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to save selector stats to {self.path}: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Report the learned statistics.
+
+        Returns:
+            Dictionary of host -> group -> win counts and misses in a row
+        """
+        with self._lock:
+            stats = {}
+            for (host, group), entry in sorted(self._groups.items()):
+                stats.setdefault(host, {})[group] = {'wins': dict(entry['wins']), 'misses': dict(entry['misses'])}
+            return stats
+
+
+_shared_stats = None
+_shared_stats_lock = threading.Lock()
+
+
+def get_shared_selector_stats(persist: bool = True) -> SelectorStats:
+    """
+    Get the process-wide selector statistics, creating them on first use.
+
+    Args:
+        persist: Whether the statistics are written back; only the first call
+            in a process decides
+
+    Returns:
+        Shared SelectorStats, saved again at interpreter exit
+    """
+    global _shared_stats
+
+    if _shared_stats is None:
+        with _shared_stats_lock:
+            if _shared_stats is None:
+                _shared_stats = SelectorStats(persist=persist)
+                atexit.register(_shared_stats.save)
+                logger.info(f"Selector stats at {_shared_stats.path}")
+
+    return _shared_stats
@@ -0,0 +1,198 @@
+"""
+Embedded Review Data Extraction
+
+Many retailers ship their reviews as JSON inside the page, either as
+schema.org JSON-LD (``<script type="application/ld+json">``) or in the
+Next.js ``__NEXT_DATA__`` blob. This module finds those blobs with a byte
+scan (no DOM is built) and maps the reviews they contain to plain dicts.
+"""
+
+import re
+import json
+import logging
+from typing import List, Dict, Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_JSON_LD_SCRIPT = re.compile(rb'<script[^>]+application/ld\+json[^>]*>(.*?)</script', re.I | re.S)
+_NEXT_DATA_SCRIPT = re.compile(rb'<script[^>]+id=["\']?__NEXT_DATA__["\']?[^>]*>(.*?)</script', re.I | re.S)
+
+# Candidate keys for review fields in framework data, in order of preference
+TEXT_KEYS = ('reviewBody', 'reviewText', 'text', 'body', 'comment', 'content')
+RATING_KEYS = ('reviewRating', 'rating', 'ratingValue', 'overallRating', 'starRating', 'stars', 'score')
+AUTHOR_KEYS = ('author', 'userNickname', 'nickname', 'reviewerName', 'authorName', 'userName', 'displayName')
+DATE_KEYS = ('datePublished', 'submissionTime', 'reviewSubmissionTime', 'date', 'createdAt', 'publishedAt')
+TITLE_KEYS = ('name', 'title', 'headline', 'reviewTitle')
+
+
+def _load(blob: bytes) -> Optional[Any]:
+    """Decode one JSON blob, ignoring malformed ones."""
+    try:
+        return json.loads(blob)
+    except ValueError as e:
+        logger.debug(f"Skipping malformed embedded JSON: {str(e)}")
+        return None
+
+
+def iter_json_ld(content: bytes) -> Iterator[Any]:
+    """
+    Yield the decoded JSON-LD documents embedded in a page.
+
+    Args:
+        content: Raw HTML
+
+    Yields:
+        Decoded JSON values
+    """
+    for match in _JSON_LD_SCRIPT.finditer(content):
+        data = _load(match.group(1))
+        if data is not None:
+            yield data
+
+
+def load_next_data(content: bytes) -> Optional[Any]:
+    """
+    Decode the Next.js ``__NEXT_DATA__`` blob of a page.
+
+    Args:
+        content: Raw HTML
+
+    Returns:
+        Decoded JSON, or None if the page has no (valid) blob
+    """
+    if b'__NEXT_DATA__' not in content:
+        return None
+    match = _NEXT_DATA_SCRIPT.search(content)
+    return _load(match.group(1)) if match else None
+
+
+def _is_review_type(node: Dict[str, Any]) -> bool:
+    """Check whether a JSON-LD node is a schema.org Review."""
+    node_type = node.get('@type')
+    types = node_type if isinstance(node_type, list) else [node_type]
+    return any(isinstance(t, str) and t.split('/')[-1] in ('Review', 'UserReview', 'CriticReview') for t in types)
+
+
+def _walk(data: Any) -> Iterator[Any]:
+    """Yield every dict and list in a JSON value, in document order."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            yield node
+            stack.extend(reversed(node))
+
+
+def _first(node: Dict[str, Any], keys) -> Any:
+    """Return the first non-empty value among candidate keys."""
+    for key in keys:
+        value = node.get(key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def _as_text(value: Any) -> str:
+    """Flatten a name-like value (string, or object with a name) to text."""
+    if isinstance(value, dict):
+        value = _first(value, ('name', 'displayName', 'nickname'))
+    if isinstance(value, list):
+        value = value[0] if value else None
+        return _as_text(value)
+    return str(value).strip() if value is not None else ''
+
+
+def _as_rating(value: Any) -> Dict[str, Optional[float]]:
+    """Read a rating value and its scale from a number, string or Rating object."""
+    best = None
+    if isinstance(value, dict):
+        best = value.get('bestRating')
+        value = _first(value, ('ratingValue', 'value', 'rating'))
+    try:
+        rating = float(value)
+    except (TypeError, ValueError):
+        rating = 0.0
+    try:
+        best = float(best) if best is not None else None
+    except (TypeError, ValueError):
+        best = None
+    return {'rating': rating, 'best_rating': best}
+
+
+def _to_review(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Map one review object to the fields the scrapers use."""
+    review = {
+        'reviewer_name': _as_text(_first(node, AUTHOR_KEYS)) or 'Anonymous',
+        'review_text': _as_text(_first(node, TEXT_KEYS)),
+        'title': _as_text(_first(node, TITLE_KEYS)),
+        'date': _as_text(_first(node, DATE_KEYS))
+    }
+    review.update(_as_rating(_first(node, RATING_KEYS)))
+    return review
+
+
+def _looks_like_review(node: Any) -> bool:
+    """Check whether a framework object carries both review text and a rating."""
+    return isinstance(node, dict) and _first(node, TEXT_KEYS) is not None and _first(node, RATING_KEYS) is not None
+
+
+def json_ld_reviews(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Extract schema.org Review objects from a page's JSON-LD.
+
+    Args:
+        content: Raw HTML
+
+    Returns:
+        List of review dicts (empty when the page has none)
+    """
+    reviews = []
+    for document in iter_json_ld(content):
+        for node in _walk(document):
+            if isinstance(node, dict) and _is_review_type(node):
+                reviews.append(_to_review(node))
+    return reviews
+
+
+def next_data_reviews(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Extract reviews from a page's ``__NEXT_DATA__`` blob.
+
+    The blob has no fixed schema, so the first list whose items carry both
+    review text and a rating is taken as the review list.
+
+    Args:
+        content: Raw HTML
+
+    Returns:
+        List of review dicts (empty when no review list is found)
+    """
+    data = load_next_data(content)
+    if data is None:
+        return []
+
+    for node in _walk(data):
+        if isinstance(node, list) and node and _looks_like_review(node[0]):
+            return [_to_review(item) for item in node if _looks_like_review(item)]
+    return []
+
+
+def extract_structured_reviews(content: bytes, max_reviews: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Extract reviews from embedded JSON, trying JSON-LD first, then ``__NEXT_DATA__``.
+
+    Args:
+        content: Raw HTML
+        max_reviews: Maximum number of reviews returned
+
+    Returns:
+        List of dicts with reviewer_name, rating, best_rating, review_text,
+        title and date; empty when the page embeds no reviews
+    """
+    reviews = [review for review in json_ld_reviews(content) if review['review_text'] or review['rating']]
+    if not reviews:
+        reviews = [review for review in next_data_reviews(content) if review['review_text'] or review['rating']]
+    return reviews[:max_reviews] if max_reviews else reviews